@@ -0,0 +1,107 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Benchmark: Einordnung von Dateinamen (classify.py) ohne jeden Dateizugriff.
+
+Aufruf:
+    python benchmarks/bench_classify.py [--names 1000000]
+
+Erzeugt eine synthetische Liste von Dateinamen (Pixel-JPGs und -DNGs mit Suffixen,
+Videos, fremde Dateien) und vergleicht die bisherige Prüfung pro Datei (splitext,
+re.compile bei jedem Aufruf) mit classify_names.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from classify import classify_names  # noqa: E402
+from synthetic import pixel_name  # noqa: E402
+
+# (Anteil in Zehnteln, Endung, Suffix) der Pixel-Namen; der Rest sind fremde Dateien
+MIX = [
+    (6, ".jpg", ""),
+    (1, ".jpg", ".NIGHT"),
+    (1, ".dng", ".RAW-01.MP.COVER"),
+    (1, ".mp4", ".LS"),
+]
+
+
+def make_names(count):
+    """Erzeugt 'count' Dateinamen in der Mischung aus MIX."""
+    pattern = [(ext, suffix) for share, ext, suffix in MIX for _ in range(share)]
+    names = []
+    for i in range(count):
+        slot = i % 10
+        if slot < len(pattern):
+            ext, suffix = pattern[slot]
+            names.append(pixel_name(i, ext, suffix))
+        else:
+            names.append(f"IMG_{i:07d}.JPG")
+    return names
+
+
+def classify_legacy(filename):
+    """Bisherige Prüfung aus get_new_filename, einschließlich des Suffix-Ausdrucks."""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in ['.mp4', '.mov', '.mkv']:
+        return "status_video", ""
+    if not filename.lower().startswith('pxl_'):
+        return "status_not_pixel", ""
+    match = re.compile(r"PXL_\d{8}_\d{9}(.*?)\..{3,4}$", re.IGNORECASE).match(filename)
+    return None, match.group(1) if match else ""
+
+
+def measure(function, names):
+    """Gibt die Laufzeit von function(names) in Sekunden zurück."""
+    start = time.perf_counter()
+    function(names)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=1_000_000, help="Anzahl der Dateinamen")
+    args = parser.parse_args()
+
+    names = make_names(args.names)
+    variants = [
+        ("pro Datei (bisher)", lambda names: [classify_legacy(name) for name in names]),
+        ("classify_names", classify_names),
+    ]
+    print(f"{len(names)} Dateinamen")
+    print(f"{'Variante':<20} {'Zeit [s]':>9} {'µs/Name':>8} {'Namen/s':>12}")
+    for label, function in variants:
+        elapsed = measure(function, names)
+        print(f"{label:<20} {elapsed:>9.3f} {elapsed / len(names) * 1e6:>8.2f} {len(names) / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Benchmark: schneller EXIF-Leser (exif_reader) gegen piexif.load.
+
+Aufruf:
+    python benchmarks/bench_exif.py [--jpg 200] [--dng 20] [--dng-mb 40] [--dir PFAD]
+
+Ohne --dir wird ein synthetischer Korpus in einem temporären Ordner erzeugt.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exif_reader import read_exif_dates, _load_exif_dates_piexif  # noqa: E402
+from synthetic import make_corpus  # noqa: E402
+
+
+def time_reader(reader, paths, repeat):
+    """Liest alle Dateien 'repeat'-mal und gibt die beste Gesamtzeit zurück."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            reader(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(paths, repeat):
+    groups = {
+        "jpg": [p for p in paths if p.lower().endswith((".jpg", ".jpeg"))],
+        "dng": [p for p in paths if p.lower().endswith(".dng")],
+    }
+    try:
+        import piexif  # noqa: F401
+        readers = [("exif_reader", read_exif_dates), ("piexif", _load_exif_dates_piexif)]
+    except ImportError:
+        print("Hinweis: piexif ist nicht installiert, es wird nur exif_reader gemessen.")
+        readers = [("exif_reader", read_exif_dates)]
+
+    print(f"{'Typ':<5} {'Leser':<12} {'Dateien':>8} {'Gesamt [s]':>11} {'pro Datei [ms]':>15}")
+    for kind, group in groups.items():
+        if not group:
+            continue
+        results = {}
+        for name, reader in readers:
+            elapsed = time_reader(reader, group, repeat)
+            results[name] = elapsed
+            print(f"{kind:<5} {name:<12} {len(group):>8} {elapsed:>11.3f} {elapsed / len(group) * 1000:>15.3f}")
+        if len(results) == 2 and results["exif_reader"] > 0:
+            print(f"{kind:<5} Faktor: {results['piexif'] / results['exif_reader']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jpg", type=int, default=200, help="Anzahl synthetischer JPGs")
+    parser.add_argument("--dng", type=int, default=20, help="Anzahl synthetischer DNGs")
+    parser.add_argument("--dng-mb", type=int, default=40, help="Größe der DNGs in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen (beste Zeit zählt)")
+    parser.add_argument("--dir", help="Vorhandenen Ordner messen statt synthetischer Dateien")
+    args = parser.parse_args()
+
+    if args.dir:
+        paths = [e.path for e in os.scandir(args.dir) if e.is_file()]
+        run(paths, args.repeat)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(tmp, args.jpg, args.dng, dng_size=args.dng_mb * 1024 * 1024)
+        run(paths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
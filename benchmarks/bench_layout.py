@@ -0,0 +1,124 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Benchmark: Planung in ein großes Archiv, flach vs. nach Aufnahmedatum (output_layout.py).
+
+Aufruf:
+    python benchmarks/bench_layout.py [--archive 200000] [--batch 500] [--target DIR]
+
+Legt ein Archiv aus leeren Dateien mit Zeitstempel-Namen über zehn Jahre an, einmal
+flach in einem Ordner und einmal nach '{YYYY}/{MM}/{name}'. Gemessen wird, wie lange
+das Planen eines neuen Stapels (Zielnamen samt Kollisionsprüfung und Anlegen der
+Zielordner, ohne Übertragung) in jedes der beiden Archive dauert. Flach muss der
+ganze Ordner eingelesen werden, nach Datum nur die Monatsordner des Stapels.
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from instrumentation import RunStats  # noqa: E402
+from output_layout import LayoutTemplate  # noqa: E402
+from renamer_core import LAYOUT_FLATTEN, TransferPlanner, target_location  # noqa: E402
+from scan_results import ScanItem  # noqa: E402
+
+DATE_TEMPLATE = "{YYYY}/{MM}/{name}"
+
+
+def make_name(rng, year):
+    return (f"{year}{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}_"
+            f"{rng.randint(0, 23):02d}{rng.randint(0, 59):02d}{rng.randint(0, 59):02d}.jpg")
+
+
+def build_archive(output_path, layout, names):
+    """Legt die Namen als leere Dateien im Archiv an (Ordner gemäß 'layout')."""
+    created = set()
+    for name in names:
+        directory, name = target_location(output_path, ScanItem(name, name, "status_ok"), layout)
+        if directory not in created:
+            os.makedirs(directory, exist_ok=True)
+            created.add(directory)
+        open(os.path.join(directory, name), "wb").close()
+
+
+def plan_batch(output_path, layout, items):
+    """Plant einen Stapel mit frischem Planer und legt die Zielordner an; gibt (Sekunden, Statistik) zurück."""
+    stats = RunStats()
+    start = time.perf_counter()
+    planner = TransferPlanner(output_path, layout, stats=stats)
+    for item in items:
+        planner.plan(item)
+    planner.make_dirs()
+    return time.perf_counter() - start, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", type=int, default=200_000, help="Anzahl der Dateien im Archiv")
+    parser.add_argument("--batch", type=int, default=500, help="Anzahl neuer Dateien pro Stapel")
+    parser.add_argument("--rounds", type=int, default=5, help="Wiederholungen (bester Wert zählt)")
+    parser.add_argument("--target", help="Ordner für die Archive (Standard: temporärer Ordner)")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    archive = [make_name(rng, rng.randint(2015, 2024)) for _ in range(args.archive)]
+    # Neue Aufnahmen eines Monats, die Hälfte mit Namen, die es im Archiv schon gibt
+    month = [name for name in archive if name.startswith("202412")]
+    batch = [f"202412{name[6:]}" for name in (make_name(rng, 2024) for _ in range(args.batch // 2))]
+    batch += rng.sample(month, min(len(month), args.batch - len(batch)))
+    items = [ScanItem(name, name, "status_ok") for name in batch]
+
+    root = tempfile.mkdtemp(prefix="pxl_bench_layout_", dir=args.target)
+    try:
+        print(f"{args.archive} Dateien im Archiv, {len(items)} neue Dateien pro Stapel")
+        print(f"{'Ablage':<20} {'Planung [ms]':>12} {'scandir':>8} {'makedirs':>9} {'Einträge gelesen':>17}")
+        for label, layout in (("flach", LAYOUT_FLATTEN), (DATE_TEMPLATE, LayoutTemplate(DATE_TEMPLATE))):
+            output_path = os.path.join(root, label.replace("/", "_").strip("{}_") or "flat")
+            os.makedirs(output_path)
+            build_archive(output_path, layout, archive)
+            best = None
+            for _ in range(args.rounds):
+                seconds, stats = plan_batch(output_path, layout, items)
+                best = seconds if best is None else min(best, seconds)
+            # Einträge, die das Einlesen der Zielordner gekostet hat
+            directories = {target_location(output_path, item, layout)[0] for item in items}
+            entries = sum(len(os.listdir(d)) for d in directories if os.path.isdir(d))
+            counters = stats.report()["counters"]
+            print(f"{label:<20} {best * 1000:>12.1f} {counters.get('scandir_calls', 0):>8} "
+                  f"{counters.get('makedirs_calls', 0):>9} {entries:>17}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Benchmark: Speicherbedarf und Auswertung der Analyseergebnisse (scan_results.py).
+
+Aufruf:
+    python benchmarks/bench_results.py [--entries 1000000]
+
+Legt für synthetische Dateinamen die Ergebnisse einmal wie bisher als ein Dictionary
+pro Datei in einer Liste und einmal als ScanItem in ScanResults an. Gemessen werden
+der Spitzenwert des Speichers (tracemalloc) beim Aufbau sowie die Zeit für die
+Auswahl der umzubenennenden Einträge, die Anzahl je Status und den Statusfilter
+der Vorschau.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_classify import make_names  # noqa: E402
+from classify import classify_names  # noqa: E402
+from scan_results import ScanItem, ScanResults  # noqa: E402
+
+
+def scan_output(names):
+    """(Originalname, neuer Name, Status) wie von scan_classified; Pixel-Kandidaten gelten als OK."""
+    for name, info in zip(names, classify_names(names)):
+        if info.status_key:
+            yield name, name, info.status_key
+        else:
+            yield name, f"{name[4:12]}_{name[13:19]}{info.suffix}{info.ext}", "status_ok"
+
+
+def build_dicts(rows):
+    return [{"original": original, "new": new, "status_key": status_key} for original, new, status_key in rows]
+
+
+def build_results(rows):
+    results = ScanResults()
+    for original, new, status_key in rows:
+        if new == original:
+            new = original
+        results.append(ScanItem(original, new, status_key))
+    return results
+
+
+def dict_queries(items):
+    """Bisherige Auswertung: Auswahl kopieren, Status zählen, Vorschau filtern."""
+    to_process = [item for item in items if item["status_key"] == "status_ok"]
+    counts = {}
+    for item in items:
+        counts[item["status_key"]] = counts.get(item["status_key"], 0) + 1
+    view = [i for i, item in enumerate(items) if item["status_key"] == "status_video"]
+    return len(to_process), counts, len(view)
+
+
+def result_queries(results):
+    """Auswertung über die Indexlisten, ohne Durchlauf über alle Einträge."""
+    to_process = results.select("status_ok")
+    return len(to_process), results.counts(), len(results.indices("status_video"))
+
+
+def peak_memory(build, rows):
+    """Baut die Ergebnisse auf und gibt (Ergebnis, Spitzenwert in Bytes) zurück."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(rows)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000, help="Anzahl der Einträge")
+    args = parser.parse_args()
+
+    rows = list(scan_output(make_names(args.entries)))
+    print(f"{len(rows)} Einträge")
+    print(f"{'Variante':<22} {'Speicher [MB]':>13} {'Bytes/Eintrag':>13} {'Auswertung [ms]':>15}")
+    for label, build, queries in (("Dictionary pro Datei", build_dicts, dict_queries),
+                                  ("ScanItem/ScanResults", build_results, result_queries)):
+        result, peak = peak_memory(build, rows)
+        start = time.perf_counter()
+        queries(result)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<22} {peak / 1e6:>13.1f} {peak / len(rows):>13.0f} {elapsed * 1000:>15.1f}")
+        del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Benchmark: Durchsatz der Vorschau-Analyse in Abhängigkeit von Modus und Worker-Anzahl.
+
+Aufruf:
+    python benchmarks/bench_scan.py [--dir PFAD] [--workers 1,2,4,8,16] [--modes thread,process]
+
+Mit --dir lässt sich ein beliebiger Ordner messen, z.B. ein eingebundenes NAS-Share,
+um lokale Platte und langsamen Netzwerkspeicher zu vergleichen. Ohne --dir wird ein
+synthetischer Korpus in einem temporären Ordner erzeugt. Hinweis: Bei wiederholten
+Läufen auf lokaler Platte liegen die Dateien im Seitencache des Betriebssystems.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renamer_core import scan_files, SCAN_SERIAL  # noqa: E402
+from synthetic import make_corpus  # noqa: E402
+
+
+def measure(paths, mode, workers):
+    """Führt eine komplette Analyse aus und gibt die Laufzeit in Sekunden zurück."""
+    start = time.perf_counter()
+    for _ in scan_files(paths, mode, workers):
+        pass
+    return time.perf_counter() - start
+
+
+def run(paths, modes, worker_counts):
+    baseline = measure(paths, SCAN_SERIAL, 1)
+    print(f"{len(paths)} Dateien, seriell: {baseline:.3f} s ({len(paths) / baseline:.0f} Dateien/s)")
+    print(f"{'Modus':<8} {'Worker':>6} {'Zeit [s]':>9} {'Dateien/s':>10} {'Speedup':>8}")
+    for mode in modes:
+        for workers in worker_counts:
+            elapsed = measure(paths, mode, workers)
+            print(f"{mode:<8} {workers:>6} {elapsed:>9.3f} {len(paths) / elapsed:>10.0f} {baseline / elapsed:>7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", help="Ordner, dessen Dateien analysiert werden")
+    parser.add_argument("--jpg", type=int, default=2000, help="Anzahl synthetischer JPGs")
+    parser.add_argument("--dng", type=int, default=100, help="Anzahl synthetischer DNGs")
+    parser.add_argument("--workers", default="1,2,4,8,16", help="Kommagetrennte Worker-Anzahlen")
+    parser.add_argument("--modes", default="thread,process", help="Kommagetrennte Modi (thread, process)")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    if args.dir:
+        paths = [e.path for e in os.scandir(args.dir) if e.is_file()]
+        run(paths, modes, worker_counts)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_corpus(tmp, args.jpg, args.dng, jpg_size=64 * 1024)
+        run(paths, modes, worker_counts)
+
+
+if __name__ == "__main__":
+    main()
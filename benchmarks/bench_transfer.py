@@ -0,0 +1,148 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Benchmark: Durchsatz der Übertragungsverfahren aus transfer.py.
+
+Aufruf:
+    python benchmarks/bench_transfer.py [--target ZIELORDNER] [--files 20] [--mb 50] [--jobs 1,2,4,8]
+
+Legt Testdateien in einem temporären Quellordner (bzw. --source) an und überträgt sie
+mit jedem Verfahren in den Zielordner: gestreamte Kopie, Reflink/copy_file_range,
+Hardlink und Verschieben. Ausgegeben werden MB/s und das tatsächlich verwendete
+Verfahren (z.B. 'stream', wenn Reflinks auf dem Dateisystem nicht möglich sind).
+Danach werden die Dateien mit process_items aus renamer_core parallel kopiert, einmal je
+Wert von --jobs, um den erreichbaren Durchsatz auf dem Zielordner zu ermitteln, bevor
+echte Fotos übertragen werden. Alle erzeugten Dateien werden danach wieder gelöscht.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from renamer_core import process_items  # noqa: E402
+from scan_results import ScanItem  # noqa: E402
+from transfer import transfer_file, same_device  # noqa: E402
+
+# (Bezeichnung, Parameter für transfer_file)
+VARIANTS = [
+    ("Kopie (gestreamt)", dict(clone=False)),
+    ("Kopie (Klon)", dict(clone=True)),
+    ("Hardlink", dict(hardlink=True)),
+    ("Verschieben", dict(move=True)),
+]
+
+
+def make_files(directory, count, size):
+    """Schreibt 'count' Dateien mit Zufallsdaten der Größe 'size'."""
+    block = os.urandom(min(size, 1024 * 1024))
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"bench_{i:05d}.bin")
+        with open(path, "wb") as f:
+            remaining = size
+            while remaining > 0:
+                f.write(block[:remaining])
+                remaining -= len(block)
+        paths.append(path)
+    return paths
+
+
+def run_variant(paths, target, options):
+    """Überträgt alle Dateien und gibt (Sekunden, Verfahren-Zähler) zurück."""
+    strategies = Counter()
+    out_dir = tempfile.mkdtemp(prefix="bench_", dir=target)
+    try:
+        start = time.perf_counter()
+        for path in paths:
+            dst = os.path.join(out_dir, os.path.basename(path))
+            strategies[transfer_file(path, dst, **options)] += 1
+        elapsed = time.perf_counter() - start
+        if options.get("move"):
+            # Dateien für die nächsten Durchläufe zurückholen
+            for path in paths:
+                shutil.move(os.path.join(out_dir, os.path.basename(path)), path)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return elapsed, strategies
+
+
+def run_parallel(paths, target, jobs, per_device):
+    """Kopiert alle Dateien mit 'jobs' gleichzeitigen Übertragungen und gibt (Sekunden, Verfahren-Zähler) zurück."""
+    source = os.path.dirname(paths[0])
+    items = [ScanItem(os.path.basename(p), os.path.basename(p), "status_ok") for p in paths]
+    strategies = Counter()
+    out_dir = tempfile.mkdtemp(prefix="bench_", dir=target)
+    try:
+        start = time.perf_counter()
+        for item, _, strategy, error in process_items(items, source, out_dir, True, jobs=jobs, per_device=per_device):
+            if error is not None:
+                raise error
+            strategies[strategy] += 1
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return elapsed, strategies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", help="Ordner für die Testdateien (Standard: temporärer Ordner)")
+    parser.add_argument("--target", help="Zielordner (Standard: temporärer Ordner)")
+    parser.add_argument("--files", type=int, default=20, help="Anzahl der Testdateien")
+    parser.add_argument("--mb", type=int, default=50, help="Größe je Datei in MB")
+    parser.add_argument("--jobs", default="1,2,4,8", help="Kommagetrennte Anzahl gleichzeitiger Übertragungen")
+    parser.add_argument("--per-device", type=int, default=None, help="Höchstens N Übertragungen je Datenträger")
+    args = parser.parse_args()
+
+    target = args.target or tempfile.gettempdir()
+    os.makedirs(target, exist_ok=True)  # Vor same_device und mkdtemp, die den Ordner voraussetzen
+    source = tempfile.mkdtemp(prefix="bench_src_", dir=args.source)
+    try:
+        paths = make_files(source, args.files, args.mb * 1024 * 1024)
+        total_mb = args.files * args.mb
+        print(f"{args.files} Dateien à {args.mb} MB, gleiches Gerät: {same_device(paths[0], target)}")
+        print(f"{'Variante':<20} {'Zeit [s]':>9} {'MB/s':>10}  Verfahren")
+        for name, options in VARIANTS:
+            elapsed, strategies = run_variant(paths, target, options)
+            used = ", ".join(f"{k} x{v}" for k, v in strategies.items())
+            print(f"{name:<20} {elapsed:>9.3f} {total_mb / elapsed:>10.0f}  {used}")
+        print()
+        print(f"{'Parallel':<20} {'Zeit [s]':>9} {'MB/s':>10}  Verfahren")
+        for jobs in [int(j) for j in args.jobs.split(",") if j.strip()]:
+            elapsed, strategies = run_parallel(paths, target, jobs, args.per_device)
+            used = ", ".join(f"{k} x{v}" for k, v in strategies.items())
+            print(f"{f'{jobs} Übertragungen':<20} {elapsed:>9.3f} {total_mb / elapsed:>10.0f}  {used}")
+    finally:
+        shutil.rmtree(source, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
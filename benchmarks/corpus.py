@@ -0,0 +1,165 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Reproduzierbarer synthetischer Korpus einer Pixel-Kamerarolle für run_benchmarks.py.
+
+Aufruf:
+    python benchmarks/corpus.py ZIELORDNER [--files 10000] [--seed 1] [--dirs 1]
+
+Der Korpus enthält PXL_*.jpg mit minimalem EXIF-Block, große DNG-ähnliche TIFFs,
+MP4-Videos, fremde Dateien (IMG_*.jpg, Textdateien) und Serienaufnahmen, bei denen
+mehrere Fotos in derselben Sekunde entstehen und daher beim Umbenennen kollidieren.
+DNGs und Videos werden als sparse Dateien angelegt und belegen kaum Platz. Gleiche
+Parameter ergeben immer dieselben Dateien; die Parameter stehen in 'corpus.json',
+die Dateien im Unterordner 'files'.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import jpeg_body, write_dng, write_jpeg, write_mp4  # noqa: E402
+
+MANIFEST_NAME = "corpus.json"
+FILES_DIR = "files"
+# Anteile der Dateiarten; eine Serie ('burst') zählt als BURST_SIZE Dateien
+MIX = (("jpg", 0.70), ("burst", 0.10), ("dng", 0.05), ("mp4", 0.05), ("other", 0.10))
+BURST_SIZE = 5
+BURST_SPACING_MS = 150
+# Beginn der Aufnahmen (UTC) und Zeitzone der EXIF-Daten
+START = datetime(2024, 5, 1, 6, 0, 0)
+OFFSET = timedelta(hours=2)
+OFFSET_TEXT = "+02:00"
+
+
+def pixel_file_name(utc, milliseconds, ext, suffix=""):
+    """PXL-Name wie von der Kamera-App: UTC-Zeit mit Millisekunden, z.B. PXL_20240501_060000123.jpg."""
+    return f"PXL_{utc:%Y%m%d_%H%M%S}{milliseconds:03d}{suffix}{ext}"
+
+
+def exif_text(utc):
+    """Lokale Aufnahmezeit im EXIF-Format."""
+    return f"{utc + OFFSET:%Y:%m:%d %H:%M:%S}"
+
+
+def corpus_params(files=1000, seed=1, dirs=1, jpg_kb=16, dng_mb=16, mp4_mb=32):
+    """Parameter eines Korpus als Dictionary (so auch in corpus.json gespeichert)."""
+    return {"files": files, "seed": seed, "dirs": dirs, "jpg_kb": jpg_kb, "dng_mb": dng_mb, "mp4_mb": mp4_mb}
+
+
+def load_manifest(directory):
+    """Liest corpus.json eines Korpus-Ordners; None, wenn es keinen (vollständigen) Korpus gibt."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def generate_corpus(directory, files=1000, seed=1, dirs=1, jpg_kb=16, dng_mb=16, mp4_mb=32):
+    """
+    Legt den Korpus in 'directory' an (Dateien in directory/files, verteilt auf 'dirs'
+    Unterordner) und gibt das Manifest zurück. Ein vorhandener Korpus mit denselben
+    Parametern wird wiederverwendet.
+    """
+    params = corpus_params(files, seed, dirs, jpg_kb, dng_mb, mp4_mb)
+    manifest = load_manifest(directory)
+    if manifest is not None and manifest["params"] == params:
+        return manifest
+
+    rng = random.Random(seed)
+    body = jpeg_body(rng)
+    kinds = [kind for kind, _ in MIX]
+    weights = [share / (BURST_SIZE if kind == "burst" else 1) for kind, share in MIX]
+    counts = dict.fromkeys(("jpg", "burst", "dng", "mp4", "other"), 0)
+    root = os.path.join(directory, FILES_DIR)
+    folders = [root] if dirs <= 1 else [os.path.join(root, f"{i:03d}") for i in range(dirs)]
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+
+    utc = START
+    written = group = 0
+    while written < files:
+        folder = folders[group % len(folders)]
+        group += 1
+        utc += timedelta(seconds=rng.randint(1, 120))
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "burst":
+            # Gleiche Sekunde, verschiedene Millisekunden: gleicher neuer Name, also _1, _2, ...
+            for shot in range(min(BURST_SIZE, files - written)):
+                name = pixel_file_name(utc, shot * BURST_SPACING_MS, ".jpg")
+                write_jpeg(os.path.join(folder, name), exif_text(utc), OFFSET_TEXT, jpg_kb * 1024, body=body)
+                written += 1
+                counts[kind] += 1
+            continue
+        milliseconds = rng.randrange(1000)
+        if kind == "jpg":
+            suffix = ".NIGHT" if rng.random() < 0.1 else ""
+            name = pixel_file_name(utc, milliseconds, ".jpg", suffix)
+            write_jpeg(os.path.join(folder, name), exif_text(utc), OFFSET_TEXT, jpg_kb * 1024, body=body)
+        elif kind == "dng":
+            name = pixel_file_name(utc, milliseconds, ".dng", ".RAW-01.MP.COVER")
+            write_dng(os.path.join(folder, name), exif_text(utc), OFFSET_TEXT, dng_mb * 1024 * 1024)
+        elif kind == "mp4":
+            name = pixel_file_name(utc, milliseconds, ".mp4", ".LS" if rng.random() < 0.2 else "")
+            write_mp4(os.path.join(folder, name), utc, mp4_mb * 1024 * 1024)
+        else:
+            name = f"IMG_{written:07d}.jpg" if rng.random() < 0.5 else f"notes_{written:07d}.txt"
+            with open(os.path.join(folder, name), "wb") as f:
+                f.write(body[:1024])
+        written += 1
+        counts[kind] += 1
+
+    manifest = {"params": params, "counts": counts, "files_dir": FILES_DIR}
+    # Das Manifest wird zuletzt geschrieben und markiert damit einen vollständigen Korpus
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("directory", metavar="ZIELORDNER", help="Ordner für den Korpus (wird angelegt)")
+    parser.add_argument("--files", type=int, default=1000, help="Anzahl der Dateien (z.B. 1000 bis 1000000)")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--dirs", type=int, default=1, help="Anzahl der Unterordner")
+    parser.add_argument("--jpg-kb", type=int, default=16, help="Größe der JPGs in KB")
+    parser.add_argument("--dng-mb", type=int, default=16, help="Größe der DNGs in MB (sparse)")
+    parser.add_argument("--mp4-mb", type=int, default=32, help="Größe der Videos in MB (sparse)")
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.directory, args.files, args.seed, args.dirs, args.jpg_kb, args.dng_mb,
+                               args.mp4_mb)
+    print(json.dumps(manifest["counts"]))
+
+
+if __name__ == "__main__":
+    main()
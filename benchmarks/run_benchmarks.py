@@ -0,0 +1,208 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Benchmark-Suite: misst die Stufen eines kompletten Laufs einzeln auf einem
+synthetischen Korpus (siehe corpus.py) und schreibt die Ergebnisse als JSON.
+
+Aufruf:
+    python benchmarks/run_benchmarks.py [--files 10000] [--corpus ORDNER] [--jobs 8]
+                                        [--output ergebnis.json] [--compare vorher.json]
+
+Gemessene Stufen:
+- list_classify: Ordner durchlaufen (SourceWalker) und Namen einordnen (classify.py)
+- new_names:     Aufnahmezeit lesen und neuen Namen bilden (ohne EXIF-Cache)
+- plan:          Zielnamen samt _N-Suffixen für Kollisionen vergeben (TransferPlanner)
+- copy:          Dateien umbenannt kopieren (process_items, Zielnamen inkl. Planung)
+- move:          Dateien umbenannt verschieben (danach ungemessen zurückverschoben)
+
+Mit --compare wird jede Stufe mit einer früheren Ergebnisdatei verglichen, z.B. der
+eines älteren Stands. Ohne --corpus wird der Korpus in einem temporären Ordner
+angelegt und danach gelöscht; mit --corpus bleibt er erhalten und wird bei gleichen
+Parametern wiederverwendet. Hinweis: Frisch erzeugte Dateien liegen im Seitencache.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from classify import classify_names  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+from renamer_core import (SCAN_SERIAL, SCAN_THREAD, SourceWalker, TransferPlanner, process_items,  # noqa: E402
+                          scan_classified)
+from scan_results import ScanItem, ScanResults  # noqa: E402
+
+# Version des Ergebnisformats
+RESULT_FORMAT = 1
+STAGES = ("list_classify", "new_names", "plan", "copy", "move")
+
+
+def git_revision():
+    """Kurzer Commit-Hash des Programmstands, oder None außerhalb eines Git-Repositorys."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def stage_result(seconds, files, total_bytes=None):
+    """Ergebnis einer Stufe: Zeit, Dateien und Durchsatz."""
+    result = {"seconds": round(seconds, 6), "files": files,
+              "files_per_sec": round(files / seconds, 1) if seconds else None}
+    if total_bytes is not None:
+        result["bytes"] = total_bytes
+        result["mb_per_sec"] = round(total_bytes / 1e6 / seconds, 1) if seconds else None
+    return result
+
+
+def run_stages(source, work_dir, jobs, transfer_jobs, videos):
+    """Führt alle Stufen nacheinander aus und gibt {Stufe: Ergebnis} zurück."""
+    stages = {}
+    mode = SCAN_THREAD if jobs > 1 else SCAN_SERIAL
+
+    start = time.perf_counter()
+    rel_paths = list(SourceWalker(source, recursive=True))
+    infos = classify_names([os.path.basename(rel_path) for rel_path in rel_paths], videos)
+    stages["list_classify"] = stage_result(time.perf_counter() - start, len(rel_paths))
+
+    start = time.perf_counter()
+    entries = [(os.path.join(source, rel_path), info) for rel_path, info in zip(rel_paths, infos)]
+    results = ScanResults()
+    results.extend(ScanItem(rel_path, new_name, status_key)
+                   for rel_path, (new_name, status_key) in zip(rel_paths, scan_classified(entries, mode, jobs)))
+    candidates = sum(1 for info in infos if info.status_key is None)
+    stages["new_names"] = stage_result(time.perf_counter() - start, candidates)
+
+    ok_items = results.select("status_ok")
+    total_bytes = sum(os.path.getsize(os.path.join(source, item.original)) for item in ok_items)
+
+    plan_dir = os.path.join(work_dir, "plan")
+    os.makedirs(plan_dir)
+    start = time.perf_counter()
+    planner = TransferPlanner(plan_dir)
+    for item in ok_items:
+        planner.plan(item)
+    stages["plan"] = stage_result(time.perf_counter() - start, len(ok_items))
+
+    for name, copy in (("copy", True), ("move", False)):
+        output = os.path.join(work_dir, name)
+        os.makedirs(output)
+        start = time.perf_counter()
+        moved = [(item, new_path) for item, new_path, _, error in
+                 process_items(ok_items, source, output, copy, jobs=transfer_jobs)
+                 if new_path is not None and error is None]
+        stages[name] = stage_result(time.perf_counter() - start, len(moved), total_bytes)
+        if not copy:
+            # Stellt den Korpus für spätere Läufe wieder her
+            for item, new_path in moved:
+                os.replace(new_path, os.path.join(source, item.original))
+        shutil.rmtree(output)
+    return stages
+
+
+def compare(results, baseline):
+    """Gibt für jede Stufe die Zeit im Vergleich zur Ergebnisdatei 'baseline' aus."""
+    print(f"Vergleich mit {baseline.get('revision') or '?'} vom {baseline.get('created', '?')}")
+    print(f"{'Stufe':<14} {'vorher [s]':>11} {'jetzt [s]':>10} {'Faktor':>8}")
+    for stage in STAGES:
+        old = baseline.get("stages", {}).get(stage)
+        new = results["stages"].get(stage)
+        if not old or not new:
+            continue
+        # Faktor > 1: schneller als vorher
+        factor = old["seconds"] / new["seconds"] if new["seconds"] else float("inf")
+        print(f"{stage:<14} {old['seconds']:>11.3f} {new['seconds']:>10.3f} {factor:>7.2f}x")
+    if baseline.get("corpus") != results["corpus"]:
+        print("Hinweis: Die Korpus-Parameter unterscheiden sich, die Zeiten sind nur bedingt vergleichbar.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=1000, help="Anzahl der Dateien im Korpus (1000 bis 1000000)")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert für den Korpus")
+    parser.add_argument("--dirs", type=int, default=1, help="Anzahl der Unterordner im Korpus")
+    parser.add_argument("--dng-mb", type=int, default=16, help="Größe der DNGs in MB")
+    parser.add_argument("--corpus", help="Ordner für den Korpus (bleibt erhalten, Standard: temporär)")
+    parser.add_argument("--work", help="Ordner für die Ausgabe der Kopier-/Verschiebestufen (Standard: temporär)")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker für die Analyse (Threads)")
+    parser.add_argument("--transfer-jobs", type=int, default=1, help="Gleichzeitige Übertragungen")
+    parser.add_argument("--videos", action="store_true", help="Videos mit umbenennen")
+    parser.add_argument("--output", help="Ergebnisse als JSON in diese Datei schreiben (Standard: stdout)")
+    parser.add_argument("--compare", metavar="JSON", help="Mit einer früheren Ergebnisdatei vergleichen")
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="pxl_corpus_")
+    work_dir = tempfile.mkdtemp(prefix="pxl_bench_", dir=args.work)
+    try:
+        start = time.perf_counter()
+        manifest = generate_corpus(corpus_dir, args.files, args.seed, args.dirs, dng_mb=args.dng_mb)
+        print(f"Korpus: {manifest['counts']} ({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+        stages = run_stages(os.path.join(corpus_dir, manifest["files_dir"]), work_dir, args.jobs,
+                            args.transfer_jobs, args.videos)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    results = {
+        "format": RESULT_FORMAT,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "corpus": manifest["params"],
+        "settings": {"jobs": args.jobs, "transfer_jobs": args.transfer_jobs, "videos": args.videos},
+        "stages": stages,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for stage in STAGES:
+        result = stages[stage]
+        rate = f"{result['files_per_sec']:.0f} Dateien/s" if result["files_per_sec"] else "-"
+        print(f"{stage:<14} {result['seconds']:>9.3f} s  {rate}", file=sys.stderr)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
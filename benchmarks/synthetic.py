@@ -0,0 +1,244 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Erzeugt synthetische Pixel-Dateien (JPG mit EXIF, DNG-ähnliche TIFFs, MP4) für die Benchmarks.
+Die Dateien enthalten nur die Strukturen, die für die Datumserkennung relevant sind;
+die Bilddaten werden durch Zufallsbytes bzw. leere (sparse) Bereiche ersetzt.
+"""
+
+import os
+import random
+import struct
+from datetime import datetime
+
+# TIFF-Datentypen und ihre Größe in Bytes
+TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 13: 4}
+
+
+def _ascii(text):
+    return (2, text.encode("ascii") + b"\x00")
+
+
+def _long(value):
+    return (4, [value])
+
+
+def _short(value):
+    return (3, [value])
+
+
+def build_tiff(ifd0_tags, exif_tags, endian="<", data_padding=0):
+    """
+    Baut einen minimalen TIFF-Block mit IFD0 und Exif-IFD.
+    Die Tags werden als {tag: (typ, wert)} übergeben. Mit 'data_padding' wird hinter
+    den IFDs Platz für (angebliche) Bilddaten reserviert, wie bei einer echten DNG.
+    """
+    def ifd_size(tags):
+        return 2 + len(tags) * 12 + 4
+
+    def values_size(tags):
+        size = 0
+        for value_type, value in tags.values():
+            length = _value_length(value_type, value)
+            if length > 4:
+                size += length + (length & 1)
+        return size
+
+    ifd0_tags = dict(ifd0_tags)
+    ifd0_tags[0x8769] = _long(0)  # Platzhalter, wird unten gesetzt
+    ifd0_offset = 8
+    ifd0_values = ifd0_offset + ifd_size(ifd0_tags)
+    exif_offset = ifd0_values + values_size(ifd0_tags)
+    ifd0_tags[0x8769] = _long(exif_offset)
+    exif_values = exif_offset + ifd_size(exif_tags)
+
+    header = (b"II*\x00" if endian == "<" else b"MM\x00*") + struct.pack(endian + "I", ifd0_offset)
+    ifd0 = _pack_ifd(ifd0_tags, endian, ifd0_values)
+    exif = _pack_ifd(exif_tags, endian, exif_values)
+    return header + ifd0 + exif + b"\x00" * data_padding
+
+
+def _value_length(value_type, value):
+    if value_type in (1, 2, 7):
+        return len(value)
+    return TYPE_SIZES[value_type] * len(value)
+
+
+def _pack_value(value_type, value, endian):
+    if value_type in (1, 2, 7):
+        return bytes(value)
+    fmt = {3: "H", 4: "I", 13: "I"}[value_type]
+    return struct.pack(endian + fmt * len(value), *value)
+
+
+def _pack_ifd(tags, endian, values_offset):
+    """Packt ein IFD inklusive der ausgelagerten Werte (die direkt dahinter folgen)."""
+    entries = []
+    values = b""
+    for tag in sorted(tags):
+        value_type, value = tags[tag]
+        count = len(value)
+        data = _pack_value(value_type, value, endian)
+        if len(data) <= 4:
+            field = data.ljust(4, b"\x00")
+        else:
+            field = struct.pack(endian + "I", values_offset + len(values))
+            values += data + (b"\x00" if len(data) & 1 else b"")
+        entries.append(struct.pack(endian + "HHI", tag, value_type, count) + field)
+    return struct.pack(endian + "H", len(entries)) + b"".join(entries) + b"\x00" * 4 + values
+
+
+def exif_tiff(date_time, offset="+02:00", endian="<"):
+    """TIFF-Block, wie er im APP1-Segment eines Pixel-JPEGs steht."""
+    ifd0 = {0x010F: _ascii("Google"), 0x0110: _ascii("Pixel 8 Pro"), 0x0112: _short(1)}
+    exif = {0x9003: _ascii(date_time), 0x9004: _ascii(date_time)}
+    if offset:
+        exif[0x9010] = _ascii(offset)
+        exif[0x9011] = _ascii(offset)
+    return build_tiff(ifd0, exif, endian)
+
+
+def jpeg_body(rng, size=4096):
+    """Zufällige 'Bilddaten' ohne 0xFF, damit keine JPEG-Marker entstehen."""
+    return bytes(rng.randrange(0, 255) for _ in range(size))
+
+
+def write_jpeg(path, date_time, offset="+02:00", size=256 * 1024, rng=None, body=None):
+    """
+    Schreibt ein JPEG mit JFIF-APP0, Exif-APP1 und zufälligen 'Bilddaten'. Mit 'body'
+    werden vorab erzeugte Bilddaten (siehe jpeg_body) wiederholt, statt neue zu würfeln.
+    """
+    tiff = b"Exif\x00\x00" + exif_tiff(date_time, offset)
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00"
+    app1 = b"\xff\xe1" + struct.pack(">H", len(tiff) + 2) + tiff
+    sos = b"\xff\xda" + struct.pack(">H", 8) + b"\x01\x01\x00\x00\x3f\x00"
+    head = b"\xff\xd8" + app0 + app1 + sos
+    body_size = max(0, size - len(head) - 2)
+    if body is None:
+        body = jpeg_body(rng or random.Random(0), min(body_size, 4096))
+    with open(path, "wb") as f:
+        f.write(head)
+        remaining = body_size
+        while remaining > 0:
+            chunk = body[:remaining]
+            f.write(chunk)
+            remaining -= len(chunk)
+        f.write(b"\xff\xd9")
+
+
+def write_dng(path, date_time, offset="+02:00", size=40 * 1024 * 1024):
+    """
+    Schreibt eine DNG-ähnliche TIFF-Datei der gegebenen Größe. Die Rohdaten werden
+    als sparse Bereich angelegt, sodass die Datei kaum Speicherplatz belegt.
+    """
+    ifd0 = {
+        0x00FE: _long(0), 0x0100: _long(4080), 0x0101: _long(3072),
+        0x010F: _ascii("Google"), 0x0110: _ascii("Pixel 8 Pro"),
+        0xC612: (1, [1, 4, 0, 0]),  # DNGVersion
+    }
+    exif = {0x9003: _ascii(date_time), 0x9004: _ascii(date_time)}
+    if offset:
+        exif[0x9010] = _ascii(offset)
+        exif[0x9011] = _ascii(offset)
+    data = build_tiff(ifd0, exif)
+    with open(path, "wb") as f:
+        f.write(data)
+        f.truncate(max(size, len(data)))
+
+
+def _box(box_type, payload):
+    return struct.pack(">I4s", 8 + len(payload), box_type) + payload
+
+
+def _time_box(box_type, seconds, version):
+    """mvhd/mdhd mit Erstellungszeit (Sekunden seit 1904); die übrigen Felder bleiben leer."""
+    if version == 1:
+        times = struct.pack(">QQIQ", seconds, seconds, 1000, 0)
+    else:
+        times = struct.pack(">IIII", seconds, seconds, 1000, 0)
+    rest = bytes(80) if box_type == b"mvhd" else bytes(4)
+    return _box(box_type, bytes([version, 0, 0, 0]) + times + rest)
+
+
+def write_mp4(path, created, size=8 * 1024 * 1024, moov_at_end=True, version=0, mvhd_time=True):
+    """
+    Schreibt ein MP4 mit ftyp, mdat (sparse) und moov (mvhd, trak/mdia/mdhd). 'created'
+    ist die Erstellungszeit (datetime, UTC). Wie bei Pixel-Videos liegt moov standardmäßig
+    hinter den Mediendaten; ab 4 GB bekommt mdat eine 64-Bit-Größe. Mit mvhd_time=False
+    steht die Zeit nur in mdhd.
+    """
+    seconds = int((created - datetime(1904, 1, 1)).total_seconds())
+    mdhd = _time_box(b"mdhd", seconds, version)
+    trak = _box(b"trak", _box(b"mdia", mdhd))
+    moov = _box(b"moov", _time_box(b"mvhd", seconds if mvhd_time else 0, version) + trak)
+    ftyp = _box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2mp41")
+    mdat_size = max(16, size - len(ftyp) - len(moov))
+    if mdat_size > 0xFFFFFFFF:
+        mdat_header = struct.pack(">I4sQ", 1, b"mdat", mdat_size)
+    else:
+        mdat_header = struct.pack(">I4s", mdat_size, b"mdat")
+    media_size = mdat_size - len(mdat_header)
+    with open(path, "wb") as f:
+        f.write(ftyp)
+        if not moov_at_end:
+            f.write(moov)
+        f.write(mdat_header)
+        f.seek(media_size, 1)  # Mediendaten als sparse Bereich
+        if moov_at_end:
+            f.write(moov)
+        f.truncate()
+
+
+def pixel_name(index, ext, suffix=""):
+    """Erzeugt einen Pixel-Dateinamen wie PXL_20240512_103015123.NIGHT.jpg."""
+    seconds = index % 86400
+    hh, mm, ss = seconds // 3600, seconds // 60 % 60, seconds % 60
+    day = 1 + index // 86400 % 28
+    return f"PXL_202405{day:02d}_{hh:02d}{mm:02d}{ss:02d}{index % 1000:03d}{suffix}{ext}"
+
+
+def exif_date_for(name):
+    """EXIF-Datum (lokale Zeit, hier UTC+2) passend zu einem von pixel_name erzeugten Namen."""
+    stamp = name[4:19]
+    hh = (int(stamp[9:11]) + 2) % 24
+    return f"{stamp[0:4]}:{stamp[4:6]}:{stamp[6:8]} {hh:02d}:{stamp[11:13]}:{stamp[13:15]}"
+
+
+def make_corpus(directory, jpg_count=100, dng_count=20, jpg_size=256 * 1024, dng_size=40 * 1024 * 1024):
+    """Legt einen Ordner mit synthetischen JPGs und DNGs an und gibt die Dateipfade zurück."""
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(42)
+    paths = []
+    for i in range(jpg_count):
+        name = pixel_name(i * 7, ".jpg")
+        path = os.path.join(directory, name)
+        write_jpeg(path, exif_date_for(name), size=jpg_size, rng=rng)
+        paths.append(path)
+    for i in range(dng_count):
+        name = pixel_name(i * 7 + 3, ".dng", ".RAW-01.MP.COVER")
+        path = os.path.join(directory, name)
+        write_dng(path, exif_date_for(name), size=dng_size)
+        paths.append(path)
+    return paths
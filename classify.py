@@ -0,0 +1,128 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Einordnung der Dateien allein anhand des Namens, bevor eine Datei geöffnet wird.
+
+Jede Datei landet in einer der Kategorien der Zusammenfassung (Videos, andere
+Dateien, Pixel-JPG, Pixel-DNG). Nur Pixel-Dateien sind Kandidaten für das Lesen
+der EXIF-Daten (Pixel-Videos nur auf Wunsch, siehe mp4_reader.py); für sie wird
+hier auch der Suffix (z.B. '.RAW-01.MP.COVER') ermittelt. Die Muster sind
+vorkompiliert, Dateiendungen werden in frozensets nachgeschlagen, sodass eine
+ganze Ordnerliste in wenigen Mikrosekunden pro Name eingeordnet ist.
+"""
+
+import re
+from collections import namedtuple
+
+# Dateiendungen (klein geschrieben)
+VIDEO_EXTENSIONS = frozenset((".mp4", ".mov", ".mkv"))
+MP4_EXTENSIONS = frozenset((".mp4", ".mov"))  # Videos, deren Erstellungszeit mp4_reader lesen kann
+JPG_EXTENSIONS = frozenset((".jpg", ".jpeg"))
+DNG_EXTENSIONS = frozenset((".dng",))
+
+# Kategorien = Schlüssel der Zusammenfassung (new_counts)
+KIND_VIDEO = "videos"
+KIND_OTHER = "other"
+KIND_JPG = "jpg"
+KIND_DNG = "dng"
+KIND_PIXEL = None  # Pixel-Datei mit anderer Endung: wird analysiert, aber nicht extra gezählt
+
+# Ergebnis der Einordnung. 'status_key' ist None für Kandidaten, die gelesen werden müssen.
+NameInfo = namedtuple("NameInfo", "status_key kind ext suffix")
+
+# Höchstzahl gemeinsam genutzter NameInfo-Objekte (je Endung und Suffix)
+MAX_SHARED_INFOS = 4096
+
+_PXL_SUFFIX = re.compile(r"PXL_\d{8}_\d{9}(.*?)\..{3,4}$", re.IGNORECASE)
+
+# Für Nicht-Kandidaten gleicher Endung ist das Ergebnis dasselbe (die Endung fremder
+# Dateien wird nicht gebraucht und bleibt leer)
+_VIDEO_INFO = {ext: NameInfo("status_video", KIND_VIDEO, ext, "") for ext in VIDEO_EXTENSIONS}
+_OTHER_INFO = NameInfo("status_not_pixel", KIND_OTHER, "", "")
+_candidates = {}
+
+
+def file_extension(filename):
+    """Wie os.path.splitext(filename)[1].lower(), aber ohne den Umweg über os.path."""
+    dot = filename.rfind(".")
+    if dot <= 0 or (filename[dot - 1] == "." and not filename[:dot].strip(".")):
+        return ""  # Keine Endung bzw. nur führende Punkte ('.hidden')
+    return filename[dot:].lower()
+
+
+def pxl_suffix(filename):
+    """Suffix zwischen Zeitstempel und Endung, z.B. '.NIGHT' in PXL_20240501_000007007.NIGHT.jpg."""
+    match = _PXL_SUFFIX.match(filename)
+    return match.group(1) if match else ""
+
+
+def classify_name(filename, videos=False):
+    """
+    Ordnet eine Datei anhand ihres Namens (ohne Ordner) ein und gibt ein NameInfo zurück.
+    Mit 'videos' sind auch Pixel-Videos (MP4/MOV) Kandidaten.
+    """
+    ext = file_extension(filename)
+    if ext in VIDEO_EXTENSIONS and not (videos and ext in MP4_EXTENSIONS):
+        return _VIDEO_INFO[ext]
+    if filename[:4].upper() != "PXL_":
+        return _VIDEO_INFO[ext] if ext in VIDEO_EXTENSIONS else _OTHER_INFO
+    # Übliche Namen (PXL_ + 8 + _ + 9 Ziffern, Endung mit 3-4 Zeichen) ohne regulären Ausdruck
+    suffix = None
+    if 4 <= len(ext) <= 5 and filename[12:13] == "_" and filename[4:12].isdigit() and filename[13:22].isdigit():
+        suffix = filename[22:len(filename) - len(ext)]
+    if suffix is None or suffix.endswith("."):
+        suffix = pxl_suffix(filename)
+    # Kandidaten mit gleicher Endung und gleichem Suffix teilen sich ein NameInfo
+    info = _candidates.get((ext, suffix))
+    if info is None:
+        if ext in JPG_EXTENSIONS:
+            kind = KIND_JPG
+        elif ext in DNG_EXTENSIONS:
+            kind = KIND_DNG
+        else:
+            kind = KIND_VIDEO if ext in VIDEO_EXTENSIONS else KIND_PIXEL
+        info = NameInfo(None, kind, ext, suffix)
+        if len(_candidates) < MAX_SHARED_INFOS:
+            _candidates[(ext, suffix)] = info
+    return info
+
+
+def classify_names(filenames, videos=False):
+    """Ordnet eine ganze Liste von Dateinamen ein (Liste von NameInfo in derselben Reihenfolge)."""
+    classify = classify_name
+    return [classify(filename, videos) for filename in filenames]
+
+
+def new_counts(total=0):
+    """Erzeugt ein leeres Dictionary für die Zusammenfassung des Ordners."""
+    return {"total": total, "jpg": 0, "dng": 0, "videos": 0, "other": 0}
+
+
+def count_kind(counts, info):
+    """Zählt eine eingeordnete Datei in der passenden Kategorie der Zusammenfassung (ohne 'total')."""
+    if info.kind is not KIND_PIXEL:
+        counts[info.kind] += 1
+
@@ -0,0 +1,189 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Erkennung byte-gleicher Dateien (z.B. dasselbe Foto aus Takeout und vom Gerät).
+
+Gehasht wird nur, wenn es überhaupt eine andere Datei gleicher Größe gibt, sei es
+im Quellordner oder bereits im Ausgabeordner. Die Hashes (BLAKE2b) werden parallel
+in Threads berechnet, da hashlib bei großen Blöcken den GIL freigibt, und im
+ScanCache gespeichert. Spätere Läufe in dasselbe Archiv müssen die vorhandenen
+Dateien daher nicht erneut lesen.
+"""
+
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Was mit erkannten Duplikaten geschieht
+DUP_SKIP = "skip"  # Nicht übertragen
+DUP_LINK = "link"  # Als Hardlink auf die bereits vorhandene Datei anlegen
+
+# Blockgröße beim Lesen für den Hash
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """Berechnet den BLAKE2b-Hash des Dateiinhalts als Hex-String."""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def archive_files(directory):
+    """Liefert (Pfad, stat-Ergebnis) für alle Dateien unterhalb des Ordners."""
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry.path, entry.stat()
+        except OSError:
+            continue
+
+
+class Deduplicator:
+    """
+    Markiert Einträge mit Status OK, deren Inhalt schon in einer früheren Datei des
+    Laufs oder im Ausgabeordner vorkommt, als "status_duplicate" und trägt den Pfad
+    des Originals unter 'duplicate_of' ein. Die erste Datei mit einem Inhalt bleibt
+    das Original; Dateien im Ausgabeordner gehen den Quelldateien vor.
+
+    Der Cache wird nur in dem Thread benutzt, der mark() aufruft.
+    """
+
+    def __init__(self, source_path, output_path=None, cache=None, workers=4):
+        self.source_path = source_path
+        self.cache = cache
+        self.workers = workers
+        self._by_size = {}   # Größe -> Pfade der bisher bekannten Dateien dieser Größe
+        self._stats = {}     # Pfad -> (Größe, mtime_ns)
+        self._digests = {}   # Pfad -> Hash oder Future, solange er berechnet wird
+        self._first = {}     # (Größe, Hash) -> Pfad der ersten Datei mit diesem Inhalt
+        self._executor = None
+        self.duplicates = 0
+        if output_path and os.path.isdir(output_path):
+            for path, stat in archive_files(output_path):
+                self._add(path, stat)
+
+    def _add(self, path, stat):
+        self._by_size.setdefault(stat.st_size, []).append(path)
+        self._stats[path] = (stat.st_size, stat.st_mtime_ns)
+
+    def _request(self, path):
+        """Stößt die Hash-Berechnung an, falls der Hash weder bekannt noch im Cache ist."""
+        if path in self._digests:
+            return
+        digest = self.cache.get_hash(path, *self._stats[path]) if self.cache is not None else None
+        if digest is None:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            digest = self._executor.submit(file_digest, path)
+        self._digests[path] = digest
+
+    def _digest(self, path):
+        """Gibt den Hash zurück und wartet ggf. auf die Berechnung. Wirft OSError."""
+        digest = self._digests[path]
+        if isinstance(digest, Future):
+            try:
+                digest = digest.result()
+            except OSError:
+                del self._digests[path]
+                raise
+            self._digests[path] = digest
+            if self.cache is not None:
+                self.cache.put_hash(path, *self._stats[path], digest)
+        return digest
+
+    def mark(self, items):
+        """
+        Liefert alle Einträge in der Eingabereihenfolge zurück, Duplikate entsprechend
+        markiert. Gehashte Einträge erhalten den Hash in 'digest'.
+        """
+        pending = deque()
+        try:
+            for item in items:
+                path = candidates = None
+                if item.status_key == "status_ok":
+                    path = os.path.join(self.source_path, item.original)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        path = None
+                    else:
+                        candidates = list(self._by_size.get(stat.st_size, ()))
+                        self._add(path, stat)
+                        if candidates:
+                            # Nur bei gleicher Größe ist ein Vergleich der Inhalte nötig
+                            self._request(path)
+                            for candidate in candidates:
+                                self._request(candidate)
+                pending.append((item, path, candidates))
+                # Begrenzt die Anzahl der Einträge, deren Hash noch aussteht
+                while len(pending) > self.workers * 4:
+                    yield self._finish(*pending.popleft())
+            while pending:
+                yield self._finish(*pending.popleft())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+
+    def _finish(self, item, path, candidates):
+        if not candidates:
+            return item
+        try:
+            digest = self._digest(path)
+        except OSError:
+            return item  # Nicht lesbar: wird wie bisher behandelt und meldet den Fehler beim Übertragen
+        size = self._stats[path][0]
+        for candidate in candidates:
+            try:
+                self._first.setdefault((size, self._digest(candidate)), candidate)
+            except OSError:
+                continue
+        item.digest = digest
+        original = self._first.setdefault((size, digest), path)
+        if original != path:
+            item.status_key = "status_duplicate"
+            item.duplicate_of = original
+            self.duplicates += 1
+        return item
+
+    def record(self, item, new_path):
+        """Speichert den Hash einer übertragenen Datei unter ihrem neuen Pfad im Cache."""
+        if self.cache is None or item.digest is None:
+            return
+        try:
+            stat = os.stat(new_path)
+        except OSError:
+            return
+        self.cache.put_hash(new_path, stat.st_size, stat.st_mtime_ns, item.digest)
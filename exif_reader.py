@@ -0,0 +1,248 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Schneller EXIF-Leser, der nur die Aufnahmezeit-Tags ausliest.
+
+Statt wie piexif.load die komplette Datei (bei DNGs 40-80 MB) einzulesen und alle
+IFDs zu dekodieren, liest dieses Modul nur den Kopf der Datei: bei JPEGs das
+APP1-Segment, bei DNG/TIFF die IFD-Kette bis zum Exif-Sub-IFD. Ausgelesen werden
+nur DateTimeOriginal, OffsetTimeOriginal und OffsetTime.
+"""
+
+import os
+import struct
+from collections import namedtuple
+
+# Ergebnis des Lesevorgangs. Fehlende Tags sind None. 'creation_utc' ist die
+# Erstellungszeit eines Videos in UTC (siehe mp4_reader.py), bei Fotos immer None.
+ExifDates = namedtuple("ExifDates", "date_time_original offset_time_original offset_time creation_utc",
+                       defaults=(None,))
+NO_EXIF_DATES = ExifDates(None, None, None)
+
+# TIFF/EXIF-Tag-Nummern, die wir benötigen
+TAG_EXIF_IFD_POINTER = 0x8769
+TAG_DATE_TIME_ORIGINAL = 0x9003
+TAG_OFFSET_TIME = 0x9010
+TAG_OFFSET_TIME_ORIGINAL = 0x9011
+
+# TIFF-Datentypen
+TYPE_ASCII = 2
+TYPE_SHORT = 3
+TYPE_LONG = 4
+TYPE_IFD = 13
+
+# Größe des Blocks, der beim Öffnen einmalig vom Dateianfang gelesen wird.
+# Bei Pixel-JPEGs und -DNGs liegen alle benötigten Daten innerhalb dieses Blocks.
+HEAD_SIZE = 64 * 1024
+# Schutz gegen kaputte Dateien: mehr Einträge hat kein sinnvolles IFD
+MAX_IFD_ENTRIES = 1024
+# Maximale Anzahl an JPEG-Segmenten, die vor dem Exif-APP1 übersprungen werden
+MAX_JPEG_SEGMENTS = 32
+
+
+class ExifFormatError(ValueError):
+    """Die Datei hat ein Format, das der schnelle Leser nicht verarbeiten kann."""
+
+
+class _FileWindow:
+    """
+    Liest Bereiche aus einer Datei. Der Dateianfang wird einmalig gepuffert,
+    alles dahinter wird gezielt mit seek/read nachgeladen.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.head = f.read(HEAD_SIZE)
+        self.bytes_read = len(self.head)
+
+    def read_at(self, offset, size):
+        end = offset + size
+        if end <= len(self.head):
+            return self.head[offset:end]
+        self.f.seek(offset)
+        data = self.f.read(size)
+        self.bytes_read += len(data)
+        if len(data) != size:
+            raise ExifFormatError("Datei ist abgeschnitten")
+        return data
+
+
+def read_exif_dates(path, io_stats=None):
+    """
+    Liest DateTimeOriginal und die Zeitzonen-Offsets aus einer JPEG- oder DNG/TIFF-Datei.
+    Gibt ein ExifDates-Tupel zurück. Wirft ExifFormatError bei unbekannten oder
+    beschädigten Dateien; OSError wird unverändert weitergereicht. Ist 'io_stats' ein
+    Dictionary, werden die gelesenen Bytes zu io_stats["bytes_read"] addiert.
+    """
+    with open(path, "rb") as f:
+        window = _FileWindow(f)
+        try:
+            magic = window.head[:4]
+            if magic[:2] == b"\xff\xd8":
+                tiff = _find_jpeg_exif(window)
+                if tiff is None:
+                    return NO_EXIF_DATES
+                return _parse_tiff(lambda offset, size: _slice(tiff, offset, size))
+            if magic in (b"II*\x00", b"MM\x00*"):
+                return _parse_tiff(window.read_at)
+            raise ExifFormatError("Unbekanntes Dateiformat")
+        finally:
+            if io_stats is not None:
+                io_stats["bytes_read"] = io_stats.get("bytes_read", 0) + window.bytes_read
+
+
+def load_exif_dates(path, io_stats=None):
+    """
+    Wie read_exif_dates, fällt aber für Dateien, die der schnelle Leser nicht
+    versteht, auf piexif zurück. Dies ist der Einstiegspunkt für die Anwendung.
+    """
+    try:
+        return read_exif_dates(path, io_stats)
+    except ExifFormatError:
+        if io_stats is not None:
+            # piexif liest die ganze Datei
+            io_stats["bytes_read"] = io_stats.get("bytes_read", 0) + os.path.getsize(path)
+            io_stats["piexif_fallbacks"] = io_stats.get("piexif_fallbacks", 0) + 1
+        return _load_exif_dates_piexif(path)
+
+
+def _load_exif_dates_piexif(path):
+    """Langsamer Rückfallweg über piexif.load (liest die ganze Datei)."""
+    import piexif
+
+    exif = piexif.load(path).get("Exif", {})
+    return ExifDates(
+        _decode_ascii(exif.get(TAG_DATE_TIME_ORIGINAL)),
+        _decode_ascii(exif.get(TAG_OFFSET_TIME_ORIGINAL)),
+        _decode_ascii(exif.get(TAG_OFFSET_TIME)),
+    )
+
+
+def _slice(data, offset, size):
+    """Liest einen Bereich aus einem Bytes-Puffer mit Bereichsprüfung."""
+    if offset < 0 or offset + size > len(data):
+        raise ExifFormatError("Verweis außerhalb des EXIF-Blocks")
+    return data[offset:offset + size]
+
+
+def _find_jpeg_exif(window):
+    """
+    Läuft die JPEG-Segmente ab, bis das APP1-Segment mit der Exif-Kennung gefunden ist.
+    Gibt die TIFF-Daten des Segments zurück, oder None, wenn die Bilddaten (SOS)
+    beginnen, ohne dass EXIF-Daten gefunden wurden.
+    """
+    pos = 2
+    for _ in range(MAX_JPEG_SEGMENTS):
+        marker = window.read_at(pos, 2)
+        if marker[0] != 0xFF:
+            raise ExifFormatError("Ungültiger JPEG-Marker")
+        code = marker[1]
+        if code == 0xFF:
+            # Füllbyte, der eigentliche Marker folgt
+            pos += 1
+            continue
+        if code in (0xD9, 0xDA):
+            # Ende des Bildes bzw. Beginn der Bilddaten: kein EXIF vorhanden
+            return None
+        if code == 0x01 or 0xD0 <= code <= 0xD7:
+            # Marker ohne Längenfeld
+            pos += 2
+            continue
+        length = struct.unpack(">H", window.read_at(pos + 2, 2))[0]
+        if length < 2:
+            raise ExifFormatError("Ungültige JPEG-Segmentlänge")
+        if code == 0xE1 and length >= 8:
+            payload = window.read_at(pos + 4, length - 2)
+            if payload.startswith(b"Exif\x00\x00"):
+                return payload[6:]
+        pos += 2 + length
+    return None
+
+
+def _parse_tiff(read_at):
+    """Folgt der IFD-Kette von IFD0 bis zum Exif-Sub-IFD und liest die Datums-Tags."""
+    header = read_at(0, 8)
+    if header[:4] == b"II*\x00":
+        endian = "<"
+    elif header[:4] == b"MM\x00*":
+        endian = ">"
+    else:
+        raise ExifFormatError("Kein gültiger TIFF-Header")
+
+    ifd0_offset = struct.unpack(endian + "I", header[4:8])[0]
+    ifd0 = _read_ifd(read_at, endian, ifd0_offset, (TAG_EXIF_IFD_POINTER,))
+    pointer = ifd0.get(TAG_EXIF_IFD_POINTER)
+    if pointer is None:
+        return NO_EXIF_DATES
+
+    value_type, _, raw = pointer
+    if value_type not in (TYPE_LONG, TYPE_IFD):
+        raise ExifFormatError("Ungültiger Exif-IFD-Zeiger")
+    exif_offset = struct.unpack(endian + "I", raw)[0]
+    exif = _read_ifd(read_at, endian, exif_offset,
+                     (TAG_DATE_TIME_ORIGINAL, TAG_OFFSET_TIME_ORIGINAL, TAG_OFFSET_TIME))
+    return ExifDates(
+        _read_ascii(read_at, endian, exif.get(TAG_DATE_TIME_ORIGINAL)),
+        _read_ascii(read_at, endian, exif.get(TAG_OFFSET_TIME_ORIGINAL)),
+        _read_ascii(read_at, endian, exif.get(TAG_OFFSET_TIME)),
+    )
+
+
+def _read_ifd(read_at, endian, offset, wanted):
+    """
+    Liest die Einträge eines IFDs und gibt nur die gewünschten Tags zurück,
+    als Dictionary {tag: (typ, anzahl, 4-Byte-Wertfeld)}.
+    """
+    count = struct.unpack(endian + "H", read_at(offset, 2))[0]
+    if count > MAX_IFD_ENTRIES:
+        raise ExifFormatError("IFD hat zu viele Einträge")
+    data = read_at(offset + 2, count * 12)
+    entries = {}
+    for tag, value_type, value_count, raw in struct.iter_unpack(endian + "HHI4s", data):
+        if tag in wanted:
+            entries[tag] = (value_type, value_count, raw)
+    return entries
+
+
+def _read_ascii(read_at, endian, entry):
+    """Liest den Wert eines ASCII-Tags, der entweder inline oder per Offset gespeichert ist."""
+    if entry is None:
+        return None
+    value_type, value_count, raw = entry
+    if value_type != TYPE_ASCII:
+        return None
+    if value_count <= 4:
+        data = raw[:value_count]
+    else:
+        data = read_at(struct.unpack(endian + "I", raw)[0], value_count)
+    return _decode_ascii(data)
+
+
+def _decode_ascii(data):
+    """Wandelt einen EXIF-ASCII-Wert in einen String um. Leere Werte werden zu None."""
+    if not data:
+        return None
+    text = data.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+    return text or None
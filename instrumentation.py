@@ -0,0 +1,286 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Laufstatistik: Zeiten und Zähler für die einzelnen Schritte einer Analyse oder Umbenennung.
+
+Ein RunStats-Objekt sammelt die Dauer der Schritte (Dateien/s), Zähler wie gelesene
+EXIF-Bytes und stat-Aufrufe, die Status der Dateien (auch Fehler) und ein Histogramm
+der Dauer pro Datei. report() fasst alles als Dictionary zusammen, write_json()
+schreibt es als JSON-Datei.
+
+Ohne Statistik wird NULL_STATS übergeben: Alle Methoden tun nichts. Stellen, die pro
+Datei messen, fragen vorher 'stats.enabled' ab, damit ohne Statistik nicht einmal
+die Uhr gelesen wird. Das Modul importiert kein tkinter.
+"""
+
+import json
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+# Anzahl der Histogramm-Klassen: Klasse i umfasst Dauern unter 2**i Mikrosekunden (bis ~36 min)
+HISTOGRAM_BUCKETS = 32
+
+# Abgeleitete Kennzahlen im Bericht: Name -> (Zähler, Nenner)
+RATIOS = {
+    "bytes_per_exif_read": ("exif_bytes_read", "exif_reads"),
+}
+
+
+class LatencyHistogram:
+    """Histogramm mit logarithmischen Klassen (Zweierpotenzen in Mikrosekunden)."""
+
+    def __init__(self):
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        micros = int(seconds * 1_000_000)
+        self.buckets[min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction):
+        """Obergrenze der Klasse, in der das Quantil liegt, in Sekunden (oder None ohne Werte)."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(2 ** index / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        """Kennzahlen in Millisekunden und die belegten Klassen als [Obergrenze in ms, Anzahl]."""
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000,
+            "p50_ms": self.percentile(0.5) * 1000,
+            "p90_ms": self.percentile(0.9) * 1000,
+            "p99_ms": self.percentile(0.99) * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": [[2 ** index / 1000, count] for index, count in enumerate(self.buckets) if count],
+        }
+
+
+class _StageTimer:
+    """Kontextmanager für RunStats.stage."""
+    __slots__ = ("stats", "name", "files", "start")
+
+    def __init__(self, stats, name, files):
+        self.stats = stats
+        self.name = name
+        self.files = files
+
+    def __enter__(self):
+        self.start = self.stats.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add_time(self.name, self.stats.clock() - self.start, self.files)
+        return False
+
+
+class RunStats:
+    """
+    Sammelt die Statistik eines Laufs. Die Methoden dürfen aus mehreren Threads
+    aufgerufen werden (z.B. aus den Übertragungs-Workern).
+    """
+    enabled = True
+
+    def __init__(self, label="", clock=time.perf_counter):
+        self.label = label
+        self.clock = clock
+        self.started = datetime.now().astimezone()
+        self.start = clock()
+        self.stages = {}       # Name -> [Sekunden, Aufrufe, Dateien]
+        self.counters = {}
+        self.statuses = {}     # Status-Schlüssel -> Anzahl
+        self.errors = {}       # Fehlerart -> Anzahl
+        self.latencies = {}    # Name -> LatencyHistogram
+        self.info = {}         # Einstellungen des Laufs
+        self._lock = threading.Lock()
+
+    def stage(self, name, files=0):
+        """Kontextmanager, der die Dauer eines Schritts misst; 'files' zählt für Dateien/s."""
+        return _StageTimer(self, name, files)
+
+    def add_time(self, name, seconds, files=0):
+        """Rechnet eine gemessene Dauer (und bearbeitete Dateien) dem Schritt 'name' zu."""
+        with self._lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = [0.0, 0, 0]
+            stage[0] += seconds
+            stage[1] += 1
+            stage[2] += files
+
+    def timed(self, name, iterable):
+        """Reicht 'iterable' durch und rechnet die Zeit für das Erzeugen jedes Elements 'name' zu."""
+        clock = self.clock
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = clock()
+                try:
+                    value = next(iterator)
+                except StopIteration:
+                    self.add_time(name, clock() - start)
+                    return
+                self.add_time(name, clock() - start, 1)
+                yield value
+        finally:
+            # Beendet auch einen inneren Generator sofort, wenn der Aufrufer abbricht
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def call(self, name, function, *args, **kwargs):
+        """Ruft 'function' auf und trägt die Dauer in das Histogramm 'name' ein."""
+        start = self.clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.observe(name, self.clock() - start)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def status(self, status_key):
+        """Zählt das Ergebnis einer Datei (status_ok, status_read_error, ...)."""
+        with self._lock:
+            self.statuses[status_key] = self.statuses.get(status_key, 0) + 1
+
+    def error(self, error):
+        """Zählt einen Fehler nach seiner Art (Name der Exception-Klasse)."""
+        kind = type(error).__name__
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def observe(self, name, seconds):
+        """Trägt die Dauer für eine einzelne Datei in das Histogramm 'name' ein."""
+        with self._lock:
+            histogram = self.latencies.get(name)
+            if histogram is None:
+                histogram = self.latencies[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def report(self):
+        """Fasst die Statistik als JSON-fähiges Dictionary zusammen."""
+        with self._lock:
+            stages = {}
+            for name, (seconds, calls, files) in self.stages.items():
+                stage = {"seconds": seconds, "calls": calls}
+                if files:
+                    stage["files"] = files
+                    stage["files_per_sec"] = files / seconds if seconds > 0 else None
+                stages[name] = stage
+            counters = dict(self.counters)
+            for name, (numerator, denominator) in RATIOS.items():
+                if counters.get(denominator):
+                    counters[name] = counters.get(numerator, 0) / counters[denominator]
+            return {
+                "label": self.label,
+                "started": self.started.isoformat(timespec="seconds"),
+                "wall_seconds": self.clock() - self.start,
+                "info": dict(self.info),
+                "stages": stages,
+                "counters": counters,
+                "statuses": dict(self.statuses),
+                "errors": dict(self.errors),
+                "latency": {name: histogram.summary() for name, histogram in self.latencies.items()},
+            }
+
+    def write_json(self, path):
+        """Schreibt den Bericht als JSON-Datei."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+class NullStats:
+    """Ersatz für RunStats, wenn keine Statistik erfasst wird: Alle Methoden tun nichts."""
+    enabled = False
+    _NULL_TIMER = nullcontext()
+
+    def stage(self, name, files=0):
+        return self._NULL_TIMER
+
+    def add_time(self, name, seconds, files=0):
+        pass
+
+    def timed(self, name, iterable):
+        return iterable
+
+    def call(self, name, function, *args, **kwargs):
+        return function(*args, **kwargs)
+
+    def count(self, name, n=1):
+        pass
+
+    def status(self, status_key):
+        pass
+
+    def error(self, error):
+        pass
+
+    def observe(self, name, seconds):
+        pass
+
+
+NULL_STATS = NullStats()
+
+
+def format_report(report):
+    """Lesbare Zusammenfassung eines Berichts (für die Konsole und die Oberfläche)."""
+    lines = [f"{report['label'] or 'Lauf'}: {report['wall_seconds']:.2f} s"]
+    for name, stage in report["stages"].items():
+        line = f"  {name}: {stage['seconds']:.3f} s"
+        if stage.get("files_per_sec"):
+            line += f", {stage['files']} Dateien, {stage['files_per_sec']:.0f} Dateien/s"
+        lines.append(line)
+    for name, value in report["counters"].items():
+        lines.append(f"  {name}: {value:.1f}" if isinstance(value, float) else f"  {name}: {value}")
+    for name, summary in report["latency"].items():
+        if summary["count"]:
+            lines.append(f"  {name} pro Datei: Mittel {summary['mean_ms']:.2f} ms, p50 {summary['p50_ms']:.2f} ms, "
+                         f"p99 {summary['p99_ms']:.2f} ms, max {summary['max_ms']:.2f} ms")
+    if report["statuses"]:
+        lines.append("  Status: " + ", ".join(f"{key}={value}" for key, value in report["statuses"].items()))
+    if report["errors"]:
+        lines.append("  Fehler: " + ", ".join(f"{key}={value}" for key, value in report["errors"].items()))
+    return "\n".join(lines)
@@ -0,0 +1,433 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Transaktions-Journal für das Kopieren/Verschieben.
+
+Jeder Lauf schreibt eine JSON-Lines-Datei, an die nur angehängt wird: zuerst ein
+Kopf mit den Einstellungen, dann für jede Datei ein "plan"-Eintrag (Quelle, Ziel,
+Verfahren), bevor sie übertragen wird, und ein "done"- bzw. "error"-Eintrag danach.
+fsync wird gebündelt: Pläne werden blockweise vor den Übertragungen gesichert,
+Abschlüsse spätestens alle SYNC_INTERVAL Sekunden. Nach einem Absturz sind daher
+höchstens die Übertragungen der letzten Sekunde unklar; resume_run prüft diese
+am Dateisystem und überträgt nur, was wirklich fehlt. undo_run spielt einen Lauf
+rückwärts ab.
+
+Gelöscht wird eine Zieldatei nur, wenn sie nachweislich aus dem Lauf stammt: Der
+"done"-Eintrag enthält Gerät, Inode, Größe und Änderungszeit der Zieldatei (eine
+Inode-Nummer allein kann nach dem Löschen neu vergeben werden); ohne ihn wird der Inhalt mit
+der Quelle verglichen. Eine Datei, die nach dem Planen unter dem Zielnamen
+aufgetaucht ist, bleibt unangetastet.
+"""
+
+import json
+import os
+import stat
+import sys
+import time
+
+from transfer import transfer_file, MOVE_SUFFIX
+
+# Nach so vielen Einträgen bzw. Sekunden wird das Journal spätestens auf die Platte geschrieben
+SYNC_EVERY = 1000
+SYNC_INTERVAL = 0.5
+# So viele Dateien werden vorab geplant und gemeinsam gesichert, bevor sie übertragen werden
+PLAN_BATCH_SIZE = 256
+# Anzahl der Journale, die aufbewahrt werden (ältere werden beim Anlegen gelöscht)
+MAX_JOURNALS = 50
+
+# Verfahren für Dateien, die beim Fortsetzen bereits fertig vorgefunden wurden
+STRATEGY_RECOVERED = "recovered"
+
+# Ergebnis von _copied_from: Zieldatei ist eine vollständige bzw. abgebrochene Übertragung
+COPY_COMPLETE = "complete"
+COPY_PARTIAL = "partial"
+# Blockgröße beim Vergleich von Ziel und Quelle
+COMPARE_CHUNK_SIZE = 1024 * 1024
+
+
+def default_journal_dir():
+    """Gibt den plattformüblichen Ordner für die Journale zurück."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, "PixelUTCRenamer", "Journal")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/PixelUTCRenamer/Journal")
+    base = os.environ.get("XDG_STATE_HOME") or os.path.expanduser("~/.local/state")
+    return os.path.join(base, "pixel_utc_renamer", "journal")
+
+
+def list_journals(directory=None):
+    """Pfade aller Journale im Ordner, das neueste zuletzt."""
+    directory = directory or default_journal_dir()
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".jsonl"))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(directory, name) for name in names]
+
+
+def latest_journal(directory=None):
+    """Pfad des zuletzt angelegten Journals, oder None."""
+    journals = list_journals(directory)
+    return journals[-1] if journals else None
+
+
+class Journal:
+    """
+    Ein zum Anhängen geöffnetes Journal. Nur von einem Thread benutzen (in der
+    Anwendung: dem Thread, der process_items durchläuft).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        self.next_id = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    @classmethod
+    def create(cls, directory=None, **settings):
+        """Legt ein neues Journal mit den Einstellungen des Laufs als Kopf an."""
+        directory = directory or default_journal_dir()
+        os.makedirs(directory, exist_ok=True)
+        for old_path in list_journals(directory)[:-MAX_JOURNALS + 1]:
+            os.remove(old_path)
+        name = time.strftime("run-%Y%m%d-%H%M%S") + f"-{os.getpid()}.jsonl"
+        journal = cls(os.path.join(directory, name))
+        journal.write({"type": "run", "started": time.time(), **settings})
+        journal.sync()
+        return journal
+
+    @classmethod
+    def reopen(cls, path):
+        """Öffnet ein vorhandenes Journal, um weitere Einträge anzuhängen (resume, undo)."""
+        journal = cls(path)
+        journal.next_id = max((r["id"] for r in read_journal(path) if r.get("type") == "plan"), default=-1) + 1
+        return journal
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= SYNC_EVERY or time.monotonic() - self._last_sync >= SYNC_INTERVAL:
+            self.sync()
+
+    def sync(self):
+        """Schreibt alle bisherigen Einträge dauerhaft auf die Platte."""
+        if self._unsynced:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def plan(self, src, dst, move, hardlink=False, link=None):
+        """
+        Vermerkt eine geplante Übertragung und gibt ihre Nummer zurück. 'link' ist bei
+        Duplikaten die Datei, auf die der Hardlink zeigen soll.
+        """
+        op_id = self.next_id
+        self.next_id += 1
+        record = {"type": "plan", "id": op_id, "src": src, "dst": dst, "move": move, "hardlink": hardlink}
+        if link is not None:
+            record["link"] = link
+        self.write(record)
+        return op_id
+
+    def done(self, op_id, strategy, dst=None):
+        """
+        Vermerkt eine abgeschlossene Übertragung. Mit 'dst' wird die Identität der
+        Zieldatei mitgeschrieben, damit undo_run eine inzwischen ersetzte Datei erkennt.
+        """
+        record = {"type": "done", "id": op_id, "strategy": strategy}
+        if dst is not None:
+            try:
+                record["file"] = file_identity(os.lstat(dst))
+            except OSError:
+                pass
+        self.write(record)
+
+    def error(self, op_id, error, src=None):
+        """Vermerkt einen Fehler; ohne Nummer (Fehler beim Planen) wird die Quelldatei angegeben."""
+        record = {"type": "error", "id": op_id, "error": str(error)}
+        if src is not None:
+            record["src"] = src
+        self.write(record)
+
+    def mkdir(self, path):
+        """Vermerkt einen neu angelegten Zielordner (wird bei undo wieder entfernt, falls leer)."""
+        self.write({"type": "mkdir", "path": path})
+
+    def end(self, resumed=False):
+        """
+        Vermerkt, dass alle Dateien des Laufs geplant und abgearbeitet wurden. Mit
+        'resumed' schließt resume_run den Lauf ab; ob die Analyse damals fertig war,
+        bleibt am fehlenden "end"-Eintrag des ursprünglichen Laufs erkennbar. Im
+        Überwachungsmodus (watch.py) endet jeder Stapel der Sitzung mit einem "end".
+        """
+        record = {"type": "end"}
+        if resumed:
+            record["resumed"] = True
+        self.write(record)
+        self.sync()
+
+    def close(self):
+        self.sync()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def file_identity(st):
+    """Identität einer Datei aus ihrem stat-Ergebnis: [Gerät, Inode, Größe, mtime_ns]."""
+    return [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns]
+
+
+def read_journal(path):
+    """
+    Liest alle Einträge eines Journals. Eine bei einem Absturz abgeschnittene letzte
+    Zeile wird ignoriert.
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+    return records
+
+
+class JournalState:
+    """Zustand eines Laufs, wie er sich aus den Einträgen des Journals ergibt."""
+
+    def __init__(self, records):
+        self.settings = records[0] if records and records[0].get("type") == "run" else {}
+        self.plans = {}     # Nummer -> plan-Eintrag, in Planungsreihenfolge
+        self.done = {}      # Nummer -> verwendetes Verfahren
+        self.identity = {}  # Nummer -> file_identity der Zieldatei beim Abschluss
+        self.errors = {}    # Nummer -> Fehlermeldung des letzten Versuchs
+        self.undone = set()
+        self.created_dirs = []
+        self.complete = False       # Lauf abgeschlossen (auch per resume)
+        self.scan_complete = False  # Alle Dateien wurden im ursprünglichen Lauf geplant
+        for record in records:
+            kind = record.get("type")
+            if kind == "plan":
+                self.plans[record["id"]] = record
+            elif kind == "done":
+                self.done[record["id"]] = record["strategy"]
+                self.errors.pop(record["id"], None)
+                if "file" in record:
+                    self.identity[record["id"]] = record["file"]
+            elif kind == "error" and record.get("id") is not None:
+                self.errors[record["id"]] = record["error"]
+            elif kind == "undone":
+                self.undone.add(record["id"])
+            elif kind == "mkdir":
+                self.created_dirs.append(record["path"])
+            elif kind == "end":
+                self.complete = True
+                if not record.get("resumed"):
+                    self.scan_complete = True
+
+    def pending(self):
+        """
+        Geplante Übertragungen ohne Abschluss (auch fehlgeschlagene), in Planungsreihenfolge.
+        Rückgängig gemachte gehören nicht dazu.
+        """
+        return [plan for op_id, plan in self.plans.items() if op_id not in self.done and op_id not in self.undone]
+
+
+def load_state(path):
+    return JournalState(read_journal(path))
+
+
+def _copied_from(dst, source):
+    """
+    Prüft, ob 'dst' eine Übertragung von 'source' ist: COPY_COMPLETE bei gleichem
+    Inode (Link, Verschieben) oder gleichem Inhalt, COPY_PARTIAL, wenn 'dst' ein
+    Anfangsstück von 'source' ist (bei einem Absturz abgebrochene Kopie), sonst None.
+    """
+    dst_stat, src_stat = os.lstat(dst), os.stat(source)
+    if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return COPY_COMPLETE
+    if not stat.S_ISREG(dst_stat.st_mode) or dst_stat.st_size > src_stat.st_size:
+        return None
+    with open(dst, "rb") as fdst, open(source, "rb") as fsrc:
+        for chunk in iter(lambda: fdst.read(COMPARE_CHUNK_SIZE), b""):
+            if fsrc.read(len(chunk)) != chunk:
+                return None
+    return COPY_COMPLETE if dst_stat.st_size == src_stat.st_size else COPY_PARTIAL
+
+
+def _foreign_target(dst):
+    return FileExistsError(f"'{dst}' existiert bereits und stammt nicht aus diesem Lauf")
+
+
+def _recover(plan, failed=False):
+    """
+    Prüft am Dateisystem, ob eine unterbrochene Übertragung bereits fertig ist.
+    Gibt True zurück, wenn nichts mehr zu tun ist. Halb geschriebene Zieldateien
+    werden entfernt; 'failed' (letzter Versuch mit Fehler vermerkt) heißt, dass
+    transfer_file aufgeräumt hat und ein vorhandenes Ziel nicht aus dem Lauf stammt.
+    Ein fremdes Ziel wird nie gelöscht (FileExistsError).
+    """
+    src, dst = plan["src"], plan["dst"]
+    if not os.path.lexists(dst):
+        return False
+    src_exists = os.path.exists(src)
+    if plan["move"] and not src_exists and not failed:
+        return True  # Verschieben war abgeschlossen
+    match = _copied_from(dst, plan.get("link") or src)
+    if match == COPY_COMPLETE:
+        if plan["move"] and src_exists:
+            os.unlink(src)  # Kopie über Dateisystemgrenzen fertig, nur das Löschen fehlte
+        return True
+    if match == COPY_PARTIAL and not failed:
+        os.unlink(dst)
+        return False
+    raise _foreign_target(dst)
+
+
+def _execute(plan):
+    """Führt eine geplante Übertragung aus und gibt das Verfahren zurück."""
+    os.makedirs(os.path.dirname(plan["dst"]), exist_ok=True)
+    if plan.get("link"):
+        strategy = transfer_file(plan["link"], plan["dst"], hardlink=True)
+        if plan["move"]:
+            os.unlink(plan["src"])
+            strategy += MOVE_SUFFIX
+        return strategy
+    return transfer_file(plan["src"], plan["dst"], move=plan["move"], hardlink=plan["hardlink"])
+
+
+def resume_run(path):
+    """
+    Setzt einen unterbrochenen Lauf fort, ohne neu zu analysieren: Alle geplanten,
+    aber nicht abgeschlossenen Übertragungen werden geprüft und bei Bedarf ausgeführt.
+    Liefert (plan-Eintrag, Verfahren, Fehler) für jede dieser Übertragungen.
+
+    Dateien, die beim Abbruch noch nicht geplant waren (die Analyse lief noch, siehe
+    JournalState.scan_complete), kennt das Journal nicht; sie werden mit einem neuen
+    Lauf übertragen. Sind alle Übertragungen erledigt, wird der Lauf mit einem
+    "end"-Eintrag abgeschlossen.
+    """
+    state = load_state(path)
+    with Journal.reopen(path) as journal:
+        failed = False
+        for plan in state.pending():
+            try:
+                strategy = STRATEGY_RECOVERED if _recover(plan, plan["id"] in state.errors) else _execute(plan)
+            except Exception as e:
+                failed = True
+                journal.error(plan["id"], e)
+                yield plan, None, e
+            else:
+                journal.done(plan["id"], strategy, plan["dst"])
+                yield plan, strategy, None
+        if not failed:
+            journal.end(resumed=True)
+
+
+def _undo_transfer(plan, completed, failed=False, identity=None):
+    """
+    Macht eine Übertragung rückgängig und gibt False zurück, wenn es nichts zu tun gab.
+    Ohne "done"-Eintrag ('completed' False) wird wie bei _recover am Dateisystem
+    geprüft, wie weit sie gekommen ist: Der Eintrag kann bei einem Absturz noch im
+    ungesicherten Puffer gelegen haben, obwohl die Datei schon übertragen war. Eine
+    fremde Zieldatei wird nie angefasst; 'identity' ist file_identity aus dem
+    "done"-Eintrag, 'failed' wie bei _recover.
+    """
+    src, dst = plan["src"], plan["dst"]
+    if not completed and not os.path.lexists(dst):
+        return False  # Nie begonnen
+    if completed:
+        if identity is not None and file_identity(os.lstat(dst)) != identity:
+            raise FileExistsError(f"'{dst}' wurde seit dem Lauf ersetzt")
+    elif not (plan["move"] and not failed and not os.path.lexists(src)):
+        # Nur eine nachweislich eigene Kopie bzw. ein eigener Link wird entfernt
+        match = _copied_from(dst, plan.get("link") or src)
+        if match is None or (match == COPY_PARTIAL and failed):
+            return False
+    if plan["move"] and (completed or not os.path.lexists(src)):
+        if os.path.lexists(src):
+            raise FileExistsError(f"'{src}' existiert bereits")
+        os.makedirs(os.path.dirname(src), exist_ok=True)
+        transfer_file(dst, src, move=True)
+    else:
+        # Kopie oder Link; bei einem unterbrochenen Verschieben liegt die Quelle noch da
+        os.unlink(dst)
+    return True
+
+
+def undo_count(state):
+    """Anzahl der Übertragungen, die undo_run rückgängig machen würde (ohne "done" am Dateisystem geprüft)."""
+    return sum(1 for op_id, plan in state.plans.items()
+               if op_id not in state.undone
+               and (op_id in state.done or (op_id not in state.errors and os.path.lexists(plan["dst"]))))
+
+
+def undo_run(path):
+    """
+    Macht einen Lauf rückgängig, indem das Journal rückwärts abgespielt wird:
+    verschobene Dateien kommen an ihren alten Platz zurück, Kopien und Links werden
+    gelöscht, neu angelegte Ordner entfernt, sofern sie leer sind. Übertragungen ohne
+    "done"-Eintrag werden am Dateisystem geprüft (siehe _undo_transfer) und danach
+    auch von 'resume' nicht mehr ausgeführt.
+    Liefert (plan-Eintrag, Fehler) für jede rückgängig gemachte Übertragung.
+    """
+    state = load_state(path)
+    with Journal.reopen(path) as journal:
+        for op_id in reversed(list(state.plans)):
+            if op_id in state.undone:
+                continue
+            plan = state.plans[op_id]
+            try:
+                if not _undo_transfer(plan, op_id in state.done, op_id in state.errors,
+                                      state.identity.get(op_id)):
+                    journal.write({"type": "undone", "id": op_id})
+                    continue
+            except FileNotFoundError:
+                pass  # Datei wurde inzwischen von Hand entfernt
+            except Exception as e:
+                journal.error(op_id, e)
+                yield plan, e
+                continue
+            journal.write({"type": "undone", "id": op_id})
+            yield plan, None
+        output = state.settings.get("output")
+        for directory in reversed(state.created_dirs):
+            # Entfernt auch die mit angelegten Elternordner bis zum Ausgabeordner
+            while output and directory != output and directory.startswith(output):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    break  # Nicht leer oder bereits entfernt
+                directory = os.path.dirname(directory)
+        journal.sync()
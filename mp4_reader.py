@@ -0,0 +1,172 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Schneller Leser für die Aufnahmezeit von MP4/MOV-Videos (ISO-BMFF/QuickTime).
+
+Die Datei besteht aus verschachtelten Boxen (Atomen) mit Größe und Typ im Kopf.
+Gelesen werden nur die Köpfe der Boxen auf oberster Ebene, bis 'moov' gefunden
+ist - die Mediendaten in 'mdat' werden per seek übersprungen, egal ob 'moov'
+am Anfang oder (wie bei Pixel-Videos) am Ende der Datei liegt. Aus 'moov/mvhd'
+wird die Erstellungszeit gelesen, bei fehlendem Wert aus 'moov/trak/mdia/mdhd'.
+Auch bei Videos mit mehreren GB sind das nur eine Handvoll kleiner Lesezugriffe.
+
+Die Zeit steht im Video als UTC (Sekunden seit 1904) und wird als 'creation_utc'
+im ExifDates-Tupel zurückgegeben.
+"""
+
+import struct
+from datetime import datetime, timedelta
+
+from exif_reader import NO_EXIF_DATES, ExifFormatError
+
+# Nullpunkt der Zeitangaben in mvhd/mdhd
+MP4_EPOCH = datetime(1904, 1, 1)
+# Schutz gegen kaputte Dateien: so viele Boxen werden je Ebene höchstens angesehen
+MAX_BOXES = 1024
+# Boxen, die auf dem Weg zu mdhd durchsucht werden
+CONTAINER_PATH = (b"trak", b"mdia")
+
+
+class Mp4FormatError(ExifFormatError):
+    """Die Datei ist kein lesbares MP4/MOV."""
+
+
+class _CountingFile:
+    """Zählt die gelesenen Bytes einer Datei (nur für die Laufstatistik)."""
+
+    def __init__(self, f):
+        self.f = f
+        self.bytes_read = 0
+
+    def read(self, size):
+        data = self.f.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def seek(self, *args):
+        return self.f.seek(*args)
+
+
+def _iter_boxes(f, start, end):
+    """
+    Liefert (Typ, Beginn der Nutzdaten, Ende der Box) für alle Boxen zwischen
+    'start' und 'end'. Liest dafür nur die 8 bzw. 16 Bytes der Köpfe.
+    """
+    pos = start
+    for _ in range(MAX_BOXES):
+        if pos + 8 > end:
+            return
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        payload = pos + 8
+        if size == 1:
+            # 64-Bit-Größe folgt auf den Typ (große mdat-Boxen)
+            large = f.read(8)
+            if len(large) < 8:
+                raise Mp4FormatError("Abgeschnittener Box-Kopf")
+            size = struct.unpack(">Q", large)[0]
+            payload += 8
+        elif size == 0:
+            size = end - pos  # Box reicht bis zum Ende der Datei
+        if size < payload - pos or pos + size > end:
+            raise Mp4FormatError(f"Ungültige Größe der Box {box_type!r}")
+        yield box_type, payload, pos + size
+        pos += size
+    raise Mp4FormatError("Zu viele Boxen")
+
+
+def _find_box(f, start, end, wanted):
+    """Gibt (Beginn der Nutzdaten, Ende) der ersten Box vom Typ 'wanted' zurück, oder None."""
+    for box_type, payload, box_end in _iter_boxes(f, start, end):
+        if box_type == wanted:
+            return payload, box_end
+    return None
+
+
+def _read_creation_time(f, payload, end):
+    """Liest die Erstellungszeit aus einer mvhd- oder mdhd-Box; None, wenn sie 0 ist."""
+    f.seek(payload)
+    data = f.read(min(end - payload, 12))
+    if len(data) < 8:
+        raise Mp4FormatError("Abgeschnittene Kopf-Box")
+    if data[0] == 1:
+        # Version 1: 64-Bit-Zeiten
+        if len(data) < 12:
+            raise Mp4FormatError("Abgeschnittene Kopf-Box")
+        seconds = struct.unpack(">Q", data[4:12])[0]
+    else:
+        seconds = struct.unpack(">I", data[4:8])[0]
+    if not seconds:
+        return None  # Manche Programme schreiben 0 statt einer Zeit
+    try:
+        return MP4_EPOCH + timedelta(seconds=seconds)
+    except OverflowError:
+        raise Mp4FormatError("Ungültige Erstellungszeit")
+
+
+def _media_creation_time(f, start, end):
+    """Sucht in den Spuren (trak/mdia/mdhd) nach der ersten gültigen Erstellungszeit."""
+    for box_type, payload, box_end in _iter_boxes(f, start, end):
+        if box_type != CONTAINER_PATH[0]:
+            continue
+        mdia = _find_box(f, payload, box_end, CONTAINER_PATH[1])
+        if mdia is None:
+            continue
+        mdhd = _find_box(f, *mdia, b"mdhd")
+        if mdhd is not None:
+            created = _read_creation_time(f, *mdhd)
+            if created is not None:
+                return created
+    return None
+
+
+def read_video_dates(path, io_stats=None):
+    """
+    Liest die Erstellungszeit eines MP4/MOV-Videos. Gibt ExifDates mit 'creation_utc'
+    ('YYYY:MM:DD HH:MM:SS', UTC) zurück, bzw. NO_EXIF_DATES, wenn das Video keine Zeit
+    enthält. Wirft Mp4FormatError bei unbekannten oder beschädigten Dateien. Ist
+    'io_stats' ein Dictionary, werden die gelesenen Bytes zu io_stats["bytes_read"] addiert.
+    """
+    with open(path, "rb") as raw:
+        f = raw if io_stats is None else _CountingFile(raw)
+        try:
+            end = f.seek(0, 2)
+            moov = _find_box(f, 0, end, b"moov")
+            if moov is None:
+                raise Mp4FormatError("Keine moov-Box gefunden")
+            mvhd = _find_box(f, *moov, b"mvhd")
+            created = _read_creation_time(f, *mvhd) if mvhd is not None else None
+            if created is None:
+                created = _media_creation_time(f, *moov)
+        finally:
+            if io_stats is not None:
+                io_stats["bytes_read"] = io_stats.get("bytes_read", 0) + f.bytes_read
+    if created is None:
+        return NO_EXIF_DATES
+    return NO_EXIF_DATES._replace(creation_utc=created.isoformat(" ").replace("-", ":"))
@@ -0,0 +1,113 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Ablagevorlagen für den Ausgabeordner, z.B. '{YYYY}/{MM}/{timestamp}{suffix}{ext}'.
+
+Statt alle Dateien in einen Ordner zu legen (der in großen Archiven auf
+Hunderttausende Einträge wächst), bestimmt die Vorlage Unterordner und Dateinamen
+aus der Aufnahmezeit. Die Felder werden aus dem neuen Namen gelesen, der immer die
+Form '{timestamp}{suffix}{ext}' hat (siehe renamer_core.build_new_filename); die
+Datei wird dafür also nicht erneut geöffnet, und Vorschau, Cache und Plan bleiben
+unverändert.
+
+Felder:
+    YYYY, YY, MM, DD, hh, mm, ss   Teile der Aufnahmezeit
+    date                           YYYYMMDD
+    timestamp                      Zeitstempel wie im neuen Namen (ggf. mit Millisekunden)
+    suffix                         z.B. '.NIGHT' oder '.RAW-01' (oft leer)
+    ext                            Endung inklusive Punkt, z.B. '.jpg'
+    name                           der ganze neue Name
+
+Ordner werden immer mit '/' getrennt. Der letzte Teil ist der Dateiname und muss
+{ext} oder {name} enthalten, damit die Endung erhalten bleibt.
+"""
+
+import re
+from string import Formatter
+
+# Beispiel und Vorschlag in der GUI
+DEFAULT_TEMPLATE = "{YYYY}/{MM}/{timestamp}{suffix}{ext}"
+
+TEMPLATE_FIELDS = ("YYYY", "YY", "MM", "DD", "hh", "mm", "ss", "date", "timestamp", "suffix", "ext", "name")
+
+_TIMESTAMP = re.compile(r"(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})(\d{3})?")
+
+
+def is_template(layout):
+    """Prüft, ob 'layout' eine Vorlage ist (und nicht LAYOUT_MIRROR/LAYOUT_FLATTEN)."""
+    return isinstance(layout, LayoutTemplate) or "{" in layout
+
+
+def name_fields(new_name):
+    """Zerlegt einen neuen Namen in die Felder der Vorlage; ValueError, wenn er keinen Zeitstempel hat."""
+    match = _TIMESTAMP.match(new_name)
+    if match is None:
+        raise ValueError(f"Kein Zeitstempel im Namen: {new_name}")
+    year, month, day, hour, minute, second, _ = match.groups()
+    timestamp = match.group(0)
+    rest = new_name[len(timestamp):]
+    dot = rest.rfind(".")
+    suffix, ext = (rest[:dot], rest[dot:]) if dot >= 0 else (rest, "")
+    return {"YYYY": year, "YY": year[2:], "MM": month, "DD": day, "hh": hour, "mm": minute, "ss": second,
+            "date": year + month + day, "timestamp": timestamp, "suffix": suffix, "ext": ext, "name": new_name}
+
+
+class LayoutTemplate:
+    """
+    Eine geprüfte Ablagevorlage. split() liefert für einen neuen Namen den relativen
+    Zielordner und den Dateinamen. Die Vorlage wird beim Anlegen geprüft (ValueError
+    bei unbekannten Feldern, absoluten Pfaden oder '..').
+    """
+
+    def __init__(self, template):
+        self.template = template.strip().replace("\\", "/")
+        parts = self.template.split("/")
+        if not self.template or self.template.startswith("/") or ".." in parts:
+            raise ValueError(f"Ungültige Ablagevorlage: {template!r} (nur relative Pfade ohne '..')")
+        try:
+            fields = [field for _, field, _, _ in Formatter().parse(self.template) if field is not None]
+        except ValueError as e:
+            raise ValueError(f"Ungültige Ablagevorlage: {template!r} ({e})") from None
+        unknown = [field for field in fields if field not in TEMPLATE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unbekanntes Feld in der Ablagevorlage: {', '.join(unknown)} "
+                             f"(möglich: {', '.join(TEMPLATE_FIELDS)})")
+        if "{ext}" not in parts[-1] and "{name}" not in parts[-1]:
+            raise ValueError(f"Der Dateiname der Ablagevorlage muss {{ext}} oder {{name}} enthalten: {template!r}")
+
+    def split(self, new_name):
+        """Gibt (relativer Zielordner, Dateiname) für einen neuen Namen zurück."""
+        parts = self.template.format_map(name_fields(new_name)).split("/")
+        if any(part in ("", ".", "..") for part in parts):
+            raise ValueError(f"Ablagevorlage {self.template!r} ergibt für {new_name} einen ungültigen Pfad")
+        return "/".join(parts[:-1]), parts[-1]
+
+    def __str__(self):
+        return self.template
+
+    def __repr__(self):
+        return f"LayoutTemplate({self.template!r})"
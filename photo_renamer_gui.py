@@ -23,14 +23,27 @@
 # ==============================================================================
 
 # Import der notwendigen Bibliotheken
+import json
 import os
-import re
-import shutil
-import piexif
+import queue
+import sqlite3
 import threading
-from datetime import datetime
-from tkinter import Tk, Toplevel, Listbox, Scrollbar, filedialog, messagebox, StringVar, BooleanVar
-from tkinter.ttk import Progressbar, Style, Frame, Label, Button, Checkbutton, Radiobutton
+from tkinter import Tk, Toplevel, Text, filedialog, messagebox, StringVar, BooleanVar
+from tkinter.ttk import Progressbar, Style, Frame, Label, Button, Checkbutton, Radiobutton, Spinbox, Entry, Combobox
+
+from renamer_core import (SCAN_SERIAL, SCAN_THREAD, SCAN_PROCESS, LAYOUT_MIRROR, LAYOUT_FLATTEN, default_workers,
+                          get_new_filename, SourceWalker, parse_patterns, iter_scan, new_counts, count_result,
+                          process_items, TransferPlanner)
+from dedup import DUP_SKIP, DUP_LINK, Deduplicator
+from instrumentation import NULL_STATS, RunStats, format_report
+from journal import Journal, latest_journal, load_state, resume_run, undo_count, undo_run
+from output_layout import DEFAULT_TEMPLATE, LayoutTemplate, is_template
+from plan_io import PlanFormatError, PlanWriter, iter_plan, read_plan_header, unchanged_items
+from preview_list import VirtualListView
+from progress import ProgressReporter, format_rates, snapshot_percent
+from scan_cache import ScanCache
+from scan_results import ScanResults
+from timestamps import DEFAULT_PRECEDENCE, SOURCE_PXL_NAME, OUTPUT_LOCAL, OUTPUT_UTC, TimestampEngine
 
 # ==============================================================================
 # Übersetzungen
@@ -49,6 +62,7 @@ TRANSLATIONS = {
         "pixel_jpg": "Pixel-Bilder (JPG):",
         "pixel_dng": "Pixel-Bilder (DNG):",
         "videos": "Videos (übersprungen):",
+        "videos_renamed": "Videos:",
         "other_files": "Andere Dateien (übersprungen):",
         "preview_label": "4. Vorschau der Umbenennung:",
         "create_preview": "Vorschau erstellen",
@@ -58,6 +72,7 @@ TRANSLATIONS = {
         "select_source_error": "Bitte wähle zuerst einen gültigen Quellordner aus.",
         "select_output_error": "Bitte wähle zuerst einen gültigen Ausgabeordner aus.",
         "warning": "Warnung",
+        "info": "Hinweis",
         "same_folder_warning": "Quell- und Zielordner sind identisch. Bitte 'Kopieren' wählen oder einen anderen Ausgabeordner, um Datenverlust zu vermeiden.",
         "done": "Fertig",
         "files_processed": "Dateien wurden erfolgreich verarbeitet.",
@@ -70,6 +85,73 @@ TRANSLATIONS = {
         "status_read_error": "Fehler beim Lesen",
         "status_not_pixel": "Kein Pixel-Foto",
         "status_video": "Video",
+        "status_duplicate": "Duplikat",
+        "scan_mode_label": "Analyse:",
+        "scan_serial": "Seriell",
+        "scan_thread": "Parallel (Threads)",
+        "scan_process": "Parallel (Prozesse)",
+        "workers_label": "Worker:",
+        "use_cache": "EXIF-Cache verwenden",
+        "rebuild_cache": "Cache neu aufbauen",
+        "detect_duplicates": "Duplikate erkennen (byte-gleiche Dateien, auch im Ausgabeordner)",
+        "dup_skip": "überspringen",
+        "dup_link": "als Hardlink anlegen",
+        "recursive": "Unterordner einbeziehen",
+        "layout_mirror": "Ordnerstruktur beibehalten",
+        "layout_flatten": "Alle in einen Ordner",
+        "layout_template": "Nach Vorlage:",
+        "layout_error": "Die Ablagevorlage ist ungültig:",
+        "include_label": "Nur:",
+        "exclude_label": "Ohne:",
+        "filter_label": "Anzeigen:",
+        "filter_all": "Alle",
+        "sort_label": "Sortieren:",
+        "sort_directory": "Ordnerreihenfolge",
+        "sort_original": "Originalname",
+        "sort_new": "Neuer Name",
+        "sort_status": "Status",
+        "cancel": "Abbrechen",
+        "scan_running": "Analysiert: {done} von {found} Dateien",
+        "scan_walking": "Analysiert: {done} Dateien (Suche läuft...)",
+        "scan_finished": "Analyse abgeschlossen: {done} Dateien",
+        "scan_cancelled": "Analyse abgebrochen nach {done} Dateien",
+        "dirs_unreadable": "Diese Unterordner konnten nicht gelesen werden und wurden übersprungen:",
+        "progress_files_per_sec": "{rate:.0f} Dateien/s",
+        "progress_mb_per_sec": "{rate:.1f} MB/s",
+        "progress_eta": "noch {eta}",
+        "use_hardlinks": "Kopien als Hardlinks anlegen (gleicher Datenträger, teilt die Daten mit dem Original)",
+        "strategies_used": "Verfahren:",
+        "resume_run": "Abgebrochenen Lauf fortsetzen",
+        "undo_run": "Letzten Lauf rückgängig machen",
+        "undo_confirm": "Den letzten Lauf ({count} Dateien) rückgängig machen?",
+        "no_journal": "Es gibt keinen Lauf, der fortgesetzt bzw. rückgängig gemacht werden kann.",
+        "resuming": "Setze Lauf fort...",
+        "undoing": "Mache Lauf rückgängig...",
+        "files_failed": "Dateien fehlgeschlagen (Details im Journal).",
+        "resume_incomplete": "Der Lauf wurde vor dem Ende der Analyse abgebrochen. Bitte die Vorschau neu starten, um die übrigen Dateien zu verarbeiten.",
+        "transfer_jobs_label": "Gleichzeitige Übertragungen:",
+        "time_label": "Zeitstempel:",
+        "time_local": "Lokale Zeit",
+        "time_utc": "UTC",
+        "use_pxl_name": "Zeit aus dem PXL-Namen, wenn EXIF fehlt",
+        "use_milliseconds": "Millisekunden anhängen",
+        "rename_videos": "Pixel-Videos umbenennen",
+        "save_plan": "Vorschau als Plan speichern...",
+        "load_plan": "Plan laden...",
+        "saving_plan": "Speichere Plan...",
+        "loading_plan": "Lade Plan...",
+        "plan_saved": "Plan mit {count} Dateien gespeichert.",
+        "plan_loaded": "Plan geladen: {done} Dateien",
+        "plan_error": "Der Plan konnte nicht gespeichert bzw. geladen werden:",
+        "no_preview": "Bitte zuerst eine Vorschau erstellen.",
+        "scan_still_running": "Bitte warten, bis die Analyse abgeschlossen ist.",
+        "files_changed": "Dateien seit dem Plan verändert oder entfernt (übersprungen).",
+        "collect_stats": "Laufstatistik erfassen",
+        "show_stats": "Statistik anzeigen...",
+        "stats_title": "Laufstatistik",
+        "save_stats": "Als JSON speichern...",
+        "refresh_stats": "Aktualisieren",
+        "no_stats": "Noch keine Statistik vorhanden. Bitte \"Laufstatistik erfassen\" aktivieren und eine Vorschau oder einen Lauf starten.",
     },
     "en": {
         "window_title": "Pixel Photo Renamer v1.7",
@@ -83,6 +165,7 @@ TRANSLATIONS = {
         "pixel_jpg": "Pixel Photos (JPG):",
         "pixel_dng": "Pixel Photos (DNG):",
         "videos": "Videos (skipped):",
+        "videos_renamed": "Videos:",
         "other_files": "Other Files (skipped):",
         "preview_label": "4. Renaming Preview:",
         "create_preview": "Create Preview",
@@ -92,6 +175,7 @@ TRANSLATIONS = {
         "select_source_error": "Please select a valid source folder first.",
         "select_output_error": "Please select a valid output folder first.",
         "warning": "Warning",
+        "info": "Note",
         "same_folder_warning": "Source and output folders are the same. Please select 'Copy' or a different output folder to avoid data loss.",
         "done": "Done",
         "files_processed": "files have been processed successfully.",
@@ -104,6 +188,73 @@ TRANSLATIONS = {
         "status_read_error": "Read error",
         "status_not_pixel": "Not a Pixel photo",
         "status_video": "Video",
+        "status_duplicate": "Duplicate",
+        "scan_mode_label": "Scan:",
+        "scan_serial": "Serial",
+        "scan_thread": "Parallel (threads)",
+        "scan_process": "Parallel (processes)",
+        "workers_label": "Workers:",
+        "use_cache": "Use EXIF cache",
+        "rebuild_cache": "Rebuild cache",
+        "detect_duplicates": "Detect duplicates (byte-identical files, also in the output folder)",
+        "dup_skip": "skip",
+        "dup_link": "create as hard link",
+        "recursive": "Include subfolders",
+        "layout_mirror": "Keep folder structure",
+        "layout_flatten": "All in one folder",
+        "layout_template": "By template:",
+        "layout_error": "The folder template is invalid:",
+        "include_label": "Only:",
+        "exclude_label": "Except:",
+        "filter_label": "Show:",
+        "filter_all": "All",
+        "sort_label": "Sort:",
+        "sort_directory": "Folder order",
+        "sort_original": "Original name",
+        "sort_new": "New name",
+        "sort_status": "Status",
+        "cancel": "Cancel",
+        "scan_running": "Analysed: {done} of {found} files",
+        "scan_walking": "Analysed: {done} files (still searching...)",
+        "scan_finished": "Scan finished: {done} files",
+        "scan_cancelled": "Scan cancelled after {done} files",
+        "dirs_unreadable": "These subfolders could not be read and were skipped:",
+        "progress_files_per_sec": "{rate:.0f} files/s",
+        "progress_mb_per_sec": "{rate:.1f} MB/s",
+        "progress_eta": "{eta} left",
+        "use_hardlinks": "Create copies as hard links (same drive, shares data with the original)",
+        "strategies_used": "Methods:",
+        "resume_run": "Resume interrupted run",
+        "undo_run": "Undo last run",
+        "undo_confirm": "Undo the last run ({count} files)?",
+        "no_journal": "There is no run that can be resumed or undone.",
+        "resuming": "Resuming run...",
+        "undoing": "Undoing run...",
+        "files_failed": "files failed (details in the journal).",
+        "resume_incomplete": "The run was interrupted before the scan finished. Please start the preview again to process the remaining files.",
+        "transfer_jobs_label": "Parallel transfers:",
+        "time_label": "Timestamp:",
+        "time_local": "Local time",
+        "time_utc": "UTC",
+        "use_pxl_name": "Use time from PXL name if EXIF is missing",
+        "use_milliseconds": "Append milliseconds",
+        "rename_videos": "Rename Pixel videos",
+        "save_plan": "Save preview as plan...",
+        "load_plan": "Load plan...",
+        "saving_plan": "Saving plan...",
+        "loading_plan": "Loading plan...",
+        "plan_saved": "Plan with {count} files saved.",
+        "plan_loaded": "Plan loaded: {done} files",
+        "plan_error": "The plan could not be saved or loaded:",
+        "no_preview": "Please create a preview first.",
+        "scan_still_running": "Please wait until the analysis has finished.",
+        "files_changed": "files changed or removed since the plan (skipped).",
+        "collect_stats": "Collect run statistics",
+        "show_stats": "Show statistics...",
+        "stats_title": "Run statistics",
+        "save_stats": "Save as JSON...",
+        "refresh_stats": "Refresh",
+        "no_stats": "No statistics yet. Please enable \"Collect run statistics\" and start a preview or a run.",
     },
     "fr": {
         "window_title": "Pixel Photo Renamer v1.7",
@@ -117,6 +268,7 @@ TRANSLATIONS = {
         "pixel_jpg": "Photos Pixel (JPG):",
         "pixel_dng": "Photos Pixel (DNG):",
         "videos": "Vidéos (ignorées):",
+        "videos_renamed": "Vidéos :",
         "other_files": "Autres Fichiers (ignorés):",
         "preview_label": "4. Aperçu du renommage:",
         "create_preview": "Créer l'aperçu",
@@ -126,6 +278,7 @@ TRANSLATIONS = {
         "select_source_error": "Veuillez d'abord sélectionner un dossier source valide.",
         "select_output_error": "Veuillez d'abord sélectionner un dossier de destination valide.",
         "warning": "Avertissement",
+        "info": "Remarque",
         "same_folder_warning": "Les dossiers source et de destination sont identiques. Veuillez sélectionner 'Copier' ou un autre dossier pour éviter la perte de données.",
         "done": "Terminé",
         "files_processed": "fichiers ont été traités avec succès.",
@@ -138,8 +291,104 @@ TRANSLATIONS = {
         "status_read_error": "Erreur de lecture",
         "status_not_pixel": "Pas une photo Pixel",
         "status_video": "Vidéo",
+        "status_duplicate": "Doublon",
+        "scan_mode_label": "Analyse :",
+        "scan_serial": "Séquentielle",
+        "scan_thread": "Parallèle (threads)",
+        "scan_process": "Parallèle (processus)",
+        "workers_label": "Workers :",
+        "use_cache": "Utiliser le cache EXIF",
+        "rebuild_cache": "Reconstruire le cache",
+        "detect_duplicates": "Détecter les doublons (fichiers identiques, y compris dans le dossier de sortie)",
+        "dup_skip": "ignorer",
+        "dup_link": "créer comme lien physique",
+        "recursive": "Inclure les sous-dossiers",
+        "layout_mirror": "Conserver l'arborescence",
+        "layout_flatten": "Tout dans un dossier",
+        "layout_template": "Selon le modèle :",
+        "layout_error": "Le modèle de dossiers est invalide :",
+        "include_label": "Seulement :",
+        "exclude_label": "Sauf :",
+        "filter_label": "Afficher :",
+        "filter_all": "Tous",
+        "sort_label": "Trier :",
+        "sort_directory": "Ordre du dossier",
+        "sort_original": "Nom d'origine",
+        "sort_new": "Nouveau nom",
+        "sort_status": "Statut",
+        "cancel": "Annuler",
+        "scan_running": "Analysés : {done} sur {found} fichiers",
+        "scan_walking": "Analysés : {done} fichiers (recherche en cours...)",
+        "scan_finished": "Analyse terminée : {done} fichiers",
+        "scan_cancelled": "Analyse annulée après {done} fichiers",
+        "dirs_unreadable": "Ces sous-dossiers n'ont pas pu être lus et ont été ignorés :",
+        "progress_files_per_sec": "{rate:.0f} fichiers/s",
+        "progress_mb_per_sec": "{rate:.1f} Mo/s",
+        "progress_eta": "reste {eta}",
+        "use_hardlinks": "Créer les copies comme liens physiques (même disque, partage les données avec l'original)",
+        "strategies_used": "Méthodes :",
+        "resume_run": "Reprendre l'opération interrompue",
+        "undo_run": "Annuler la dernière opération",
+        "undo_confirm": "Annuler la dernière opération ({count} fichiers) ?",
+        "no_journal": "Aucune opération à reprendre ou à annuler.",
+        "resuming": "Reprise de l'opération...",
+        "undoing": "Annulation de l'opération...",
+        "files_failed": "fichiers en échec (détails dans le journal).",
+        "resume_incomplete": "L'opération a été interrompue avant la fin de l'analyse. Relancez l'aperçu pour traiter les fichiers restants.",
+        "transfer_jobs_label": "Transferts simultanés :",
+        "time_label": "Horodatage :",
+        "time_local": "Heure locale",
+        "time_utc": "UTC",
+        "use_pxl_name": "Utiliser l'heure du nom PXL si l'EXIF manque",
+        "use_milliseconds": "Ajouter les millisecondes",
+        "rename_videos": "Renommer les vidéos Pixel",
+        "save_plan": "Enregistrer l'aperçu comme plan...",
+        "load_plan": "Charger un plan...",
+        "saving_plan": "Enregistrement du plan...",
+        "loading_plan": "Chargement du plan...",
+        "plan_saved": "Plan de {count} fichiers enregistré.",
+        "plan_loaded": "Plan chargé : {done} fichiers",
+        "plan_error": "Impossible d'enregistrer ou de charger le plan :",
+        "no_preview": "Veuillez d'abord créer un aperçu.",
+        "scan_still_running": "Veuillez attendre la fin de l'analyse.",
+        "files_changed": "fichiers modifiés ou supprimés depuis le plan (ignorés).",
+        "collect_stats": "Collecter les statistiques",
+        "show_stats": "Afficher les statistiques...",
+        "stats_title": "Statistiques d'exécution",
+        "save_stats": "Enregistrer en JSON...",
+        "refresh_stats": "Actualiser",
+        "no_stats": "Pas encore de statistiques. Veuillez activer \"Collecter les statistiques\" et lancer un aperçu ou un traitement.",
     }
 }
+# Reihenfolge der Status in Filter und Sortierung der Vorschau
+STATUS_KEYS = ("status_ok", "status_already_correct", "status_no_exif", "status_read_error",
+               "status_not_pixel", "status_video", "status_duplicate")
+# Farben der Vorschau-Zeilen je Status (grün für OK, rot für Fehler, orange für Warnung/Info)
+STATUS_COLORS = {"status_ok": '#90EE90', "status_read_error": '#FF6B6B'}
+DEFAULT_STATUS_COLOR = '#FFC107'
+# Sortiermöglichkeiten der Vorschau: Schlüssel der Übersetzung -> Sortierfunktion
+SORT_KEYS = {
+    "sort_directory": None,
+    "sort_original": lambda item: item.original.lower(),
+    "sort_new": lambda item: item.target_name.lower(),
+    "sort_status": lambda item: STATUS_KEYS.index(item.status_key),
+}
+
+# Ergebnisse der Analyse werden gebündelt im Takt des ProgressReporters an die GUI
+# übergeben. Die GUI holt sie alle SCAN_POLL_MS Millisekunden ab.
+SCAN_POLL_MS = 100
+
+# Wert des Auswahlknopfs für die Ablage nach Vorlage (der Text steht im Eingabefeld)
+LAYOUT_TEMPLATE = "template"
+
+# So viele Dateien bzw. Ordner werden in einer Meldung höchstens einzeln aufgeführt
+MAX_LISTED = 10
+
+
+def short_list(lines):
+    """Die ersten MAX_LISTED Zeilen, bei mehr mit dem Hinweis "(+Rest)"."""
+    more = len(lines) - MAX_LISTED
+    return "\n".join(lines[:MAX_LISTED]) + (f"\n(+{more})" if more > 0 else "")
 
 
 # ==============================================================================
@@ -176,9 +425,38 @@ class RenamerApp:
         self.source_dir = StringVar() # Speicher für den Pfad des Quellordners
         self.output_dir = StringVar() # Speicher für den Pfad des Ausgabeordners
         self.copy_instead_of_move = BooleanVar(value=True) # Speicher für den Zustand der Checkbox (Kopieren/Verschieben)
+        self.use_hardlinks = BooleanVar(value=False) # Kopien als Hardlinks anlegen (nur auf ausdrücklichen Wunsch)
+        self.transfer_jobs = StringVar(value="1") # Anzahl gleichzeitiger Kopier-/Verschiebevorgänge
+        self.scan_mode = StringVar(value=SCAN_THREAD) # Analyse-Modus für die Vorschau (seriell, Threads, Prozesse)
+        self.scan_workers = StringVar(value=str(default_workers(SCAN_THREAD))) # Anzahl paralleler Worker
+        self.use_cache = BooleanVar(value=True) # Speicher für den Zustand der Checkbox (EXIF-Cache)
+        self.detect_duplicates = BooleanVar(value=False) # Byte-gleiche Dateien beim Analysieren erkennen
+        self.duplicate_action = StringVar(value=DUP_SKIP) # Duplikate überspringen oder als Hardlink anlegen
+        self.time_output = StringVar(value=OUTPUT_LOCAL) # Zeitstempel in lokaler Zeit oder UTC
+        self.use_pxl_name = BooleanVar(value=False) # Zeit aus dem PXL-Namen, wenn kein EXIF-Datum vorhanden ist
+        self.use_milliseconds = BooleanVar(value=False) # Millisekunden aus dem PXL-Namen anhängen
+        self.rename_videos = BooleanVar(value=False) # Pixel-Videos (MP4/MOV) mit umbenennen
+        self.recursive = BooleanVar(value=False) # Unterordner des Quellordners mit durchsuchen
+        self.layout = StringVar(value=LAYOUT_MIRROR) # Ablage im Ausgabeordner (Struktur beibehalten/flach/Vorlage)
+        self.layout_template = StringVar(value=DEFAULT_TEMPLATE) # Vorlage für Unterordner nach Aufnahmezeit
+        self.include_patterns = StringVar() # Glob-Muster der einzubeziehenden Dateien, z.B. "*.jpg; *.dng"
+        self.exclude_patterns = StringVar() # Glob-Muster der auszuschließenden Dateien und Ordner
+        self.collect_stats = BooleanVar(value=False) # Zeiten und Zähler der Vorschau und der Läufe erfassen
+        
+        # Analyseergebnisse für jede Datei, mit Indexlisten je Status (siehe scan_results.py)
+        self.file_list = ScanResults()
+        self.scan_counts = None # Zusammenfassung der laufenden bzw. letzten Analyse
+        self.scan_done = 0 # Anzahl der bereits analysierten Dateien
+        self.scanning = False # Läuft gerade eine Analyse?
+        self.scan_unreadable = [] # Nicht lesbare Unterordner der laufenden bzw. letzten Analyse
         
-        # Liste zur Speicherung der Analyseergebnisse für jede Datei
-        self.file_list = []
+        # Zustand der Analyse im Hintergrund. Jede Analyse bekommt eine eigene Nummer, damit
+        # Ergebnisse einer abgebrochenen Analyse verworfen werden können.
+        self.scan_id = 0
+        self.scan_queue = None
+        self.scan_cancel = None
+        self.scan_status = None # (Übersetzungsschlüssel, ProgressSnapshot) für die Statuszeile
+        self.run_stats = {} # "preview"/"apply" -> RunStats der letzten Vorschau bzw. des letzten Laufs
         
         # Dictionary mit Tkinter-Variablen für die Statistik-Anzeige
         self.summary_vars = {
@@ -276,14 +554,33 @@ class RenamerApp:
         preview_frame.pack(fill="both", expand=True, pady=5)
         self.preview_label = Label(preview_frame, style="Header.TLabel")
         self.preview_label.pack(anchor="w", pady=(0, 5))
-        list_frame = Frame(preview_frame, style="TFrame")
-        list_frame.pack(fill="both", expand=True)
-        self.listbox = Listbox(list_frame, bg="#3C3C3C", fg="white", selectbackground="#007ACC", borderwidth=0, highlightthickness=0, font=('Consolas', 10))
-        self.listbox.pack(side="left", fill="both", expand=True)
-        scrollbar = Scrollbar(list_frame, orient="vertical", command=self.listbox.yview)
-        scrollbar.pack(side="right", fill="y")
-        self.listbox.config(yscrollcommand=scrollbar.set)
+        view_frame = Frame(preview_frame, style="TFrame")
+        view_frame.pack(fill="x", pady=(0, 5))
+        self.filter_label = Label(view_frame, style="TLabel")
+        self.filter_label.pack(side="left", padx=(0, 5))
+        self.filter_combobox = Combobox(view_frame, state="readonly", width=22)
+        self.filter_combobox.pack(side="left")
+        self.filter_combobox.bind("<<ComboboxSelected>>", self.apply_preview_filter)
+        self.sort_label = Label(view_frame, style="TLabel")
+        self.sort_label.pack(side="left", padx=(15, 5))
+        self.sort_combobox = Combobox(view_frame, state="readonly", width=18)
+        self.sort_combobox.pack(side="left")
+        self.sort_combobox.bind("<<ComboboxSelected>>", self.apply_preview_sort)
+        # Virtualisierte Liste: nur die sichtbaren Zeilen werden gezeichnet
+        self.preview_name_width = 0
+        self.preview_list = VirtualListView(preview_frame, self.format_preview_line, self.preview_line_color, style="TFrame")
+        self.preview_list.pack(fill="both", expand=True)
         
+        # Statuszeile der Analyse mit Fortschrittsbalken und Abbrechen-Button
+        scan_status_frame = Frame(self.main_frame, style="TFrame")
+        scan_status_frame.pack(fill="x", pady=(5, 0))
+        self.scan_progress = Progressbar(scan_status_frame, orient="horizontal", length=200, mode="determinate")
+        self.scan_progress.pack(side="left")
+        self.scan_status_label = Label(scan_status_frame, style="TLabel")
+        self.scan_status_label.pack(side="left", padx=10)
+        self.cancel_scan_button = Button(scan_status_frame, command=self.cancel_scan, style="TButton", state="disabled")
+        self.cancel_scan_button.pack(side="right")
+
         # Frame für die Aktions-Buttons (Vorschau, Umbenennen)
         action_frame = Frame(self.main_frame, style="TFrame")
         action_frame.pack(fill="x", pady=(10, 5))
@@ -291,10 +588,111 @@ class RenamerApp:
         self.preview_button.pack(side="left", expand=True, fill="x", padx=(0, 10))
         self.rename_button = Button(action_frame, command=self.start_processing, style="TButton", state="disabled")
         self.rename_button.pack(side="left", expand=True, fill="x")
+
+        # Frame für Fortsetzen/Rückgängig anhand des Journals
+        journal_frame = Frame(self.main_frame, style="TFrame")
+        journal_frame.pack(fill="x", pady=(0, 5))
+        self.resume_button = Button(journal_frame, command=self.start_resume, style="TButton")
+        self.resume_button.pack(side="left", expand=True, fill="x", padx=(0, 10))
+        self.undo_button = Button(journal_frame, command=self.start_undo, style="TButton")
+        self.undo_button.pack(side="left", expand=True, fill="x")
+
+        # Frame für das Speichern und Laden einer Vorschau als Plan (siehe plan_io.py)
+        plan_frame = Frame(self.main_frame, style="TFrame")
+        plan_frame.pack(fill="x", pady=(0, 5))
+        self.save_plan_button = Button(plan_frame, command=self.save_plan, style="TButton")
+        self.save_plan_button.pack(side="left", expand=True, fill="x", padx=(0, 10))
+        self.load_plan_button = Button(plan_frame, command=self.load_plan, style="TButton")
+        self.load_plan_button.pack(side="left", expand=True, fill="x")
         
         # Checkbox für Kopieren vs. Verschieben
         self.copy_checkbutton = Checkbutton(self.main_frame, variable=self.copy_instead_of_move, style="TCheckbutton")
         self.copy_checkbutton.pack(anchor="w", pady=5)
+        self.hardlink_checkbutton = Checkbutton(self.main_frame, variable=self.use_hardlinks, style="TCheckbutton")
+        self.hardlink_checkbutton.pack(anchor="w", pady=(0, 5))
+        transfer_frame = Frame(self.main_frame, style="TFrame")
+        transfer_frame.pack(fill="x", pady=(0, 5))
+        self.transfer_jobs_label = Label(transfer_frame, style="TLabel")
+        self.transfer_jobs_label.pack(side="left", padx=(0, 5))
+        Spinbox(transfer_frame, from_=1, to=32, width=4, textvariable=self.transfer_jobs).pack(side="left")
+
+        # Frame für die Einstellungen der parallelen Analyse
+        scan_frame = Frame(self.main_frame, style="TFrame")
+        scan_frame.pack(fill="x", pady=(0, 5))
+        self.scan_mode_label = Label(scan_frame, style="TLabel")
+        self.scan_mode_label.pack(side="left", padx=(0, 5))
+        self.scan_mode_buttons = {}
+        for mode in (SCAN_SERIAL, SCAN_THREAD, SCAN_PROCESS):
+            button = Radiobutton(scan_frame, variable=self.scan_mode, value=mode, style="TRadiobutton")
+            button.pack(side="left", padx=5)
+            self.scan_mode_buttons[mode] = button
+        self.workers_label = Label(scan_frame, style="TLabel")
+        self.workers_label.pack(side="left", padx=(15, 5))
+        Spinbox(scan_frame, from_=1, to=64, width=4, textvariable=self.scan_workers).pack(side="left")
+
+        # Frame für die Cache-Einstellungen
+        cache_frame = Frame(self.main_frame, style="TFrame")
+        cache_frame.pack(fill="x", pady=(0, 5))
+        self.cache_checkbutton = Checkbutton(cache_frame, variable=self.use_cache, style="TCheckbutton")
+        self.cache_checkbutton.pack(side="left")
+        self.rebuild_cache_button = Button(cache_frame, command=lambda: self.start_preview(rebuild_cache=True), style="TButton")
+        self.rebuild_cache_button.pack(side="right")
+
+        # Frame für die Duplikaterkennung
+        dedup_frame = Frame(self.main_frame, style="TFrame")
+        dedup_frame.pack(fill="x", pady=(0, 5))
+        self.dedup_checkbutton = Checkbutton(dedup_frame, variable=self.detect_duplicates, style="TCheckbutton")
+        self.dedup_checkbutton.pack(side="left")
+        self.dedup_buttons = {}
+        for action in (DUP_SKIP, DUP_LINK):
+            button = Radiobutton(dedup_frame, variable=self.duplicate_action, value=action, style="TRadiobutton")
+            button.pack(side="left", padx=5)
+            self.dedup_buttons[action] = button
+
+        # Frame für die Zeitstempel-Einstellungen
+        time_frame = Frame(self.main_frame, style="TFrame")
+        time_frame.pack(fill="x", pady=(0, 5))
+        self.time_label = Label(time_frame, style="TLabel")
+        self.time_label.pack(side="left", padx=(0, 5))
+        self.time_output_buttons = {}
+        for output in (OUTPUT_LOCAL, OUTPUT_UTC):
+            button = Radiobutton(time_frame, variable=self.time_output, value=output, style="TRadiobutton")
+            button.pack(side="left", padx=5)
+            self.time_output_buttons[output] = button
+        self.pxl_name_checkbutton = Checkbutton(time_frame, variable=self.use_pxl_name, style="TCheckbutton")
+        self.pxl_name_checkbutton.pack(side="left", padx=(15, 5))
+        self.milliseconds_checkbutton = Checkbutton(time_frame, variable=self.use_milliseconds, style="TCheckbutton")
+        self.milliseconds_checkbutton.pack(side="left", padx=5)
+        self.videos_checkbutton = Checkbutton(time_frame, variable=self.rename_videos, style="TCheckbutton")
+        self.videos_checkbutton.pack(side="left", padx=5)
+
+        # Frame für die rekursive Suche und die Dateifilter
+        walk_frame = Frame(self.main_frame, style="TFrame")
+        walk_frame.pack(fill="x", pady=(0, 5))
+        self.recursive_checkbutton = Checkbutton(walk_frame, variable=self.recursive, style="TCheckbutton")
+        self.recursive_checkbutton.pack(side="left")
+        self.layout_buttons = {}
+        for layout in (LAYOUT_MIRROR, LAYOUT_FLATTEN, LAYOUT_TEMPLATE):
+            button = Radiobutton(walk_frame, variable=self.layout, value=layout, style="TRadiobutton")
+            button.pack(side="left", padx=5)
+            self.layout_buttons[layout] = button
+        Entry(walk_frame, textvariable=self.layout_template, width=30).pack(side="left", fill="x", expand=True)
+        filter_frame = Frame(self.main_frame, style="TFrame")
+        filter_frame.pack(fill="x", pady=(0, 5))
+        self.include_label = Label(filter_frame, style="TLabel")
+        self.include_label.pack(side="left", padx=(0, 5))
+        Entry(filter_frame, textvariable=self.include_patterns, width=25).pack(side="left", fill="x", expand=True)
+        self.exclude_label = Label(filter_frame, style="TLabel")
+        self.exclude_label.pack(side="left", padx=(15, 5))
+        Entry(filter_frame, textvariable=self.exclude_patterns, width=25).pack(side="left", fill="x", expand=True)
+
+        # Frame für die Laufstatistik
+        stats_frame = Frame(self.main_frame, style="TFrame")
+        stats_frame.pack(fill="x", pady=(0, 5))
+        self.stats_checkbutton = Checkbutton(stats_frame, variable=self.collect_stats, style="TCheckbutton")
+        self.stats_checkbutton.pack(side="left")
+        self.stats_button = Button(stats_frame, command=self.show_stats_panel, style="TButton")
+        self.stats_button.pack(side="right")
 
     def update_ui_language(self, *args):
         """
@@ -310,7 +708,35 @@ class RenamerApp:
         self.preview_label.config(text=self._("preview_label"))
         self.preview_button.config(text=self._("create_preview"))
         self.rename_button.config(text=self._("start_renaming"))
+        self.resume_button.config(text=self._("resume_run"))
+        self.undo_button.config(text=self._("undo_run"))
+        self.save_plan_button.config(text=self._("save_plan"))
+        self.load_plan_button.config(text=self._("load_plan"))
         self.copy_checkbutton.config(text=self._("copy_files"))
+        self.hardlink_checkbutton.config(text=self._("use_hardlinks"))
+        self.transfer_jobs_label.config(text=self._("transfer_jobs_label"))
+        self.scan_mode_label.config(text=self._("scan_mode_label"))
+        for mode, button in self.scan_mode_buttons.items():
+            button.config(text=self._(f"scan_{mode}"))
+        self.workers_label.config(text=self._("workers_label"))
+        self.cache_checkbutton.config(text=self._("use_cache"))
+        self.rebuild_cache_button.config(text=self._("rebuild_cache"))
+        self.dedup_checkbutton.config(text=self._("detect_duplicates"))
+        for action, button in self.dedup_buttons.items():
+            button.config(text=self._(f"dup_{action}"))
+        self.time_label.config(text=self._("time_label"))
+        for output, button in self.time_output_buttons.items():
+            button.config(text=self._(f"time_{output}"))
+        self.pxl_name_checkbutton.config(text=self._("use_pxl_name"))
+        self.milliseconds_checkbutton.config(text=self._("use_milliseconds"))
+        self.videos_checkbutton.config(text=self._("rename_videos"))
+        self.recursive_checkbutton.config(text=self._("recursive"))
+        for layout, button in self.layout_buttons.items():
+            button.config(text=self._(f"layout_{layout}"))
+        self.include_label.config(text=self._("include_label"))
+        self.exclude_label.config(text=self._("exclude_label"))
+        self.stats_checkbutton.config(text=self._("collect_stats"))
+        self.stats_button.config(text=self._("show_stats"))
         
         # Setzt den Platzhaltertext für die Ordnerpfade neu, falls noch kein Ordner gewählt wurde
         if self.source_dir.get() in (TRANSLATIONS['de']['no_folder_selected'], TRANSLATIONS['en']['no_folder_selected'], TRANSLATIONS['fr']['no_folder_selected']):
@@ -318,16 +744,32 @@ class RenamerApp:
         if self.output_dir.get() in (TRANSLATIONS['de']['no_folder_selected'], TRANSLATIONS['en']['no_folder_selected'], TRANSLATIONS['fr']['no_folder_selected']):
             self.output_dir.set(self._("no_folder_selected"))
         
-        # Aktualisiert die Texte in der Vorschau-Liste und der Zusammenfassung
-        self.update_preview_listbox()
-        self.update_summary_display()
+        # Filter- und Sortierauswahl übersetzen, die gewählte Position bleibt erhalten
+        self.filter_label.config(text=self._("filter_label"))
+        self.sort_label.config(text=self._("sort_label"))
+        filter_index = max(0, self.filter_combobox.current())
+        self.filter_combobox.config(values=[self._("filter_all")] + [self._(key) for key in STATUS_KEYS])
+        self.filter_combobox.current(filter_index)
+        sort_index = max(0, self.sort_combobox.current())
+        self.sort_combobox.config(values=[self._(key) for key in SORT_KEYS])
+        self.sort_combobox.current(sort_index)
+        
+        self.cancel_scan_button.config(text=self._("cancel"))
+        self.update_scan_status()
+        
+        # Aktualisiert die Texte in der Vorschau-Liste (nur sichtbare Zeilen) und der Zusammenfassung
+        self.preview_list.redraw()
+        self.update_summary_display(self.scan_counts)
 
     def select_source_dir(self):
         """Öffnet einen Dialog zur Auswahl des Quellordners."""
         path = filedialog.askdirectory(title=self._("select_source_folder"))
         if path:
+            self.cancel_scan() # Eine laufende Analyse des alten Ordners wird abgebrochen
             self.source_dir.set(path)
-            self.listbox.delete(0, "end") # Leert die Vorschau
+            self.file_list = ScanResults()
+            self.scan_counts = None
+            self.preview_list.clear() # Leert die Vorschau
             self.rename_button.config(state="disabled") # Deaktiviert den Umbenennen-Button
             for var in self.summary_vars.values():
                 var.set("") # Leert die Zusammenfassung
@@ -338,51 +780,260 @@ class RenamerApp:
         if path:
             self.output_dir.set(path)
 
-    def start_preview(self):
-        """Startet den Vorschau-Prozess."""
+    def start_preview(self, rebuild_cache=False):
+        """
+        Startet den Vorschau-Prozess. Mit 'rebuild_cache' werden alle Dateien neu
+        gelesen und die Einträge im EXIF-Cache ersetzt.
+        Die Analyse läuft im Hintergrund; die Ergebnisse erscheinen laufend in der
+        Vorschau, und das Hauptfenster bleibt bedienbar.
+        """
         # Prüft, ob ein gültiger Quellordner ausgewählt wurde
         if not os.path.isdir(self.source_dir.get()):
             messagebox.showerror(self._("error"), self._("select_source_error"))
             return
+        self.cancel_scan()
+
         # Bereinigt die GUI für die neue Vorschau
-        self.listbox.delete(0, "end")
+        self.file_list = ScanResults()
+        self.scan_counts = new_counts()
+        self.scan_done = 0
+        self.preview_name_width = 0
+        self.preview_list.set_items(self.file_list)
         self.rename_button.config(state="disabled")
-        # Zeigt das "Bitte warten"-Fenster an und startet die Analyse in einem separaten Thread
-        self.show_progress_popup(self._("searching_files"), self.generate_preview)
+        self.update_summary_display(self.scan_counts)
+
+        # Die Einstellungen werden hier im Haupt-Thread gelesen, nicht im Analyse-Thread
+        self.scan_id += 1
+        self.scan_queue = queue.Queue()
+        self.scan_cancel = threading.Event()
+        output = self.output_dir.get() if self.detect_duplicates.get() else None
+        stats = self.create_stats("preview")
+        # Der Analyse-Thread hängt nicht lesbare Unterordner an; gelesen wird erst nach dem Ende
+        self.scan_unreadable = unreadable = []
+        walker = self.create_walker(lambda rel_dir, e: unreadable.append(f"{rel_dir}: {e}"))
+        settings = (walker, self.create_preview_planner(stats), self.scan_mode.get(),
+                    self.get_scan_workers(), self.use_cache.get() or rebuild_cache, rebuild_cache,
+                    self.detect_duplicates.get(), output, self.create_engine(), self.rename_videos.get(), stats)
+        threading.Thread(target=self.generate_preview, args=settings + (self.scan_queue, self.scan_cancel),
+                         daemon=True).start()
 
-    def generate_preview(self, progress_callback):
+        self.scanning = True
+        self.cancel_scan_button.config(state="normal")
+        self.scan_progress.config(mode="indeterminate", value=0)
+        self.scan_progress.start()
+        self.scan_status = None
+        self.update_scan_status()
+        self.master.after(SCAN_POLL_MS, self.poll_scan_queue, self.scan_id)
+
+    def generate_preview(self, walker, planner, mode, workers, use_cache, rebuild_cache, detect_duplicates, output,
+                         engine, videos, stats, result_queue, cancel_event):
         """
         Analysiert die Dateien im Quellordner und erstellt die Vorschau-Daten.
-        Läuft in einem separaten Thread, um die GUI nicht einzufrieren.
+        Läuft in einem separaten Thread, um die GUI nicht einzufrieren. Die Ergebnisse
+        werden gebündelt als (Einträge, ProgressSnapshot) in 'result_queue' gelegt;
+        vorher die Zusammenfassung nach Dateinamen als Dictionary, am Ende None. Ist ein 'planner' angegeben, erhalten die
+        Einträge die geplanten Zielnamen im Ausgabeordner. Mit 'detect_duplicates' werden
+        byte-gleiche Dateien (auch gegenüber dem Ausgabeordner 'output') markiert.
+        'engine' (TimestampEngine) bestimmt Zeitquelle und Zeitbezug der neuen Namen;
+        mit 'videos' werden auch Pixel-Videos umbenannt. Zeiten und Zähler landen in 'stats'.
         """
-        self.file_list.clear()
-        source_path = self.source_dir.get()
-        all_files = [f for f in os.listdir(source_path) if os.path.isfile(os.path.join(source_path, f))]
-        
-        counts = {"total": len(all_files), "jpg": 0, "dng": 0, "videos": 0, "other": 0}
-        
-        for i, filename in enumerate(all_files):
-            # Holt den neuen Namen und Status für jede Datei
-            new_name, status_key = self.get_new_filename(os.path.join(source_path, filename))
-            self.file_list.append({"original": filename, "new": new_name, "status_key": status_key})
-
-            # Zählt die Dateitypen für die Zusammenfassung
-            ext = os.path.splitext(filename)[1].lower()
-            if status_key == "status_video":
-                counts["videos"] += 1
-            elif status_key == "status_not_pixel":
-                counts["other"] += 1
-            elif ext == ".dng":
-                counts["dng"] += 1
-            elif ext in [".jpg", ".jpeg"]:
-                counts["jpg"] += 1
-
-            # Aktualisiert den Fortschrittsbalken im Popup
-            progress_callback((i + 1) / counts["total"] * 100)
-            
-        # Aktualisiert die GUI-Elemente (Vorschau-Liste und Zusammenfassung) im Haupt-Thread
-        self.master.after(0, self.update_preview_listbox)
-        self.master.after(0, lambda: self.update_summary_display(counts))
+        # Der Cache wird im Analyse-Thread geöffnet, da SQLite-Verbindungen an ihren Thread gebunden sind
+        cache = self.open_scan_cache() if use_cache else None
+        # Holt den neuen Namen und Status für jede Datei, je nach Einstellung parallel.
+        # Der Ordner wird zuerst komplett durchsucht und nach Namen eingeordnet, damit die
+        # Zusammenfassung sofort steht; erst danach werden Dateien geöffnet.
+        results = stats.timed("scan", iter_scan(walker, mode, workers, cache, rebuild_cache, engine,
+                                                on_listed=result_queue.put, videos=videos, stats=stats))
+        if detect_duplicates:
+            results = Deduplicator(walker.source_path, output, cache, workers).mark(results)
+        batch = []
+
+        def send_batch(snapshot):
+            # Wird vom Reporter höchstens 20-mal pro Sekunde aufgerufen
+            result_queue.put((batch.copy(), snapshot))
+            batch.clear()
+
+        reporter = ProgressReporter(send_batch)
+        try:
+            for item in results:
+                if cancel_event.is_set():
+                    break
+                if planner is not None:
+                    planner.plan_preview(item)
+                batch.append(item)
+                if walker.finished and not reporter.total:
+                    reporter.set_total(walker.found)
+                reporter.advance()
+        finally:
+            # Beendet laufende Worker, bevor der Cache geschlossen wird
+            results.close()
+            if cache is not None:
+                cache.close()
+            reporter.finish()
+            result_queue.put(None)
+
+    def poll_scan_queue(self, scan_id):
+        """
+        Holt die bisher angefallenen Ergebnisse aus der Warteschlange und übernimmt sie
+        in die Vorschau und die Zusammenfassung. Wird regelmäßig per 'after' aufgerufen,
+        bis die Analyse beendet ist.
+        """
+        if scan_id != self.scan_id:
+            return # Ergebnisse einer abgebrochenen Analyse
+        finished = False
+        snapshot = None
+        try:
+            while True:
+                message = self.scan_queue.get_nowait()
+                if message is None:
+                    finished = True
+                    break
+                if isinstance(message, dict):
+                    # Zusammenfassung aus der Einordnung nach Dateinamen, vor dem ersten Ergebnis
+                    self.scan_counts = message
+                    self.update_summary_display(self.scan_counts)
+                    continue
+                batch, snapshot = message
+                self.scan_done += len(batch)
+                for item in batch:
+                    self.file_list.append(item)
+                    self.preview_name_width = max(self.preview_name_width, len(item.original) + 3)
+        except queue.Empty:
+            pass
+
+        if snapshot is not None:
+            self.update_preview_listbox()
+            if snapshot.total:
+                # Sobald die Gesamtzahl bekannt ist, zeigt der Balken den echten Fortschritt
+                self.scan_progress.stop()
+                self.scan_progress.config(mode="determinate", value=snapshot_percent(snapshot))
+                self.scan_status = ("scan_running", snapshot)
+            else:
+                self.scan_status = ("scan_walking", snapshot)
+            self.update_scan_status()
+
+        if finished:
+            cancelled = self.scan_cancel.is_set()
+            self.finish_scan("scan_cancelled" if cancelled else "scan_finished")
+            if self.scan_unreadable:
+                messagebox.showwarning(self._("warning"),
+                                       f"{self._('dirs_unreadable')}\n{short_list(self.scan_unreadable)}")
+        else:
+            self.master.after(SCAN_POLL_MS, self.poll_scan_queue, scan_id)
+
+    def cancel_scan(self):
+        """Bricht eine laufende Analyse ab. Bereits analysierte Dateien bleiben in der Vorschau."""
+        if self.scan_cancel is None or self.scan_cancel.is_set():
+            return
+        self.scan_cancel.set()
+        # Die GUI wartet nicht auf den Analyse-Thread; seine restlichen Ergebnisse werden verworfen
+        self.scan_id += 1
+        self.finish_scan("scan_cancelled")
+
+    def finish_scan(self, status_key):
+        """Setzt die Statuszeile nach dem Ende (oder Abbruch) einer Analyse zurück."""
+        self.scanning = False
+        self.scan_progress.stop()
+        self.scan_progress.config(mode="determinate", value=100 if status_key == "scan_finished" else 0)
+        self.cancel_scan_button.config(state="disabled")
+        snapshot = self.scan_status[1] if self.scan_status else None
+        self.scan_status = (status_key, snapshot)
+        self.update_scan_status()
+
+    def update_scan_status(self):
+        """Zeigt den Stand der Analyse in der Statuszeile an (in der aktuellen Sprache)."""
+        if self.scan_status is None:
+            self.scan_status_label.config(text="")
+            return
+        key, snapshot = self.scan_status
+        done = self.scan_done
+        text = self._(key).format(done=done, found=snapshot.total if snapshot else 0)
+        if snapshot is not None:
+            text += f" – {self.format_rates(snapshot)}"
+        self.scan_status_label.config(text=text)
+
+    def format_rates(self, snapshot):
+        """Dateien/s, MB/s und Restzeit eines Fortschritts-Snapshots in der aktuellen Sprache."""
+        return format_rates(snapshot, TRANSLATIONS[self.language.get()])
+
+    def create_walker(self, on_error=None):
+        """
+        Erstellt den Verzeichnisdurchlauf für den Quellordner gemäß den Einstellungen.
+        'on_error' erhält nicht lesbare Unterordner (siehe SourceWalker).
+        """
+        output = self.output_dir.get()
+        skip_dirs = [output] if os.path.isdir(output) else []
+        return SourceWalker(self.source_dir.get(), self.recursive.get(),
+                            parse_patterns(self.include_patterns.get()),
+                            parse_patterns(self.exclude_patterns.get()), skip_dirs, on_error)
+
+    def create_preview_planner(self, stats=NULL_STATS):
+        """
+        Planer für die Zielnamen in der Vorschau, oder None ohne Ausgabeordner. Beim
+        Umbenennen werden die Namen mit einem frischen Verzeichnis neu vergeben, falls
+        sich der Ausgabeordner inzwischen geändert hat.
+        """
+        output = self.output_dir.get()
+        if not os.path.isdir(output):
+            return None
+        try:
+            layout = self.selected_layout()
+        except ValueError:
+            return None  # Die Vorlage wird beim Umbenennen gemeldet
+        return TransferPlanner(output, layout, create_dirs=False,
+                               link_duplicates=self.link_duplicates(), stats=stats)
+
+    def selected_layout(self):
+        """Gewählte Ablage: LAYOUT_MIRROR, LAYOUT_FLATTEN oder der Text der Vorlage (ValueError, wenn ungültig)."""
+        if self.layout.get() != LAYOUT_TEMPLATE:
+            return self.layout.get()
+        return str(LayoutTemplate(self.layout_template.get()))
+
+    def create_stats(self, label):
+        """
+        Erzeugt die Laufstatistik, wenn sie erfasst werden soll (sonst NULL_STATS), und
+        merkt sie sich unter 'label' für die Anzeige. Die Einstellungen werden im Bericht vermerkt.
+        """
+        if not self.collect_stats.get():
+            return NULL_STATS
+        stats = RunStats(label)
+        stats.info.update({"source": self.source_dir.get(), "output": self.output_dir.get(),
+                           "scan_mode": self.scan_mode.get(), "workers": self.get_scan_workers(),
+                           "transfer_jobs": self.get_transfer_jobs(), "cache": self.use_cache.get(),
+                           "recursive": self.recursive.get(), "videos": self.rename_videos.get()})
+        self.run_stats[label] = stats
+        return stats
+
+    def create_engine(self):
+        """Erzeugt die TimestampEngine gemäß den Zeitstempel-Einstellungen."""
+        precedence = DEFAULT_PRECEDENCE + ((SOURCE_PXL_NAME,) if self.use_pxl_name.get() else ())
+        return TimestampEngine(precedence, self.time_output.get(), self.use_milliseconds.get())
+
+    def link_duplicates(self):
+        """Prüft, ob erkannte Duplikate als Hardlink angelegt statt übersprungen werden."""
+        return self.detect_duplicates.get() and self.duplicate_action.get() == DUP_LINK
+
+    def open_scan_cache(self):
+        """Öffnet den EXIF-Cache. Ist das nicht möglich, wird ohne Cache weitergearbeitet."""
+        try:
+            return ScanCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Hinweis: EXIF-Cache konnte nicht geöffnet werden ({e}). Analyse ohne Cache.")
+            return None
+
+    def get_scan_workers(self):
+        """Liest die Worker-Anzahl aus dem Eingabefeld; ungültige Eingaben ergeben den Standardwert."""
+        try:
+            return max(1, int(self.scan_workers.get()))
+        except ValueError:
+            return default_workers(self.scan_mode.get())
+
+    def get_transfer_jobs(self):
+        """Liest die Anzahl gleichzeitiger Übertragungen; ungültige Eingaben ergeben 1."""
+        try:
+            return max(1, int(self.transfer_jobs.get()))
+        except ValueError:
+            return 1
 
     def update_summary_display(self, counts=None):
         """Aktualisiert die Texte in der Zusammenfassung."""
@@ -390,123 +1041,336 @@ class RenamerApp:
             self.summary_vars["total"].set(f"{self._('total_files')} {counts['total']}")
             self.summary_vars["jpg"].set(f"{self._('pixel_jpg')} {counts['jpg']}")
             self.summary_vars["dng"].set(f"{self._('pixel_dng')} {counts['dng']}")
-            self.summary_vars["videos"].set(f"{self._('videos')} {counts['videos']}")
+            videos_key = "videos_renamed" if self.rename_videos.get() else "videos"
+            self.summary_vars["videos"].set(f"{self._(videos_key)} {counts['videos']}")
             self.summary_vars["other"].set(f"{self._('other_files')} {counts['other']}")
         else: # Setzt die Texte zurück, wenn keine Daten vorhanden sind
              for var in self.summary_vars.values():
                 var.set("")
 
     def update_preview_listbox(self):
-        """Füllt die Vorschau-Liste mit den analysierten Daten."""
-        self.listbox.delete(0, "end")
-        if not self.file_list: return
-
-        # Berechnet die maximale Länge der Dateinamen für eine saubere Ausrichtung
-        max_len = max((len(f['original']) for f in self.file_list), default=0) + 3
-        for item in self.file_list:
-            status_text = self._(item['status_key'])
-            line = f"{item['original']:{max_len}} -> {item['new']} [{status_text}]"
-            self.listbox.insert("end", line)
-            # Färbt die Zeile je nach Status (grün für OK, orange für Warnung/Info)
-            color = '#90EE90' if item['status_key'] == "status_ok" else '#FFC107'
-            self.listbox.itemconfig("end", {'fg': color})
+        """Übernimmt neue Einträge in die Vorschau-Liste (gezeichnet werden nur sichtbare Zeilen)."""
+        self.preview_list.refresh()
             
-        # Aktiviert den Umbenennen-Button nur, wenn es Dateien gibt, die umbenannt werden können
-        if any(f['status_key'] == "status_ok" for f in self.file_list):
+        # Aktiviert den Umbenennen-Button, sobald es Dateien gibt, die umbenannt werden können –
+        # auch wenn die Analyse noch läuft
+        if self.file_list.count("status_ok"):
             self.rename_button.config(state="normal")
         else:
             self.rename_button.config(state="disabled")
 
-    def get_new_filename(self, original_path):
-        """
-        Ermittelt den neuen Dateinamen und den Status für eine einzelne Datei.
-        Dies ist die Kernlogik des Programms.
-        """
-        filename = os.path.basename(original_path)
-        ext = os.path.splitext(filename)[1].lower()
+    def format_preview_line(self, item):
+        """Text einer Zeile der Vorschau (wird nur für sichtbare Zeilen aufgerufen)."""
+        status_text = self._(item.status_key)
+        # Zeigt den geplanten Zielnamen (mit _N-Suffix), sofern ein Ausgabeordner gewählt ist
+        return f"{item.original:{self.preview_name_width}} -> {item.target_name} [{status_text}]"
 
-        # Prüft, ob es sich um eine Videodatei handelt
-        if ext in ['.mp4', '.mov', '.mkv']:
-            return filename, "status_video"
-        
-        # Prüft, ob die Datei dem Pixel-Namensschema entspricht
-        if not filename.lower().startswith('pxl_'):
-            return filename, "status_not_pixel"
+    def preview_line_color(self, item):
+        """Färbt die Zeile je nach Status."""
+        return STATUS_COLORS.get(item.status_key, DEFAULT_STATUS_COLOR)
 
-        try:
-            # Versucht, die EXIF-Daten zu laden
-            exif_dict = piexif.load(original_path)
-            date_bytes = exif_dict.get("Exif", {}).get(piexif.ExifIFD.DateTimeOriginal)
-            if not date_bytes: return filename, "status_no_exif" # Kein Aufnahmedatum gefunden
-            
-            # Formatiert das Datum in den gewünschten Zeitstempel um
-            date_obj = datetime.strptime(date_bytes.decode("utf-8"), "%Y:%m:%d %H:%M:%S")
-            timestamp = date_obj.strftime("%Y%m%d_%H%M%S")
-            
-            # Extrahiert den Suffix (z.B. .NIGHT, .RAW-01) aus dem Originalnamen
-            match = re.compile(r"PXL_\d{8}_\d{9}(.*?)\..{3,4}$", re.IGNORECASE).match(filename)
-            suffix = match.group(1) if match else ""
-            
-            # Baut den neuen Dateinamen zusammen
-            new_name = f"{timestamp}{suffix}{ext}"
-            
-            # Prüft, ob der Name bereits korrekt ist
-            return (filename, "status_already_correct") if new_name.lower() == filename.lower() else (new_name, "status_ok")
-        except Exception:
-            # Fängt alle anderen Fehler beim Lesen der Datei ab
-            return filename, "status_read_error"
+    def apply_preview_filter(self, *args):
+        """Zeigt in der Vorschau nur Dateien mit dem gewählten Status."""
+        index = self.filter_combobox.current()
+        if index <= 0:
+            self.preview_list.set_filter(None)
+        else:
+            status_key = STATUS_KEYS[index - 1]
+            # Die Indexliste des Status wird direkt als Ansicht verwendet und wächst mit
+            self.preview_list.set_filter(lambda: self.file_list.indices(status_key))
+
+    def apply_preview_sort(self, *args):
+        """Sortiert die Vorschau nach der gewählten Spalte."""
+        sort_key = list(SORT_KEYS)[max(0, self.sort_combobox.current())]
+        self.preview_list.set_sort(SORT_KEYS[sort_key])
+
+    def get_new_filename(self, original_path):
+        """Ermittelt den neuen Dateinamen und den Status für eine einzelne Datei."""
+        return get_new_filename(original_path, self.create_engine(), self.rename_videos.get())
 
     def start_processing(self):
         """Startet den eigentlichen Umbenennungs-/Kopierprozess."""
         # Sicherheitsprüfungen
+        if not os.path.isdir(self.source_dir.get()):
+            messagebox.showerror(self._("error"), self._("select_source_error"))
+            return
         if not os.path.isdir(self.output_dir.get()):
             messagebox.showerror(self._("error"), self._("select_output_error"))
             return
         if self.source_dir.get() == self.output_dir.get() and not self.copy_instead_of_move.get():
              messagebox.showwarning(self._("warning"), self._("same_folder_warning"))
              return
+        try:
+            layout = self.selected_layout()
+        except ValueError as e:
+            messagebox.showerror(self._("error"), f"{self._('layout_error')} {e}")
+            return
+        # Verarbeitet die bereits geprüften Dateien, auch wenn die Analyse noch läuft. Die Auswahl
+        # wird hier im Haupt-Thread festgelegt; später angehängte Einträge gehören nicht dazu.
+        link_duplicates = self.link_duplicates()
+        wanted = ("status_ok", "status_duplicate") if link_duplicates else ("status_ok",)
+        to_process = self.file_list.select(*wanted)
+        settings = (to_process, self.source_dir.get(), self.output_dir.get(),
+                    self.copy_instead_of_move.get(), layout, self.use_hardlinks.get(),
+                    self.get_transfer_jobs(), link_duplicates, self.create_stats("apply"))
         # Startet den Prozess im Hintergrund-Thread
-        self.show_progress_popup(self._("processing_files"), self.process_files)
+        self.show_progress_popup(self._("processing_files"), lambda callback: self.process_files(callback, *settings))
 
-    def process_files(self, progress_callback):
+    def process_files(self, progress_callback, to_process, source, output, copy, layout, hardlink, jobs,
+                      link_duplicates, stats=NULL_STATS):
         """
         Kopiert oder verschiebt die Dateien, die zum Umbenennen markiert sind.
-        Läuft in einem separaten Thread.
+        Läuft in einem separaten Thread. Jede Übertragung wird im Journal vermerkt,
+        damit ein abgebrochener Lauf fortgesetzt oder rückgängig gemacht werden kann.
+        Dauer, übertragene Bytes und Fehler nach Art landen in 'stats'. Stammen die
+        Einträge aus einem geladenen Plan, werden Dateien übersprungen, die sich seit dem
+        Plan verändert haben (ein stat-Aufruf pro Datei). Fehlgeschlagene und
+        übersprungene Dateien werden in der Ergebnismeldung aufgeführt.
         """
-        source = self.source_dir.get()
-        output = self.output_dir.get()
-        to_process = [f for f in self.file_list if f['status_key'] == "status_ok"]
-        total_to_process = len(to_process)
+        # Meldet den Fortschritt gedrosselt (höchstens 20-mal pro Sekunde) an das Popup
+        reporter = ProgressReporter(progress_callback, total=len(to_process))
         
-        for i, item in enumerate(to_process):
-            original_path = os.path.join(source, item['original'])
-            new_path = os.path.join(output, item['new'])
-            try:
-                # Prüft, ob eine Datei mit dem neuen Namen bereits existiert, und fügt eine Nummer hinzu
-                if os.path.exists(new_path):
-                    base, ext = os.path.splitext(item['new'])
-                    count = 1
-                    while os.path.exists(new_path):
-                        new_path = os.path.join(output, f"{base}_{count}{ext}")
-                        count += 1
-                
-                # Führt je nach Auswahl die Kopier- oder Verschiebe-Operation durch
-                if self.copy_instead_of_move.get():
-                    shutil.copy2(original_path, new_path)
+        # Zählt, wie oft welches Übertragungsverfahren (rename, reflink, stream, ...) verwendet wurde
+        strategies = {}
+        failed = []
+        changed = []
+
+        def skip_changed(item):
+            changed.append(item.original)
+            reporter.advance()
+
+        with Journal.create(source=source, output=output, copy=copy, layout=layout, hardlink=hardlink,
+                            link_duplicates=link_duplicates) as journal:
+            unchanged = unchanged_items(to_process, source, skip_changed, stats)
+            results = stats.timed("process", process_items(unchanged, source, output, copy, layout, hardlink, jobs,
+                                                           link_duplicates=link_duplicates, journal=journal,
+                                                           stats=stats))
+            for item, new_path, strategy, error in results:
+                nbytes = 0
+                if error is not None:
+                    # Der Fehler steht auch im Journal und wird in der Statistik nach Art gezählt
+                    failed.append(f"{item.original}: {error}")
                 else:
-                    shutil.move(original_path, new_path)
-            except Exception as e:
-                print(f"Fehler bei der Verarbeitung von {item['original']}: {e}")
-            
-            # Aktualisiert den Fortschrittsbalken
-            if total_to_process > 0:
-                progress_callback((i + 1) / total_to_process * 100)
+                    strategies[strategy] = strategies.get(strategy, 0) + 1
+                    stats.count("stat_calls")
+                    try:
+                        nbytes = os.path.getsize(new_path)
+                    except OSError:
+                        pass
+                    stats.count("bytes_transferred", nbytes)
+                reporter.advance(nbytes=nbytes)
+        reporter.finish()
         
         # Zeigt eine Erfolgsmeldung an und aktualisiert die Vorschau
-        processed_count = len(to_process)
+        self.show_run_result(sum(strategies.values()), failed, strategies, changed)
+
+    def show_run_result(self, processed_count, failed, strategies, changed=()):
+        """
+        Zeigt das Ergebnis eines Laufs an und aktualisiert die Vorschau (aus einem
+        Hintergrund-Thread). 'failed' enthält "Datei: Fehler"-Zeilen, 'changed' die seit
+        dem Plan veränderten Dateien; beide werden gekürzt aufgeführt.
+        """
         message_text = f"{processed_count} {self._('files_processed')}"
-        self.master.after(0, lambda: messagebox.showinfo(self._("done"), message_text))
-        self.master.after(0, self.start_preview)
+        if strategies:
+            used = ", ".join(f"{name} {count}" for name, count in sorted(strategies.items()))
+            message_text += f"\n{self._('strategies_used')} {used}"
+        if failed:
+            message_text += f"\n\n{len(failed)} {self._('files_failed')}\n{short_list(failed)}"
+        if changed:
+            message_text += f"\n\n{len(changed)} {self._('files_changed')}\n{short_list(changed)}"
+        show = messagebox.showwarning if failed or changed else messagebox.showinfo
+        self.master.after(0, lambda: show(self._("done"), message_text))
+        self.master.after(0, self.refresh_preview)
+
+    def show_stats_panel(self):
+        """
+        Zeigt die Statistik der letzten Vorschau und des letzten Laufs in einem eigenen
+        Fenster an. Läuft die Analyse noch, gibt "Aktualisieren" den aktuellen Stand wieder.
+        """
+        run_stats = dict(self.run_stats)
+        if not run_stats:
+            messagebox.showinfo(self._("info"), self._("no_stats"))
+            return
+        panel = Toplevel(self.master)
+        panel.title(self._("stats_title"))
+        panel.geometry("640x420")
+        panel.configure(bg="#2E2E2E")
+        panel.transient(self.master)
+        text = Text(panel, bg="#3C3C3C", fg="#FFFFFF", font=("Consolas", 10), relief="flat", wrap="none")
+        text.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+        def show_report():
+            text.config(state="normal")
+            text.delete("1.0", "end")
+            text.insert("1.0", "\n\n".join(format_report(stats.report()) for stats in run_stats.values()))
+            text.config(state="disabled")
+
+        def save_report():
+            path = filedialog.asksaveasfilename(parent=panel, title=self._("save_stats"), defaultextension=".json",
+                                                filetypes=[("JSON", "*.json")])
+            if path:
+                try:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump({label: stats.report() for label, stats in run_stats.items()}, f, indent=2,
+                                  ensure_ascii=False)
+                except OSError as e:
+                    messagebox.showerror(self._("error"), str(e), parent=panel)
+
+        button_frame = Frame(panel, style="TFrame")
+        button_frame.pack(fill="x", padx=10, pady=(0, 10))
+        Button(button_frame, text=self._("refresh_stats"), command=show_report, style="TButton").pack(side="left")
+        Button(button_frame, text=self._("save_stats"), command=save_report, style="TButton").pack(side="right")
+        show_report()
+
+    def save_plan(self):
+        """Speichert die Vorschau als Plan, um sie später oder auf einem anderen Rechner anzuwenden."""
+        if self.scanning:
+            messagebox.showinfo(self._("info"), self._("scan_still_running"))
+            return
+        if not len(self.file_list):
+            messagebox.showinfo(self._("info"), self._("no_preview"))
+            return
+        path = filedialog.asksaveasfilename(title=self._("save_plan"), defaultextension=".jsonl",
+                                            filetypes=[("JSON Lines", "*.jsonl")])
+        if not path:
+            return
+        try:
+            layout = self.selected_layout()
+        except ValueError as e:
+            messagebox.showerror(self._("error"), f"{self._('layout_error')} {e}")
+            return
+        output = self.output_dir.get() if os.path.isdir(self.output_dir.get()) else None
+        settings = {"layout": layout, "dedup": self.duplicate_action.get() if self.detect_duplicates.get() else None,
+                    "time_output": self.time_output.get(), "pxl_name": self.use_pxl_name.get(),
+                    "milliseconds": self.use_milliseconds.get(), "videos": self.rename_videos.get()}
+        args = (path, self.file_list, self.source_dir.get(), output, settings)
+        self.show_progress_popup(self._("saving_plan"), lambda callback: self.write_plan_file(callback, *args))
+
+    def write_plan_file(self, progress_callback, path, results, source, output, settings):
+        """Schreibt die Einträge als Plan; stat pro umzubenennender Datei. Läuft in einem separaten Thread."""
+        reporter = ProgressReporter(progress_callback, total=len(results))
+        try:
+            with PlanWriter(path, source, output, **settings) as writer:
+                for item in results:
+                    writer.write(item)
+                    reporter.advance()
+        except OSError as e:
+            self.master.after(0, lambda: messagebox.showerror(self._("error"), f"{self._('plan_error')} {e}"))
+            return
+        finally:
+            reporter.finish()
+        self.master.after(0, lambda: messagebox.showinfo(self._("done"), self._("plan_saved").format(count=writer.count)))
+
+    def load_plan(self):
+        """
+        Lädt einen gespeicherten Plan als Vorschau, ohne die Dateien erneut zu analysieren.
+        Quell- und Ausgabeordner werden aus dem Plan übernommen, sofern es sie auf diesem
+        Rechner gibt; sonst bleiben die gewählten Ordner (z.B. dieselbe Freigabe unter
+        anderem Pfad).
+        """
+        path = filedialog.askopenfilename(title=self._("load_plan"),
+                                          filetypes=[("JSON Lines", "*.jsonl"), ("*", "*")])
+        if not path:
+            return
+        try:
+            header = read_plan_header(path)
+        except (OSError, PlanFormatError) as e:
+            messagebox.showerror(self._("error"), f"{self._('plan_error')} {e}")
+            return
+        self.cancel_scan()
+        if os.path.isdir(header["source"]):
+            self.source_dir.set(header["source"])
+        if header.get("output") and os.path.isdir(header["output"]):
+            self.output_dir.set(header["output"])
+        layout = header.get("layout")
+        if layout in (LAYOUT_MIRROR, LAYOUT_FLATTEN):
+            self.layout.set(layout)
+        elif isinstance(layout, str) and is_template(layout):
+            self.layout.set(LAYOUT_TEMPLATE)
+            self.layout_template.set(layout)
+        if header.get("dedup") in (DUP_SKIP, DUP_LINK):
+            self.detect_duplicates.set(True)
+            self.duplicate_action.set(header["dedup"])
+        args = (path, self.source_dir.get())
+        self.show_progress_popup(self._("loading_plan"), lambda callback: self.read_plan_file(callback, *args))
+
+    def read_plan_file(self, progress_callback, path, source):
+        """Liest die Einträge eines Plans und die Zusammenfassung. Läuft in einem separaten Thread."""
+        reporter = ProgressReporter(progress_callback)
+        results = ScanResults()
+        counts = new_counts()
+        name_width = 0
+        try:
+            for item in iter_plan(path, source):
+                results.append(item)
+                counts["total"] += 1
+                count_result(counts, item.original)
+                name_width = max(name_width, len(item.original) + 3)
+                reporter.advance()
+        except (OSError, ValueError, KeyError) as e:
+            self.master.after(0, lambda: messagebox.showerror(self._("error"), f"{self._('plan_error')} {e}"))
+            return
+        finally:
+            reporter.finish()
+        self.master.after(0, self.show_loaded_plan, results, counts, name_width)
+
+    def show_loaded_plan(self, results, counts, name_width):
+        """Übernimmt einen geladenen Plan in die Vorschau (im Haupt-Thread)."""
+        self.cancel_scan()
+        self.file_list = results
+        self.scan_counts = counts
+        self.scan_done = len(results)
+        self.preview_name_width = name_width
+        self.preview_list.set_items(self.file_list)
+        self.update_summary_display(self.scan_counts)
+        self.update_preview_listbox()
+        self.scan_progress.config(mode="determinate", value=100)
+        self.scan_status = ("plan_loaded", None)
+        self.update_scan_status()
+
+    def refresh_preview(self):
+        """Startet die Vorschau neu, sofern ein Quellordner gewählt ist."""
+        if os.path.isdir(self.source_dir.get()):
+            self.start_preview()
+
+    def start_resume(self):
+        """Setzt den letzten, abgebrochenen Lauf anhand seines Journals fort."""
+        path = latest_journal()
+        state = load_state(path) if path else None
+        if state is None or (state.complete and not state.pending()):
+            messagebox.showinfo(self._("info"), self._("no_journal"))
+            return
+        self.show_progress_popup(self._("resuming"), lambda callback: self.replay_journal(callback, path, state, False))
+
+    def start_undo(self):
+        """Macht den letzten Lauf nach Rückfrage rückgängig."""
+        path = latest_journal()
+        state = load_state(path) if path else None
+        count = undo_count(state) if state else 0
+        if not count:
+            messagebox.showinfo(self._("info"), self._("no_journal"))
+            return
+        if not messagebox.askyesno(self._("warning"), self._("undo_confirm").format(count=count)):
+            return
+        self.show_progress_popup(self._("undoing"), lambda callback: self.replay_journal(callback, path, state, True))
+
+    def replay_journal(self, progress_callback, path, state, undo):
+        """Führt 'resume' bzw. 'undo' für ein Journal aus. Läuft in einem separaten Thread."""
+        total = undo_count(state) if undo else len(state.pending())
+        reporter = ProgressReporter(progress_callback, total=total)
+        strategies = {}
+        failed = []
+        results = ((plan, "undo", error) for plan, error in undo_run(path)) if undo else resume_run(path)
+        for plan, strategy, error in results:
+            if error is not None:
+                failed.append(f"{plan['src']}: {error}")
+            else:
+                strategies[strategy] = strategies.get(strategy, 0) + 1
+            reporter.advance()
+        reporter.finish()
+        self.show_run_result(sum(strategies.values()), failed, strategies)
+        if not undo and not state.scan_complete:
+            self.master.after(0, lambda: messagebox.showinfo(self._("info"), self._("resume_incomplete")))
 
     def show_progress_popup(self, title, task_function):
         """
@@ -515,7 +1379,7 @@ class RenamerApp:
         """
         popup = Toplevel(self.master)
         popup.title("")
-        popup.geometry("300x120")
+        popup.geometry("320x140")
         popup.configure(bg="#2E2E2E")
         popup.transient(self.master) # Hält das Popup im Vordergrund des Hauptfensters
         popup.grab_set() # Blockiert die Interaktion mit dem Hauptfenster
@@ -524,12 +1388,22 @@ class RenamerApp:
         Label(popup, text=self._("please_wait"), style="TLabel").pack()
         progress = Progressbar(popup, orient="horizontal", length=250, mode="determinate")
         progress.pack(pady=10)
+        rate_label = Label(popup, style="TLabel")
+        rate_label.pack()
+
+        def show_snapshot(snapshot):
+            """Überträgt einen Fortschritts-Snapshot in das Popup (im Haupt-Thread)."""
+            percent = snapshot_percent(snapshot)
+            if percent is not None:
+                progress.config(value=percent)
+            rate_label.config(text=self.format_rates(snapshot))
         
         def run_task():
             """Die Funktion, die im Thread ausgeführt wird."""
             try:
-                # Übergibt eine Callback-Funktion, um den Fortschrittsbalken aus dem Thread zu aktualisieren
-                task_function(lambda v: self.master.after(0, progress.config, {'value': v}))
+                # Übergibt eine Callback-Funktion, die einen ProgressSnapshot aus dem Thread an das Popup weiterreicht.
+                # Der Aufrufer drosselt die Meldungen, daher entsteht hier nur ein 'after' pro Meldung.
+                task_function(lambda snapshot: self.master.after(0, show_snapshot, snapshot))
             finally:
                 # Schließt das Popup, wenn der Task beendet ist (auch bei Fehlern)
                 self.master.after(0, popup.destroy)
@@ -0,0 +1,512 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Kommandozeilen-Version des Pixel Photo Renamers (ohne GUI, ohne tkinter).
+
+Beispiele:
+    python pixel_utc_renamer.py scan QUELLE [--jobs 8] [--json]
+    python pixel_utc_renamer.py apply QUELLE ZIEL --copy [--jobs 8] [--json]
+    python pixel_utc_renamer.py resume [JOURNAL]
+    python pixel_utc_renamer.py undo [JOURNAL]
+    python pixel_utc_renamer.py watch EINGANG ZIEL --move [--settle 5]
+
+Für jede Datei wird sofort eine Ergebniszeile ausgegeben (mit --json als JSON-Zeile),
+ohne vorher den ganzen Ordner zu analysieren. Die Zusammenfassung folgt am Ende
+auf stderr. 'apply' schreibt ein Journal aller Übertragungen; damit kann ein
+abgebrochener Lauf ohne neue Analyse fortgesetzt ('resume') oder ein Lauf
+rückgängig gemacht werden ('undo'). Ohne Angabe wird das neueste Journal verwendet.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from renamer_core import (SCAN_SERIAL, SCAN_THREAD, SCAN_PROCESS, LAYOUT_MIRROR, LAYOUT_FLATTEN, SourceWalker,
+                          iter_scan, new_counts, count_result, process_items, TransferPlanner)
+from dedup import DUP_SKIP, DUP_LINK, Deduplicator
+from instrumentation import NULL_STATS, RunStats
+from output_layout import DEFAULT_TEMPLATE, TEMPLATE_FIELDS, LayoutTemplate
+from journal import Journal, latest_journal, load_state, resume_run, undo_run
+from plan_io import PlanFormatError, PlanWriter, iter_plan, read_plan_header, unchanged_items
+from progress import ProgressReporter, console_sink
+from watch import DEFAULT_INTERVAL, DEFAULT_SETTLE, DEFAULT_BATCH_SIZE, watch_folder
+from scan_cache import ScanCache
+from timestamps import SOURCES, DEFAULT_PRECEDENCE, OUTPUT_LOCAL, OUTPUT_UTC, TimestampEngine
+
+
+def time_sources(text):
+    """argparse-Typ für --time-source: durch Komma getrennte Quellen in der gewünschten Reihenfolge."""
+    sources = tuple(part.strip() for part in text.split(",") if part.strip())
+    unknown = [source for source in sources if source not in SOURCES]
+    if unknown or not sources:
+        raise argparse.ArgumentTypeError(f"Unbekannte Zeitquelle: {', '.join(unknown) or '(leer)'} "
+                                         f"(möglich: {', '.join(SOURCES)})")
+    return sources
+
+
+def layout_template(text):
+    """argparse-Typ für --layout: prüft die Ablagevorlage und gibt sie als Text zurück (für Journal und Plan)."""
+    try:
+        return str(LayoutTemplate(text))
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def add_layout_options(sub):
+    """
+    Ablage im Ausgabeordner: Ordnerstruktur nachbilden (Standard), flach oder nach Vorlage.
+    Ohne Angabe bleibt 'layout' None, damit 'apply --plan' die Ablage des Plans übernehmen kann.
+    """
+    layout = sub.add_mutually_exclusive_group()
+    layout.add_argument("--flatten", dest="layout", action="store_const", const=LAYOUT_FLATTEN, default=None,
+                        help="Bei --recursive alle Dateien direkt in ZIEL ablegen statt die Ordnerstruktur nachzubilden")
+    layout.add_argument("--layout", dest="layout", type=layout_template, metavar="VORLAGE",
+                        help=f"Unterordner und Namen aus der Aufnahmezeit bilden, z.B. '{DEFAULT_TEMPLATE}' "
+                             f"(Felder: {', '.join(TEMPLATE_FIELDS)})")
+
+
+def add_naming_options(sub):
+    """Optionen für die neuen Namen: Zeitstempel und Videos (scan, apply und watch)."""
+    sub.add_argument("--time-source", type=time_sources, default=DEFAULT_PRECEDENCE, metavar="QUELLEN",
+                     help=f"Zeitquellen in absteigender Priorität, durch Komma getrennt "
+                          f"(möglich: {', '.join(SOURCES)}; Standard: {','.join(DEFAULT_PRECEDENCE)})")
+    sub.add_argument("--utc", dest="time_output", action="store_const", const=OUTPUT_UTC, default=OUTPUT_LOCAL,
+                     help="Zeitstempel in UTC statt in lokaler Zeit")
+    sub.add_argument("--milliseconds", action="store_true",
+                     help="Millisekunden aus dem PXL-Namen anhängen (vermeidet _N-Suffixe bei Serienaufnahmen)")
+    sub.add_argument("--tz", metavar="ZONE",
+                     help="Zeitzone für Dateien ohne EXIF-Versatz, z.B. Europe/Berlin (Standard: Systemzeitzone)")
+    sub.add_argument("--videos", action="store_true",
+                     help="Pixel-Videos (MP4/MOV) anhand der Erstellungszeit im Video mit umbenennen")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pixel-utc-renamer", description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_common(sub):
+        sub.add_argument("source", metavar="QUELLE", help="Quellordner mit den Pixel-Dateien")
+        sub.add_argument("--jobs", "-j", type=int, default=1, help="Anzahl paralleler Worker für die Analyse")
+        sub.add_argument("--mode", choices=(SCAN_THREAD, SCAN_PROCESS), default=SCAN_THREAD,
+                         help="Art der Parallelisierung bei --jobs > 1 (Standard: thread)")
+        sub.add_argument("--json", action="store_true", help="Eine JSON-Zeile pro Datei ausgeben")
+        sub.add_argument("--progress", action="store_true",
+                         help="Fortschritt mit Dateien/s, MB/s und Restzeit auf stderr anzeigen")
+        sub.add_argument("--no-cache", action="store_true", help="EXIF-Cache nicht verwenden")
+        sub.add_argument("--rebuild-cache", action="store_true", help="Alle Dateien neu lesen und den Cache ersetzen")
+        sub.add_argument("--recursive", "-r", action="store_true", help="Unterordner mit durchsuchen")
+        sub.add_argument("--include", action="append", metavar="MUSTER",
+                         help="Nur Dateien, die zum Glob-Muster passen (mehrfach möglich)")
+        sub.add_argument("--exclude", action="append", metavar="MUSTER",
+                         help="Dateien und Ordner, die zum Glob-Muster passen, überspringen (mehrfach möglich)")
+        sub.add_argument("--dedup", choices=(DUP_SKIP, DUP_LINK),
+                         help="Byte-gleiche Dateien (auch gegenüber ZIEL) erkennen und überspringen bzw. als Hardlink anlegen")
+        add_layout_options(sub)
+        sub.add_argument("--stats", metavar="DATEI",
+                         help="Laufstatistik (Zeit pro Schritt, gelesene Bytes, stat-Aufrufe, Dauer pro Datei, Fehler) "
+                              "am Ende als JSON in DATEI schreiben")
+        add_naming_options(sub)
+
+    scan = subparsers.add_parser("scan", help="Vorschau: neue Namen ermitteln, nichts verändern")
+    add_common(scan)
+    scan.add_argument("output", metavar="ZIEL", nargs="?", help="Ausgabeordner; wenn angegeben, werden die geplanten Zielnamen samt _N-Suffix angezeigt")
+    scan.add_argument("--plan-out", metavar="DATEI",
+                      help="Ergebnis als Plan (JSON Lines) speichern, um es später mit 'apply --plan' anzuwenden")
+
+    apply = subparsers.add_parser("apply", help="Dateien umbenannt kopieren oder verschieben")
+    add_common(apply)
+    apply.add_argument("output", metavar="ZIEL", help="Ausgabeordner")
+    transfer = apply.add_mutually_exclusive_group(required=True)
+    transfer.add_argument("--copy", action="store_true", help="Dateien kopieren")
+    transfer.add_argument("--move", action="store_true", help="Dateien verschieben")
+    apply.add_argument("--hardlink", action="store_true",
+                       help="Mit --copy Hardlinks statt Kopien anlegen, wenn QUELLE und ZIEL auf demselben Datenträger liegen")
+    apply.add_argument("--transfer-jobs", type=int, default=1, metavar="N",
+                       help="Anzahl gleichzeitiger Kopier-/Verschiebevorgänge (Standard: 1)")
+    apply.add_argument("--per-device", type=int, default=None, metavar="N",
+                       help="Höchstens N gleichzeitige Übertragungen je Datenträger (Standard: wie --transfer-jobs)")
+    apply.add_argument("--no-journal", action="store_true", help="Kein Journal schreiben (kein resume/undo möglich)")
+    apply.add_argument("--plan", metavar="DATEI",
+                       help="Gespeicherten Plan anwenden statt neu zu analysieren; Dateien, die sich seit dem Plan "
+                            "verändert haben, werden übersprungen")
+
+    watch = subparsers.add_parser("watch", help="Eingangsordner überwachen und neue Dateien laufend umbenennen")
+    watch.add_argument("source", metavar="QUELLE", help="Eingangsordner")
+    watch.add_argument("output", metavar="ZIEL", help="Ausgabeordner")
+    transfer = watch.add_mutually_exclusive_group(required=True)
+    transfer.add_argument("--copy", action="store_true", help="Dateien kopieren")
+    transfer.add_argument("--move", action="store_true", help="Dateien verschieben")
+    watch.add_argument("--hardlink", action="store_true",
+                       help="Mit --copy Hardlinks statt Kopien anlegen, wenn QUELLE und ZIEL auf demselben Datenträger liegen")
+    watch.add_argument("--recursive", "-r", action="store_true", help="Unterordner mit überwachen")
+    watch.add_argument("--include", action="append", metavar="MUSTER",
+                       help="Nur Dateien, die zum Glob-Muster passen (mehrfach möglich)")
+    watch.add_argument("--exclude", action="append", metavar="MUSTER",
+                       help="Dateien und Ordner, die zum Glob-Muster passen, überspringen (mehrfach möglich)")
+    add_layout_options(watch)
+    watch.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="SEK",
+                       help=f"Sekunden zwischen zwei Prüfungen (Standard: {DEFAULT_INTERVAL:g})")
+    watch.add_argument("--settle", type=float, default=DEFAULT_SETTLE, metavar="SEK",
+                       help=f"So lange muss eine Datei unverändert sein, bevor sie verarbeitet wird (Standard: {DEFAULT_SETTLE:g})")
+    watch.add_argument("--batch", type=int, default=DEFAULT_BATCH_SIZE, metavar="N",
+                       help=f"Höchstens N Dateien pro Stapel (Standard: {DEFAULT_BATCH_SIZE})")
+    watch.add_argument("--no-journal", action="store_true", help="Kein Journal schreiben (kein resume/undo möglich)")
+    watch.add_argument("--no-cache", action="store_true",
+                       help="EXIF-Cache nicht verwenden; verarbeitete Dateien werden über einen Neustart hinweg nicht gemerkt")
+    watch.add_argument("--json", action="store_true", help="Eine JSON-Zeile pro Datei ausgeben")
+    watch.add_argument("--stats", metavar="DATEI", help="Laufstatistik beim Beenden als JSON in DATEI schreiben")
+    add_naming_options(watch)
+
+    for name, help_text in (("resume", "Abgebrochenen Lauf fortsetzen, ohne neu zu analysieren"),
+                            ("undo", "Lauf rückgängig machen (Dateien zurückverschieben bzw. Kopien löschen)")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("journal", metavar="JOURNAL", nargs="?", help="Journal-Datei (Standard: das neueste)")
+        sub.add_argument("--json", action="store_true", help="Eine JSON-Zeile pro Datei ausgeben")
+    return parser
+
+
+def make_engine(args):
+    """Erzeugt die TimestampEngine gemäß den Optionen; gibt bei einer unbekannten Zeitzone None zurück."""
+    try:
+        return TimestampEngine(args.time_source, args.time_output, args.milliseconds, args.tz)
+    except ValueError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return None
+
+
+def warn_unreadable(rel_dir, error):
+    """Meldet einen nicht lesbaren Unterordner der Quelle auf stderr (siehe SourceWalker)."""
+    print(f"Hinweis: Ordner {rel_dir} konnte nicht gelesen werden: {error}", file=sys.stderr)
+
+
+def open_cache(args):
+    """Öffnet den EXIF-Cache gemäß den Optionen, oder gibt None zurück."""
+    if args.no_cache and not getattr(args, "rebuild_cache", False):
+        return None
+    try:
+        return ScanCache()
+    except (OSError, sqlite3.Error) as e:
+        print(f"Hinweis: EXIF-Cache konnte nicht geöffnet werden ({e}). Analyse ohne Cache.", file=sys.stderr)
+        return None
+
+
+def open_stats(args):
+    """Erzeugt die Laufstatistik, wenn --stats angegeben ist, sonst NULL_STATS."""
+    if not args.stats:
+        return NULL_STATS
+    stats = RunStats(args.command)
+    stats.info.update({key: value for key, value in vars(args).items()
+                       if key not in ("stats", "command") and isinstance(value, (str, int, float, bool))})
+    return stats
+
+
+def write_stats(args, stats):
+    """Schreibt die Laufstatistik nach --stats; ein Schreibfehler wird nur gemeldet."""
+    if not stats.enabled:
+        return
+    try:
+        stats.write_json(args.stats)
+    except OSError as e:
+        print(f"Hinweis: Statistik konnte nicht geschrieben werden ({e}).", file=sys.stderr)
+
+
+def emit(args, item, dest=None, strategy=None, error=None):
+    """Gibt die Ergebniszeile für eine Datei aus."""
+    status = item.status_key.replace("status_", "", 1)
+    if args.json:
+        record = {"file": item.original, "new": item.new, "status": status}
+        if item.planned is not None:
+            record["planned"] = item.planned
+        if item.duplicate_of is not None:
+            record["duplicate_of"] = item.duplicate_of
+        if dest is not None:
+            record["dest"] = dest
+        if strategy is not None:
+            record["strategy"] = strategy
+        if error is not None:
+            record["error"] = str(error)
+        print(json.dumps(record, ensure_ascii=False))
+    elif error is not None:
+        print(f"{item.original} -> {dest} [Fehler: {error}]")
+    elif dest is not None:
+        print(f"{item.original} -> {dest} [{status}, {strategy}]")
+    else:
+        print(f"{item.original} -> {item.target_name} [{status}]")
+
+
+def apply_plan_settings(args, header):
+    """
+    Übernimmt Ablage und Duplikat-Behandlung aus dem Kopf eines Plans, wenn sie auf der
+    Kommandozeile fehlen. Gibt eine Fehlermeldung zurück, wenn die Angaben dem Plan
+    widersprechen oder die Ablage des Plans ungültig ist, sonst None.
+    """
+    for name, option in (("layout", "--layout/--flatten"), ("dedup", "--dedup")):
+        planned = header.get(name) or (LAYOUT_MIRROR if name == "layout" else None)
+        given = getattr(args, name)
+        if given is None:
+            setattr(args, name, planned)
+        elif given != planned:
+            return (f"{option} {given} widerspricht dem Plan ({planned or 'ohne'}). Die Option weglassen, "
+                    f"um die Einstellung des Plans zu verwenden.")
+    if args.layout not in (LAYOUT_MIRROR, LAYOUT_FLATTEN):
+        try:
+            args.layout = str(LayoutTemplate(args.layout))
+        except ValueError as e:
+            return f"Ablage im Plan: {e}"
+    return None
+
+
+def run(args):
+    """Führt 'scan' oder 'apply' aus und gibt den Exit-Code zurück."""
+    if not os.path.isdir(args.source):
+        print(f"Fehler: Quellordner '{args.source}' existiert nicht.", file=sys.stderr)
+        return 2
+    applying = args.command == "apply"
+    if applying:
+        if not os.path.isdir(args.output):
+            print(f"Fehler: Ausgabeordner '{args.output}' existiert nicht.", file=sys.stderr)
+            return 2
+        if os.path.abspath(args.source) == os.path.abspath(args.output) and args.move:
+            print("Fehler: Quell- und Zielordner sind identisch. Bitte --copy oder einen anderen Ausgabeordner wählen.",
+                  file=sys.stderr)
+            return 2
+
+    engine = make_engine(args)
+    if engine is None:
+        return 2
+    plan_path = getattr(args, "plan", None)
+    if plan_path:
+        try:
+            header = read_plan_header(plan_path)
+        except (OSError, PlanFormatError) as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+            return 2
+        plan_files = header["files"]
+        error = apply_plan_settings(args, header)
+        if error is not None:
+            print(f"Fehler: {error}", file=sys.stderr)
+            return 2
+    elif args.layout is None:
+        args.layout = LAYOUT_MIRROR
+
+    source = os.path.abspath(args.source)
+    mode = args.mode if args.jobs > 1 else SCAN_SERIAL
+    counts = new_counts()
+    processed = failed = changed = 0
+    skip_dirs = [args.output] if args.output else []
+    walker = SourceWalker(source, args.recursive, args.include, args.exclude, skip_dirs, warn_unreadable)
+    cache = open_cache(args) if not plan_path else None
+    journal = None
+    if applying and not args.no_journal:
+        journal = Journal.create(source=source, output=os.path.abspath(args.output), copy=args.copy,
+                                 layout=args.layout, hardlink=args.hardlink, dedup=args.dedup, plan=plan_path)
+    reporter = ProgressReporter(console_sink()) if args.progress else None
+    link_duplicates = args.dedup == DUP_LINK
+    dedup = Deduplicator(source, args.output, cache, args.jobs) if args.dedup and not plan_path else None
+    stats = open_stats(args)
+    plan_writer = None
+    if getattr(args, "plan_out", None):
+        plan_writer = PlanWriter(args.plan_out, source, args.output, layout=args.layout, dedup=args.dedup,
+                                 time_output=args.time_output, time_source=list(args.time_source),
+                                 milliseconds=args.milliseconds, videos=args.videos)
+
+    def report_changed(item):
+        # Seit dem Plan veränderte Dateien werden nur gemeldet, nicht übertragen
+        nonlocal changed
+        changed += 1
+        counts["total"] += 1
+        count_result(counts, item.original)
+        item.status_key = "status_changed"
+        emit(args, item)
+        if reporter:
+            reporter.advance()
+
+    def scanned():
+        if plan_path:
+            items = unchanged_items(iter_plan(plan_path, source), source, report_changed, stats)
+        else:
+            items = stats.timed("scan", iter_scan(walker, mode, args.jobs, cache, args.rebuild_cache, engine,
+                                                  videos=args.videos, stats=stats))
+        if dedup is not None:
+            items = dedup.mark(items)
+        for item in items:
+            counts["total"] += 1
+            count_result(counts, item.original)
+            yield item
+
+    if applying:
+        results = process_items(scanned(), source, args.output, args.copy, args.layout, args.hardlink,
+                                args.transfer_jobs, args.per_device, link_duplicates, journal, stats=stats)
+    elif args.output and os.path.isdir(args.output):
+        # Vorschau mit den Zielnamen, die 'apply' im Ausgabeordner vergeben würde
+        planner = TransferPlanner(os.path.abspath(args.output), args.layout, create_dirs=False,
+                                  link_duplicates=link_duplicates, stats=stats)
+        results = ((planner.plan_preview(item), None, None, None) for item in scanned())
+    else:
+        results = ((item, None, None, None) for item in scanned())
+    finished = False
+    if reporter and plan_path:
+        reporter.set_total(plan_files)
+    try:
+        for item, dest, strategy, error in results:
+            emit(args, item, dest, strategy, error)
+            if plan_writer is not None:
+                plan_writer.write(item)
+            nbytes = 0
+            if dest is not None:
+                if error is None:
+                    processed += 1
+                    if dedup is not None:
+                        dedup.record(item, dest)
+                    if reporter:
+                        stats.count("stat_calls")
+                        nbytes = os.path.getsize(dest)
+                else:
+                    failed += 1
+            if reporter:
+                if walker.finished and not reporter.total:
+                    reporter.set_total(walker.found)
+                reporter.advance(nbytes=nbytes)
+        finished = True
+    finally:
+        results.close()
+        if plan_writer is not None:
+            # Ein abgebrochener Export hinterlässt keinen unvollständigen Plan
+            if finished:
+                plan_writer.close()
+            else:
+                plan_writer.discard()
+        if journal is not None:
+            journal.close()
+        if cache is not None:
+            cache.close()
+        if reporter:
+            if not plan_path:
+                reporter.set_total(walker.found)
+            reporter.finish()
+        write_stats(args, stats)
+
+    summary = ", ".join(f"{key}={value}" for key, value in counts.items())
+    if dedup is not None:
+        summary += f", duplikate={dedup.duplicates}"
+    if applying:
+        summary += f", verarbeitet={processed}, fehlgeschlagen={failed}"
+    if plan_path:
+        summary += f", verändert={changed}"
+    if plan_writer is not None:
+        summary += f", plan={args.plan_out}"
+    if journal is not None:
+        summary += f", journal={journal.path}"
+    if stats.enabled:
+        summary += f", statistik={args.stats}"
+    print(summary, file=sys.stderr)
+    return 1 if failed or changed else 0
+
+
+def run_journal(args):
+    """Führt 'resume' oder 'undo' für ein Journal aus und gibt den Exit-Code zurück."""
+    path = args.journal or latest_journal()
+    if path is None or not os.path.isfile(path):
+        print("Fehler: Kein Journal gefunden.", file=sys.stderr)
+        return 2
+    done = failed = 0
+    if args.command == "resume":
+        results = resume_run(path)
+    else:
+        results = ((plan, "undo", error) for plan, error in undo_run(path))
+    for plan, strategy, error in results:
+        if args.json:
+            record = {"file": plan["src"], "dest": plan["dst"]}
+            record.update({"error": str(error)} if error is not None else {"strategy": strategy})
+            print(json.dumps(record, ensure_ascii=False))
+        elif error is not None:
+            print(f"{plan['src']} -> {plan['dst']} [Fehler: {error}]")
+        else:
+            print(f"{plan['src']} -> {plan['dst']} [{strategy}]")
+        if error is None:
+            done += 1
+        else:
+            failed += 1
+    print(f"journal={path}, erledigt={done}, fehlgeschlagen={failed}", file=sys.stderr)
+    if args.command == "resume" and not load_state(path).scan_complete:
+        print("Hinweis: Der Lauf wurde vor dem Ende der Analyse abgebrochen. Noch nicht geplante Dateien "
+              "mit 'apply' übertragen (bei --copy mit --dedup skip, um Doppelte zu vermeiden).", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def run_watch(args):
+    """Führt 'watch' aus, bis es mit Strg+C beendet wird."""
+    for path, label in ((args.source, "Quellordner"), (args.output, "Ausgabeordner")):
+        if not os.path.isdir(path):
+            print(f"Fehler: {label} '{path}' existiert nicht.", file=sys.stderr)
+            return 2
+    engine = make_engine(args)
+    if engine is None:
+        return 2
+    if args.layout is None:
+        args.layout = LAYOUT_MIRROR
+    processed = failed = 0
+    stats = open_stats(args)
+    cache = open_cache(args)
+    print(f"Überwache {os.path.abspath(args.source)} (Beenden mit Strg+C)", file=sys.stderr)
+    try:
+        for item, dest, strategy, error in watch_folder(args.source, args.output, args.copy, args.layout,
+                                                         args.hardlink, args.recursive, args.include, args.exclude,
+                                                         args.interval, args.settle, args.batch, not args.no_journal,
+                                                         engine=engine, videos=args.videos, stats=stats,
+                                                         on_error=warn_unreadable, cache=cache):
+            emit(args, item, dest, strategy, error)
+            if dest is not None:
+                if error is None:
+                    processed += 1
+                else:
+                    failed += 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if cache is not None:
+            cache.close()
+    write_stats(args, stats)
+    print(f"verarbeitet={processed}, fehlgeschlagen={failed}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Jede Ergebniszeile sofort ausgeben, auch wenn stdout in eine Datei oder Pipe geht
+    sys.stdout.reconfigure(line_buffering=True)
+    if args.command in ("resume", "undo"):
+        return run_journal(args)
+    if args.command == "watch":
+        return run_watch(args)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
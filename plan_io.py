@@ -0,0 +1,213 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Speichern und Laden einer Vorschau als Plan.
+
+Ein Plan ist eine JSON-Lines-Datei: zuerst ein Kopf ("type": "plan") mit Quell- und
+Ausgabeordner und den Einstellungen, dann eine Zeile je Datei mit dem relativen
+Pfad, dem neuen Namen (er enthält den ermittelten Zeitstempel), dem Status, dem
+geplanten Zielnamen und für die umzubenennenden Dateien Größe und mtime_ns; zum
+Schluss ein "end"-Eintrag mit der Anzahl der Dateien. Geschrieben und gelesen wird
+zeilenweise, auch bei sehr vielen Dateien bleibt der Speicherbedarf daher klein.
+
+So kann ein Plan auf einem schnellen Rechner nahe am Speicher erstellt, geprüft und
+später an anderer Stelle angewendet werden. Vor jeder Übertragung wird dann nur per
+stat geprüft, ob die Datei seit dem Plan unverändert ist (unchanged_items); die
+Zielnamen werden wie sonst auch gegen den aktuellen Ausgabeordner vergeben.
+"""
+
+import json
+import os
+import time
+
+from instrumentation import NULL_STATS
+from scan_results import ScanItem
+
+PLAN_TYPE = "plan"
+PLAN_VERSION = 1
+# Status, deren Dateien übertragen werden können und daher mit Größe und mtime gespeichert werden
+TRANSFER_STATUS_KEYS = ("status_ok", "status_duplicate")
+# So viele Bytes am Dateiende werden nach dem "end"-Eintrag durchsucht
+TAIL_SIZE = 4096
+
+
+class PlanFormatError(ValueError):
+    """Die Datei ist kein (vollständiger) Plan."""
+
+
+class PlanWriter:
+    """
+    Schreibt einen Plan zeilenweise in eine temporäre Datei, die erst beim
+    erfolgreichen Schließen an ihren Platz verschoben wird. Ein abgebrochener Export
+    hinterlässt daher keinen unvollständigen Plan.
+    """
+
+    def __init__(self, path, source, output=None, **settings):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        self.file = open(self._tmp_path, "w", encoding="utf-8")
+        self._write({"type": PLAN_TYPE, "version": PLAN_VERSION, "created": time.time(), "source": self.source,
+                     "output": os.path.abspath(output) if output else None, **settings})
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def write(self, item):
+        """
+        Schreibt einen Eintrag. Für umzubenennende Dateien werden Größe und mtime_ns
+        ermittelt; ist die Datei nicht mehr lesbar, wird sie als Lesefehler gespeichert.
+        """
+        status_key = item.status_key
+        record = {"file": item.original, "new": item.new, "status": status_key.replace("status_", "", 1)}
+        if status_key in TRANSFER_STATUS_KEYS:
+            try:
+                stat = os.stat(os.path.join(self.source, item.original))
+            except OSError:
+                record["status"] = "read_error"
+            else:
+                record["size"] = stat.st_size
+                record["mtime_ns"] = stat.st_mtime_ns
+        if item.planned is not None:
+            record["planned"] = item.planned
+        if item.duplicate_of is not None:
+            # Originale im Quellordner relativ speichern, damit der Plan auch unter anderem Pfad passt
+            duplicate_of = item.duplicate_of
+            if os.path.commonpath([duplicate_of, self.source]) == self.source:
+                duplicate_of = {"file": os.path.relpath(duplicate_of, self.source)}
+            record["duplicate_of"] = duplicate_of
+        if item.digest is not None:
+            record["digest"] = item.digest
+        self._write(record)
+        self.count += 1
+
+    def close(self):
+        """Schließt den Plan mit dem "end"-Eintrag ab und legt ihn unter seinem Namen ab."""
+        self._write({"type": "end", "files": self.count})
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def discard(self):
+        """Verwirft einen nicht abgeschlossenen Plan."""
+        self.file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_plan(path, items, source, output=None, **settings):
+    """Schreibt alle Einträge als Plan und gibt ihre Anzahl zurück."""
+    with PlanWriter(path, source, output, **settings) as writer:
+        for item in items:
+            writer.write(item)
+    return writer.count
+
+
+def read_plan_header(path):
+    """
+    Liest den Kopf eines Plans und prüft, ob er vollständig ist (mit "end"-Eintrag).
+    Wirft PlanFormatError, wenn nicht; OSError wird unverändert weitergereicht.
+    """
+    with open(path, "rb") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            header = None
+        if not isinstance(header, dict) or header.get("type") != PLAN_TYPE:
+            raise PlanFormatError(f"Keine Plan-Datei: {path}")
+        if header.get("version", 0) > PLAN_VERSION:
+            raise PlanFormatError(f"Plan-Version {header['version']} wird nicht unterstützt")
+        size = f.seek(0, 2)
+        f.seek(max(0, size - TAIL_SIZE))
+        lines = f.read().splitlines()
+    try:
+        end = json.loads(lines[-1]) if lines else None
+    except ValueError:
+        end = None
+    if not isinstance(end, dict) or end.get("type") != "end":
+        raise PlanFormatError(f"Plan ist unvollständig: {path}")
+    header["files"] = end.get("files")
+    return header
+
+
+def iter_plan(path, source=None):
+    """
+    Liefert die Einträge eines Plans als ScanItem (mit 'stat_key' für umzubenennende
+    Dateien). 'source' ersetzt den Quellordner aus dem Kopf, z.B. wenn der Plan auf
+    einem anderen Rechner angewendet wird; er wird nur für Duplikate gebraucht.
+    """
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        source = source or header["source"]
+        for line in f:
+            record = json.loads(line)
+            if record.get("type") == "end":
+                return
+            item = ScanItem(record["file"], record["new"], "status_" + record["status"])
+            if "size" in record:
+                item.stat_key = (record["size"], record["mtime_ns"])
+            item.planned = record.get("planned")
+            duplicate_of = record.get("duplicate_of")
+            if isinstance(duplicate_of, dict):
+                duplicate_of = os.path.join(source, duplicate_of["file"])
+            item.duplicate_of = duplicate_of
+            item.digest = record.get("digest")
+            yield item
+    raise PlanFormatError(f"Plan ist unvollständig: {path}")
+
+
+def unchanged_items(items, source_path, on_changed=None, stats=NULL_STATS):
+    """
+    Reicht die Einträge durch, deren Quelldatei seit dem Plan unverändert ist (gleiche
+    Größe und mtime_ns). Einträge ohne 'stat_key' (nicht aus einem Plan, oder nicht zum
+    Umbenennen) werden ungeprüft durchgereicht. Veränderte oder fehlende Dateien werden
+    ausgelassen und an on_changed(Eintrag) gemeldet.
+    """
+    for item in items:
+        if item.stat_key is not None:
+            stats.count("stat_calls")
+            try:
+                stat = os.stat(os.path.join(source_path, item.original))
+                unchanged = (stat.st_size, stat.st_mtime_ns) == item.stat_key
+            except OSError:
+                unchanged = False
+            if not unchanged:
+                stats.count("plan_changed")
+                if on_changed is not None:
+                    on_changed(item)
+                continue
+        yield item
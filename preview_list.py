@@ -0,0 +1,168 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Virtualisierte Vorschau-Liste für den Pixel Photo Renamer.
+
+Anders als eine Tk-Listbox hält dieses Widget die Daten ausschließlich in Python und
+zeichnet nur die Zeilen, die gerade im sichtbaren Bereich liegen, auf ein Canvas.
+Dadurch bleiben Scrollen, Filtern, Sortieren und der Sprachwechsel auch bei
+100.000+ Einträgen flüssig, und Tcl muss keine Kopie der Liste vorhalten.
+"""
+
+from tkinter import Canvas, Scrollbar
+from tkinter.font import Font
+from tkinter.ttk import Frame
+
+
+class VirtualListView(Frame):
+    """
+    Liste mit virtuellem Scrollen. Die Einträge werden über 'formatter' (Eintrag -> Text)
+    und 'colorizer' (Eintrag -> Farbe) dargestellt. Über set_filter und set_sort wird
+    eine Ansicht (Folge von Indizes) auf die Daten festgelegt; die Daten selbst werden
+    dabei nicht kopiert. 'items' ist eine Liste oder ein anderes Objekt mit len() und
+    Indexzugriff, z.B. ScanResults.
+    """
+
+    def __init__(self, master, formatter, colorizer, bg="#3C3C3C", font=('Consolas', 10), **kwargs):
+        super().__init__(master, **kwargs)
+        self.formatter = formatter
+        self.colorizer = colorizer
+        self.font = Font(font=font)
+        self.row_height = self.font.metrics("linespace") + 2
+
+        self.items = []          # Referenz auf die Daten (wird nicht kopiert)
+        self.view = []           # Indizes der sichtbaren (gefilterten, sortierten) Einträge
+        self.subset = None       # Funktion, die die Indizes der gefilterten Einträge liefert, oder None für "alle"
+        self.sort_key = None     # Eintrag -> Sortierschlüssel, oder None für Originalreihenfolge
+        self.top = 0             # Index (in self.view) der obersten sichtbaren Zeile
+        self.text_ids = []       # Wiederverwendete Canvas-Textobjekte, eines pro sichtbarer Zeile
+
+        self.canvas = Canvas(self, bg=bg, borderwidth=0, highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar = Scrollbar(self, orient="vertical", command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda event: self.redraw())
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.yview("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.yview("scroll", 3, "units"))
+        # Damit das Mausrad unter Windows auch ohne vorherigen Klick funktioniert
+        self.canvas.bind("<Enter>", lambda event: self.canvas.focus_set())
+
+    # --------------------------------------------------------------------------
+    # Daten und Ansicht
+    # --------------------------------------------------------------------------
+    def set_items(self, items):
+        """Setzt die Datenliste (als Referenz) und springt an den Anfang."""
+        self.items = items
+        self.top = 0
+        self.refresh()
+
+    def set_filter(self, subset):
+        """
+        Zeigt nur die Einträge, deren Indizes 'subset()' liefert (None = alle). Eine vorab
+        geführte, mitwachsende Indexliste (z.B. ScanResults.indices) wird dabei nicht
+        kopiert, sodass das Aktualisieren nicht erneut über alle Einträge läuft.
+        """
+        self.subset = subset
+        self.top = 0
+        self.refresh()
+
+    def set_sort(self, sort_key):
+        """Sortiert die Ansicht nach 'sort_key' (None = Reihenfolge der Daten)."""
+        self.sort_key = sort_key
+        self.refresh()
+
+    def clear(self):
+        """Leert die Liste."""
+        self.set_items([])
+
+    def refresh(self):
+        """Berechnet die Ansicht neu, z.B. nachdem Einträge hinzugefügt wurden, und zeichnet neu."""
+        items = self.items
+        if self.subset is None:
+            view = range(len(items))
+        else:
+            view = self.subset()
+        if self.sort_key is not None:
+            sort_key = self.sort_key
+            view = sorted(view, key=lambda i: sort_key(items[i]))
+        self.view = view
+        self.redraw()
+
+    def __len__(self):
+        return len(self.view)
+
+    # --------------------------------------------------------------------------
+    # Zeichnen und Scrollen
+    # --------------------------------------------------------------------------
+    def visible_rows(self):
+        """Anzahl der Zeilen, die in die aktuelle Höhe des Canvas passen."""
+        return max(1, self.canvas.winfo_height() // self.row_height)
+
+    def redraw(self):
+        """Zeichnet nur die sichtbaren Zeilen neu; Textobjekte werden wiederverwendet."""
+        rows = self.visible_rows()
+        total = len(self.view)
+        self.top = max(0, min(self.top, total - rows))
+
+        # Legt bei Bedarf zusätzliche Textobjekte an (z.B. nach Vergrößern des Fensters)
+        while len(self.text_ids) < rows + 1:
+            y = len(self.text_ids) * self.row_height + 1
+            self.text_ids.append(self.canvas.create_text(4, y, anchor="nw", font=self.font, text=""))
+
+        for row, text_id in enumerate(self.text_ids):
+            index = self.top + row
+            if index < total:
+                item = self.items[self.view[index]]
+                self.canvas.itemconfigure(text_id, text=self.formatter(item), fill=self.colorizer(item))
+            else:
+                self.canvas.itemconfigure(text_id, text="")
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):
+        """Scrollbar-Protokoll von Tk: ('moveto', Anteil) oder ('scroll', n, 'units'/'pages')."""
+        if not args:
+            return
+        rows = self.visible_rows()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.top += step * rows if args[2] == "pages" else step
+        self.redraw()
+
+    def _on_mousewheel(self, event):
+        """Mausrad unter Windows und macOS (event.delta) auswerten."""
+        if abs(event.delta) >= 120:
+            # Windows: Vielfache von 120 pro Raststufe
+            self.yview("scroll", -3 * int(event.delta / 120), "units")
+        elif event.delta:
+            # macOS: kleine Werte, direkt als Zeilen verwenden
+            self.yview("scroll", -event.delta, "units")
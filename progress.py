@@ -0,0 +1,162 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Gedrosselte Fortschrittsanzeige für Analyse und Umbenennung.
+
+Der ProgressReporter zählt verarbeitete Dateien und Bytes und meldet den Stand nur
+in festen Zeitabständen (standardmäßig höchstens 20-mal pro Sekunde) an eine
+Ausgabefunktion ('sink'). So entsteht auch bei 100.000 Dateien nur eine Handvoll
+Aktualisierungen pro Sekunde, egal ob die Ausgabe in eine Tk-Oberfläche oder auf
+die Konsole geht. Das Modul importiert kein tkinter.
+"""
+
+import sys
+import time
+from collections import namedtuple
+
+# Mindestabstand zwischen zwei Meldungen in Sekunden (20 Hz)
+DEFAULT_INTERVAL = 0.05
+# Gewicht der neuesten Messung bei der Glättung der Raten (exponentieller Mittelwert)
+RATE_SMOOTHING = 0.3
+
+ProgressSnapshot = namedtuple(
+    "ProgressSnapshot",
+    "done total bytes_done elapsed files_per_sec bytes_per_sec eta finished",
+)
+ProgressSnapshot.__doc__ = """
+Stand des Fortschritts. 'total' ist 0, solange die Gesamtzahl unbekannt ist;
+'eta' (Restzeit in Sekunden) ist dann None.
+"""
+
+
+def snapshot_percent(snapshot):
+    """Fortschritt in Prozent, oder None wenn die Gesamtzahl unbekannt ist."""
+    if not snapshot.total:
+        return None
+    return min(100.0, snapshot.done / snapshot.total * 100)
+
+
+class ProgressReporter:
+    """
+    Sammelt Fortschrittsmeldungen und gibt sie gedrosselt an 'sink' weiter.
+    Ein Reporter wird von genau einem Thread benutzt (dem, der die Arbeit erledigt);
+    'sink' wird in diesem Thread aufgerufen.
+    """
+
+    def __init__(self, sink, total=0, min_interval=DEFAULT_INTERVAL, clock=time.monotonic):
+        self.sink = sink
+        self.total = total
+        self.min_interval = min_interval
+        self.clock = clock
+        self.done = 0
+        self.bytes_done = 0
+        self.start = clock()
+        self._last_emit = self.start
+        self._last_done = 0
+        self._last_bytes = 0
+        self._files_per_sec = 0.0
+        self._bytes_per_sec = 0.0
+
+    def set_total(self, total):
+        """Setzt die Gesamtzahl, z.B. sobald der Verzeichnisdurchlauf beendet ist."""
+        self.total = total
+
+    def advance(self, files=1, nbytes=0):
+        """Zählt verarbeitete Dateien und Bytes; meldet den Stand, wenn das Intervall um ist."""
+        self.done += files
+        self.bytes_done += nbytes
+        now = self.clock()
+        if now - self._last_emit >= self.min_interval:
+            self._emit(now, finished=False)
+
+    def finish(self):
+        """Meldet den Endstand, unabhängig vom Intervall."""
+        self._emit(self.clock(), finished=True)
+
+    def _emit(self, now, finished):
+        interval = now - self._last_emit
+        if interval > 0:
+            # Momentane Raten seit der letzten Meldung, geglättet gegen Sprünge
+            files_rate = (self.done - self._last_done) / interval
+            bytes_rate = (self.bytes_done - self._last_bytes) / interval
+            if self._last_done == 0 and self._last_bytes == 0:
+                self._files_per_sec, self._bytes_per_sec = files_rate, bytes_rate
+            else:
+                self._files_per_sec += RATE_SMOOTHING * (files_rate - self._files_per_sec)
+                self._bytes_per_sec += RATE_SMOOTHING * (bytes_rate - self._bytes_per_sec)
+        self._last_emit, self._last_done, self._last_bytes = now, self.done, self.bytes_done
+        self.sink(self.snapshot(now, finished))
+
+    def snapshot(self, now=None, finished=False):
+        """Erzeugt einen ProgressSnapshot des aktuellen Stands."""
+        now = self.clock() if now is None else now
+        eta = None
+        if self.total and self._files_per_sec > 0:
+            eta = max(0.0, (self.total - self.done) / self._files_per_sec)
+        return ProgressSnapshot(self.done, self.total, self.bytes_done, now - self.start,
+                                self._files_per_sec, self._bytes_per_sec, eta, finished)
+
+
+def format_duration(seconds):
+    """Formatiert eine Dauer in Sekunden als H:MM:SS."""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def format_rates(snapshot, texts):
+    """
+    Formatiert Raten und Restzeit eines Snapshots. 'texts' enthält die Vorlagen
+    "progress_files_per_sec", "progress_mb_per_sec" und "progress_eta" (siehe CONSOLE_TEXTS).
+    """
+    parts = [texts["progress_files_per_sec"].format(rate=snapshot.files_per_sec)]
+    if snapshot.bytes_done:
+        parts.append(texts["progress_mb_per_sec"].format(rate=snapshot.bytes_per_sec / 1e6))
+    if snapshot.eta is not None and not snapshot.finished:
+        parts.append(texts["progress_eta"].format(eta=format_duration(snapshot.eta)))
+    return ", ".join(parts)
+
+
+# Texte für die Ausgabe auf der Konsole
+CONSOLE_TEXTS = {
+    "progress_files_per_sec": "{rate:.0f} Dateien/s",
+    "progress_mb_per_sec": "{rate:.1f} MB/s",
+    "progress_eta": "noch {eta}",
+}
+
+
+def console_sink(stream=None):
+    """
+    Gibt eine Ausgabefunktion für den ProgressReporter zurück, die den Fortschritt in
+    einer Zeile auf stderr (bzw. 'stream') aktualisiert, z.B. für die Kommandozeile.
+    """
+    stream = stream or sys.stderr
+
+    def sink(snapshot):
+        total = f"/{snapshot.total}" if snapshot.total else ""
+        line = f"{snapshot.done}{total} Dateien, {format_rates(snapshot, CONSOLE_TEXTS)}"
+        stream.write(f"\r{line:<78}" + ("\n" if snapshot.finished else ""))
+        stream.flush()
+
+    return sink
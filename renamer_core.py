@@ -0,0 +1,825 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+GUI-freier Kern des Pixel Photo Renamers.
+
+Enthält die Analyse der Dateien (neuer Name und Status), den parallelen Scan und das
+Kopieren/Verschieben der Dateien. Das Modul importiert kein tkinter und kann daher
+sowohl von der GUI (photo_renamer_gui.py) als auch von der Kommandozeile
+(pixel_utc_renamer.py) verwendet werden.
+"""
+
+import fnmatch
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+
+from classify import MP4_EXTENSIONS, classify_name, count_kind, file_extension, new_counts
+from exif_reader import load_exif_dates, NO_EXIF_DATES
+from instrumentation import NULL_STATS
+from journal import PLAN_BATCH_SIZE
+from mp4_reader import read_video_dates
+from output_layout import LayoutTemplate
+from scan_results import ScanItem
+from timestamps import DEFAULT_ENGINE
+from transfer import transfer_file, MOVE_SUFFIX
+
+# Analyse-Modi für die Vorschau
+SCAN_SERIAL = "serial"    # Eine Datei nach der anderen im Hintergrund-Thread
+SCAN_THREAD = "thread"    # Thread-Pool, sinnvoll bei langsamen Datenträgern (NAS, SSD)
+SCAN_PROCESS = "process"  # Prozess-Pool, sinnvoll wenn das Parsen der EXIF-Daten die CPU auslastet
+
+# Anzahl der Dateien, die bei Prozess-Pools gebündelt an einen Worker gehen,
+# damit sich der Aufwand für die Übergabe zwischen Prozessen lohnt
+PROCESS_CHUNK_SIZE = 64
+
+# Ablage der umbenannten Dateien bei rekursiver Suche
+LAYOUT_MIRROR = "mirror"    # Ordnerstruktur der Quelle im Ausgabeordner nachbilden
+LAYOUT_FLATTEN = "flatten"  # Alle Dateien direkt in den Ausgabeordner legen
+
+
+# ==============================================================================
+# Dateianalyse
+# Funktionen auf Modulebene, damit sie auch in einem Prozess-Pool laufen können.
+# Die Einordnung allein nach dem Dateinamen steht in classify.py.
+# ==============================================================================
+def build_new_filename(filename, exif_dates, engine=DEFAULT_ENGINE, info=None):
+    """
+    Berechnet aus den ausgelesenen EXIF-Daten den neuen Dateinamen und den Status.
+    'exif_dates' ist None, wenn die Datei nicht gelesen werden konnte; die Zeit kann
+    dann je nach Einstellung der TimestampEngine noch aus dem PXL-Namen kommen.
+    'info' ist das NameInfo aus classify_name, falls schon vorhanden.
+    """
+    timestamp, status_key = engine.timestamp(filename, exif_dates or NO_EXIF_DATES)
+    if timestamp is None:
+        return filename, "status_read_error" if exif_dates is None else status_key
+    info = info or classify_name(filename, videos=True)
+    
+    # Baut den neuen Dateinamen aus Zeitstempel, Suffix (z.B. .NIGHT, .RAW-01) und Endung zusammen
+    new_name = f"{timestamp}{info.suffix}{info.ext}"
+    
+    # Prüft, ob der Name bereits korrekt ist
+    return (filename, "status_already_correct") if new_name.lower() == filename.lower() else (new_name, "status_ok")
+
+
+def read_exif_dates_safe(original_path, io_stats=None):
+    """
+    Liest die EXIF-Datumsangaben einer Datei; gibt bei Lesefehlern None zurück.
+    'io_stats' wird an den Leser weitergegeben (gelesene Bytes, siehe exif_reader.py).
+    """
+    try:
+        if file_extension(original_path) in MP4_EXTENSIONS:
+            # Videos: Erstellungszeit aus der moov/mvhd-Box
+            return read_video_dates(original_path, io_stats)
+        # Liest nur die Aufnahmezeit aus dem Dateikopf (piexif nur als Rückfall)
+        return load_exif_dates(original_path, io_stats)
+    except Exception:
+        # Fängt alle Fehler beim Lesen der Datei ab
+        return None
+
+
+def get_new_filename(original_path, engine=DEFAULT_ENGINE, videos=False):
+    """
+    Ermittelt den neuen Dateinamen und den Status für eine einzelne Datei.
+    Dies ist die Kernlogik des Programms. Mit 'videos' werden auch Pixel-Videos umbenannt.
+    """
+    filename = os.path.basename(original_path)
+    info = classify_name(filename, videos)
+    if info.status_key:
+        return filename, info.status_key
+    if not engine.needs_exif(filename):
+        return build_new_filename(filename, NO_EXIF_DATES, engine, info)
+    return build_new_filename(filename, read_exif_dates_safe(original_path), engine, info)
+
+
+def _measure_read(path):
+    """Wie read_exif_dates_safe, liefert aber (EXIF-Daten, Dauer in Sekunden, io_stats) für die Statistik."""
+    io_stats = {"bytes_read": 0}
+    start = time.perf_counter()
+    exif_dates = read_exif_dates_safe(path, io_stats)
+    return exif_dates, time.perf_counter() - start, io_stats
+
+
+def _record_read(stats, measured):
+    """Überträgt das Ergebnis von _measure_read in die Statistik und gibt die EXIF-Daten zurück."""
+    exif_dates, seconds, io_stats = measured
+    stats.observe("exif_read", seconds)
+    stats.count("exif_reads")
+    for key, value in io_stats.items():
+        stats.count("exif_" + key, value)
+    return exif_dates
+
+
+def _read_exif_dates_chunk(paths, measure=False):
+    """
+    Liest die EXIF-Daten eines Blocks von Dateien in einem Worker (für den Prozess-Pool).
+    Mit 'measure' wird für jede Datei das Ergebnis von _measure_read geliefert.
+    """
+    if measure:
+        return [_measure_read(path) for path in paths]
+    return [read_exif_dates_safe(path) for path in paths]
+
+
+def default_workers(mode):
+    """Sinnvolle Standardanzahl an Workern für den jeweiligen Analyse-Modus."""
+    cpus = os.cpu_count() or 1
+    if mode == SCAN_PROCESS:
+        return cpus
+    if mode == SCAN_THREAD:
+        return min(32, cpus + 4)
+    return 1
+
+
+class _ScanSlot:
+    """Platzhalter für das Ergebnis einer Datei, solange ihre Analyse noch läuft."""
+    __slots__ = ("path", "filename", "info", "stat_key", "result", "exif_dates", "future", "index")
+
+    def __init__(self, path, info):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.info = info       # NameInfo aus classify_name
+        self.stat_key = None   # (Größe, mtime_ns) für den Cache
+        self.result = None     # Fertiges Ergebnis (neuer Name, Status)
+        self.exif_dates = None
+        self.future = None     # Future des Blocks, in dem die Datei gelesen wird
+        self.index = 0         # Position der Datei innerhalb dieses Blocks
+
+
+def scan_files(paths, mode=SCAN_SERIAL, workers=None, cache=None, refresh_cache=False, engine=DEFAULT_ENGINE,
+               videos=False, stats=NULL_STATS):
+    """
+    Wendet get_new_filename auf alle Pfade an und liefert die Ergebnisse (neuer Name,
+    Status) als Generator, immer in der Reihenfolge der Eingabe. Siehe scan_classified.
+    Mit 'videos' werden auch Pixel-Videos analysiert statt übersprungen.
+    """
+    entries = ((path, classify_name(os.path.basename(path), videos)) for path in paths)
+    return scan_classified(entries, mode, workers, cache, refresh_cache, engine, stats)
+
+
+def scan_classified(entries, mode=SCAN_SERIAL, workers=None, cache=None, refresh_cache=False,
+                    engine=DEFAULT_ENGINE, stats=NULL_STATS):
+    """
+    Analysiert bereits nach Namen eingeordnete Dateien ((Pfad, NameInfo)-Paare) und
+    liefert die Ergebnisse in der Reihenfolge der Eingabe. Nur Kandidaten (NameInfo ohne
+    Status) werden geöffnet. Im Thread- und Prozess-Modus sind höchstens
+    einige Blöcke pro Worker gleichzeitig unterwegs, damit der Speicherbedarf auch bei
+    sehr vielen Dateien begrenzt bleibt.
+
+    Ist ein ScanCache angegeben, werden unveränderte Dateien (gleiche Größe und mtime)
+    nicht erneut gelesen. Mit 'refresh_cache' werden alle Dateien neu gelesen und die
+    Einträge im Cache überschrieben. Die Aufnahmezeit berechnet 'engine'
+    (TimestampEngine); Dateien, für die sie keine EXIF-Daten braucht, werden nicht gelesen.
+
+    In 'stats' (RunStats, siehe instrumentation.py) landen der Status jeder Datei, die
+    Lesedauer und die gelesenen Bytes pro geöffneter Datei sowie die stat-Aufrufe des Caches.
+    """
+    workers = workers or default_workers(mode)
+    measure = stats.enabled
+    if mode == SCAN_SERIAL or workers <= 1:
+        executor, chunk_size = None, 1
+    elif mode == SCAN_PROCESS:
+        executor, chunk_size = ProcessPoolExecutor(max_workers=workers), PROCESS_CHUNK_SIZE
+    else:
+        executor, chunk_size = ThreadPoolExecutor(max_workers=workers), 1
+    window = workers * 4 * chunk_size
+
+    pending = deque()
+    chunk = []
+
+    def submit_chunk():
+        future = executor.submit(_read_exif_dates_chunk, [slot.path for slot in chunk], measure)
+        for index, slot in enumerate(chunk):
+            slot.future, slot.index = future, index
+        chunk.clear()
+
+    def finish(slot):
+        if slot.result is None:
+            if slot.future is None and executor is not None:
+                # Die Datei liegt noch im nicht abgeschickten Block
+                submit_chunk()
+            if slot.future is not None:
+                slot.exif_dates = slot.future.result()[slot.index]
+                if measure:
+                    slot.exif_dates = _record_read(stats, slot.exif_dates)
+            slot.result = build_new_filename(slot.filename, slot.exif_dates, engine, slot.info)
+            if slot.exif_dates is not None:
+                if cache is not None and slot.stat_key is not None:
+                    cache.put(slot.path, *slot.stat_key, slot.exif_dates)
+        stats.status(slot.result[1])
+        return slot.result
+
+    try:
+        for path, info in entries:
+            slot = _ScanSlot(path, info)
+            pending.append(slot)
+            if info.status_key:
+                slot.result = (slot.filename, info.status_key)
+            elif not engine.needs_exif(slot.filename):
+                slot.result = build_new_filename(slot.filename, NO_EXIF_DATES, engine, info)
+            elif cache is None or _lookup_cache(slot, cache, refresh_cache, engine, stats):
+                if executor is None:
+                    if measure:
+                        slot.exif_dates = _record_read(stats, _measure_read(path))
+                    else:
+                        slot.exif_dates = read_exif_dates_safe(path)
+                else:
+                    chunk.append(slot)
+                    if len(chunk) >= chunk_size:
+                        submit_chunk()
+            # Gibt fertige Ergebnisse weiter, sobald genug Arbeit in der Warteschlange ist
+            while pending and (executor is None or len(pending) > window or pending[0].result is not None):
+                yield finish(pending.popleft())
+        while pending:
+            yield finish(pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _lookup_cache(slot, cache, refresh_cache, engine, stats=NULL_STATS):
+    """
+    Ermittelt den Cache-Schlüssel einer Datei und übernimmt bei einem Treffer das
+    gespeicherte Ergebnis. Gibt True zurück, wenn die Datei gelesen werden muss.
+    """
+    stats.count("stat_calls")
+    try:
+        stat = os.stat(slot.path)
+    except OSError:
+        slot.result = (slot.filename, "status_read_error")
+        return False
+    slot.stat_key = (stat.st_size, stat.st_mtime_ns)
+    if not refresh_cache:
+        exif_dates = cache.get(slot.path, *slot.stat_key)
+        if exif_dates is not None:
+            stats.count("cache_hits")
+            slot.result = build_new_filename(slot.filename, exif_dates, engine, slot.info)
+            return False
+    return True
+
+
+# ==============================================================================
+# Ordnerinhalt und Zusammenfassung
+# ==============================================================================
+def parse_patterns(text):
+    """Zerlegt eine durch Komma oder Semikolon getrennte Liste von Glob-Mustern."""
+    if not text:
+        return []
+    return [p.strip() for p in re.split(r"[,;]", text) if p.strip()]
+
+
+def compile_patterns(patterns):
+    """
+    Übersetzt Glob-Muster (z.B. '*.jpg', '2023/*') in einen einzigen regulären Ausdruck.
+    Groß-/Kleinschreibung wird ignoriert. Gibt None zurück, wenn keine Muster angegeben sind.
+    """
+    if not patterns:
+        return None
+    return re.compile("|".join(fnmatch.translate(p.replace(os.sep, "/")) for p in patterns), re.IGNORECASE)
+
+
+class SourceWalker:
+    """
+    Durchläuft den Quellordner mit os.scandir und liefert die relativen Pfade aller
+    Dateien, sobald sie gefunden werden. Die Typinformation der DirEntry-Objekte wird
+    wiederverwendet, sodass pro Eintrag kein zusätzlicher stat-Aufruf nötig ist.
+
+    Muster aus 'include'/'exclude' werden sowohl mit dem Dateinamen als auch mit dem
+    relativen Pfad (mit '/' als Trenner) verglichen. Passende Unterordner werden bei
+    'exclude' komplett übersprungen, ebenso die Ordner in 'skip_dirs' (z.B. der
+    Ausgabeordner, wenn er innerhalb des Quellordners liegt).
+
+    Nicht lesbare Unterordner werden übersprungen und on_error(relativer Ordner,
+    Fehler) gemeldet, damit der Aufrufer entscheidet, wie er den Hinweis anzeigt. Ist
+    der Quellordner selbst nicht lesbar, wird der Fehler weitergereicht.
+    """
+
+    def __init__(self, source_path, recursive=False, include=None, exclude=None, skip_dirs=(), on_error=None):
+        self.source_path = os.path.abspath(source_path)
+        self.recursive = recursive
+        self.include = compile_patterns(include)
+        self.exclude = compile_patterns(exclude)
+        self.skip_dirs = {os.path.normcase(os.path.abspath(d)) for d in skip_dirs}
+        self.on_error = on_error
+        self.found = 0          # Anzahl der bisher gefundenen Dateien
+        self.finished = False   # True, sobald der ganze Ordnerbaum durchlaufen ist
+
+    def _matches(self, regex, name, rel_path):
+        return regex.match(name) or regex.match(rel_path.replace(os.sep, "/"))
+
+    def __iter__(self):
+        return (rel_path for rel_path, _ in self.entries())
+
+    def entries(self):
+        """
+        Wie der Durchlauf selbst, liefert aber (relativer Pfad, DirEntry), damit Aufrufer
+        Größe und Änderungszeit über entry.stat() lesen können (unter Windows ohne
+        zusätzlichen Systemaufruf, sonst höchstens einer pro Datei).
+        """
+        self.found = 0
+        self.finished = False
+        pending_dirs = [""]
+        while pending_dirs:
+            rel_dir = pending_dirs.pop()
+            subdirs = []
+            try:
+                with os.scandir(os.path.join(self.source_path, rel_dir)) as entries:
+                    for entry in entries:
+                        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                        if entry.is_file():
+                            if self.include and not self._matches(self.include, entry.name, rel_path):
+                                continue
+                            if self.exclude and self._matches(self.exclude, entry.name, rel_path):
+                                continue
+                            self.found += 1
+                            yield rel_path, entry
+                        elif self.recursive and entry.is_dir(follow_symlinks=False):
+                            if self.exclude and self._matches(self.exclude, entry.name, rel_path):
+                                continue
+                            if os.path.normcase(entry.path) in self.skip_dirs:
+                                continue
+                            subdirs.append(rel_path)
+            except OSError as e:
+                if not rel_dir:
+                    raise
+                # Nicht lesbare Unterordner werden übersprungen
+                if self.on_error is not None:
+                    self.on_error(rel_dir, e)
+            # Unterordner in der gefundenen Reihenfolge abarbeiten
+            pending_dirs.extend(reversed(subdirs))
+        self.finished = True
+
+
+def count_result(counts, filename):
+    """Zählt eine analysierte Datei in der passenden Kategorie der Zusammenfassung (ohne 'total')."""
+    count_kind(counts, classify_name(os.path.basename(filename)))
+
+
+def iter_scan(source, mode=SCAN_SERIAL, workers=None, cache=None, refresh_cache=False, engine=DEFAULT_ENGINE,
+              on_listed=None, videos=False, stats=NULL_STATS):
+    """
+    Analysiert alle Dateien im Quellordner und liefert für jede Datei sofort ein
+    ScanItem (original, new, status_key) in Verzeichnisreihenfolge.
+    'original' ist der Pfad relativ zum Quellordner. 'source' ist ein Ordnerpfad oder
+    ein SourceWalker; die Analyse beginnt, während der Ordnerbaum noch durchlaufen wird.
+
+    Mit 'on_listed' wird stattdessen zuerst der ganze Ordnerbaum durchlaufen und nach
+    Namen eingeordnet; on_listed(counts) erhält die fertige Zusammenfassung, bevor die
+    erste Datei geöffnet wird. Mit 'videos' werden auch Pixel-Videos umbenannt.
+
+    In 'stats' wird zusätzlich zu scan_classified die Zeit für das Durchlaufen und
+    Einordnen als Schritt "list" erfasst.
+    """
+    walker = source if isinstance(source, SourceWalker) else SourceWalker(source)
+    entries = stats.timed("list", ((rel_path, classify_name(os.path.basename(rel_path), videos))
+                                   for rel_path in walker))
+    if on_listed is not None:
+        entries = list(entries)
+        counts = new_counts(len(entries))
+        for _, info in entries:
+            count_kind(counts, info)
+        on_listed(counts)
+    rel_paths = deque()
+
+    def classified():
+        for rel_path, info in entries:
+            rel_paths.append(rel_path)
+            yield os.path.join(walker.source_path, rel_path), info
+
+    # scan_classified liefert die Ergebnisse in der Reihenfolge, in der es die Pfade abgeholt hat
+    for new_name, status_key in scan_classified(classified(), mode, workers, cache, refresh_cache, engine, stats):
+        rel_path = rel_paths.popleft()
+        if new_name == rel_path:
+            new_name = rel_path  # Unveränderter Name: teilt sich den String mit 'original'
+        yield ScanItem(rel_path, new_name, status_key)
+
+
+# ==============================================================================
+# Umbenennen (Kopieren/Verschieben)
+# ==============================================================================
+def resolve_layout(layout):
+    """
+    Gibt LAYOUT_MIRROR und LAYOUT_FLATTEN unverändert zurück und macht aus jeder
+    anderen Angabe eine LayoutTemplate (siehe output_layout.py; ValueError, wenn die
+    Vorlage ungültig ist). So können Journal, Plan und GUI die Ablage als Text führen.
+    """
+    if layout in (LAYOUT_MIRROR, LAYOUT_FLATTEN) or isinstance(layout, LayoutTemplate):
+        return layout
+    return LayoutTemplate(layout)
+
+
+def target_location(output_path, item, layout=LAYOUT_MIRROR):
+    """
+    Ordner und Dateiname, unter denen die umbenannte Datei landet (vor dem _N-Suffix):
+    bei LAYOUT_MIRROR der entsprechende Unterordner im Ausgabeordner, bei LAYOUT_FLATTEN
+    der Ausgabeordner selbst, bei einer LayoutTemplate der Ordner aus der Vorlage.
+    """
+    if isinstance(layout, LayoutTemplate):
+        rel_dir, name = layout.split(item.new)
+        return os.path.join(output_path, rel_dir) if rel_dir else output_path, name
+    rel_dir = os.path.dirname(item.original)
+    if layout == LAYOUT_FLATTEN or not rel_dir:
+        return output_path, item.new
+    return os.path.join(output_path, rel_dir), item.new
+
+
+def is_case_insensitive(directory):
+    """
+    Prüft mit einer kurzlebigen Testdatei, ob das Dateisystem des Ordners Groß- und
+    Kleinschreibung ignoriert. Ist der Ordner nicht beschreibbar, wird anhand des
+    Betriebssystems geschätzt (Windows und macOS sind standardmäßig unabhängig).
+    """
+    try:
+        fd, probe = tempfile.mkstemp(prefix=".pxl_case_", dir=directory)
+    except OSError:
+        return sys.platform in ("win32", "darwin")
+    try:
+        os.close(fd)
+        return os.path.exists(os.path.join(directory, os.path.basename(probe).upper()))
+    finally:
+        os.remove(probe)
+
+
+class DestinationIndex:
+    """
+    Namensverzeichnis der Zielordner im Speicher. Jeder Ordner wird beim ersten Zugriff
+    einmal per scandir eingelesen; danach werden Kollisionen (_1, _2, ...) ohne weitere
+    stat-Aufrufe aufgelöst. Vergebene Namen werden sofort eingetragen, sodass das
+    Verzeichnis auch die noch nicht geschriebenen Dateien dieses Laufs kennt.
+
+    Mit scan=False werden die Ordner nicht eingelesen, sondern nur die tatsächlich
+    benötigten Namen per lstat geprüft. Das lohnt sich für kleine Stapel in große
+    Ausgabeordner (Überwachungsmodus, siehe watch.py). Die Zugriffe auf das Dateisystem
+    werden in 'stats' gezählt.
+    """
+
+    def __init__(self, output_path, scan=True, stats=NULL_STATS):
+        self.output_path = output_path
+        self.scan = scan
+        self.stats = stats
+        # Wird beim ersten Zugriff ermittelt; ohne Einlesen reicht die Schätzung nach Betriebssystem,
+        # da lstat die Groß-/Kleinschreibung ohnehin wie das Dateisystem behandelt
+        self.case_insensitive = None if scan else sys.platform in ("win32", "darwin")
+        self._names = {}
+        self.missing = set()  # Eingelesene Ordner, die es (noch) nicht gibt
+
+    def _key(self, name):
+        return name.casefold() if self.case_insensitive else name
+
+    def names(self, directory):
+        """Menge der (ggf. kleingeschriebenen) Namen im Ordner; nicht existierende Ordner sind leer."""
+        names = self._names.get(directory)
+        if names is None:
+            if self.case_insensitive is None:
+                self.case_insensitive = (os.path.isdir(self.output_path)
+                                         and is_case_insensitive(self.output_path))
+            names = set()
+            if self.scan:
+                self.stats.count("scandir_calls")
+                try:
+                    with os.scandir(directory) as entries:
+                        names = {self._key(entry.name) for entry in entries}
+                except (FileNotFoundError, NotADirectoryError):
+                    self.missing.add(directory)
+            self._names[directory] = names
+        return names
+
+    def _taken(self, directory, names, name):
+        key = self._key(name)
+        if key in names:
+            return True
+        if self.scan:
+            return False
+        self.stats.count("stat_calls")
+        if os.path.lexists(os.path.join(directory, name)):
+            names.add(key)
+            return True
+        return False
+
+    def claim(self, directory, new_name):
+        """
+        Gibt einen freien Namen für 'new_name' im Ordner zurück und trägt ihn als belegt
+        ein. Ist der Name schon vergeben, wird eine Nummer angehängt (_1, _2, ...).
+        """
+        names = self.names(directory)
+        name = new_name
+        if self._taken(directory, names, name):
+            base, ext = os.path.splitext(new_name)
+            count = 1
+            while self._taken(directory, names, name):
+                name = f"{base}_{count}{ext}"
+                count += 1
+        names.add(self._key(name))
+        return name
+
+
+class TransferPlanner:
+    """
+    Legt die Zielpfade fest, bevor übertragen wird. Die Namen (inklusive _N-Suffix)
+    werden strikt in der Reihenfolge der Einträge über ein DestinationIndex vergeben,
+    sodass parallele Übertragungen nie denselben Namen bekommen und das Ergebnis
+    unabhängig von der Anzahl der Worker ist. Mit create_dirs=False werden nur Namen
+    geplant (für die Vorschau), ohne Ordner anzulegen. Duplikate erhalten nur mit
+    'link_duplicates' einen Zielnamen.
+
+    'layout' ist LAYOUT_MIRROR, LAYOUT_FLATTEN oder eine Ablagevorlage (Text oder
+    LayoutTemplate). Die benötigten Zielordner werden nicht pro Datei angelegt, sondern
+    gesammelt und mit make_dirs() für einen ganzen Stapel auf einmal; neu angelegte
+    Ordner werden im Journal vermerkt.
+    """
+
+    def __init__(self, output_path, layout=LAYOUT_MIRROR, create_dirs=True, link_duplicates=False, journal=None,
+                 scan_output=True, stats=NULL_STATS):
+        self.output_path = output_path
+        self.layout = resolve_layout(layout)
+        self.create_dirs = create_dirs
+        self.link_duplicates = link_duplicates
+        self.journal = journal
+        self.stats = stats
+        self.index = DestinationIndex(output_path, scan_output, stats)
+        self.created_dirs = set()  # Bereits angelegte Zielordner
+        self.pending_dirs = set()  # Geplante, aber noch nicht angelegte Zielordner
+
+    def wants(self, item):
+        """Prüft, ob der Eintrag in den Ausgabeordner übertragen wird."""
+        status_key = item.status_key
+        return status_key == "status_ok" or (self.link_duplicates and status_key == "status_duplicate")
+
+    def plan(self, item):
+        """
+        Gibt den Zielpfad für einen Eintrag zurück. Ein fehlender Zielordner wird
+        vorgemerkt und erst beim nächsten make_dirs() angelegt; Ordner, die das
+        DestinationIndex schon eingelesen hat, werden nicht erneut angelegt.
+        """
+        target_dir, name = target_location(self.output_path, item, self.layout)
+        name = self.index.claim(target_dir, name)
+        if (self.create_dirs and target_dir != self.output_path and target_dir not in self.created_dirs
+                and (not self.index.scan or target_dir in self.index.missing)):
+            self.pending_dirs.add(target_dir)
+        return os.path.join(target_dir, name)
+
+    def make_dirs(self):
+        """
+        Legt alle vorgemerkten Zielordner an (Elternordner zuerst) und gibt die Ordner,
+        die nicht angelegt werden konnten, mit ihrem Fehler zurück. Diese werden beim
+        nächsten Eintrag erneut vorgemerkt.
+        """
+        failed = {}
+        for target_dir in sorted(self.pending_dirs):
+            try:
+                if self.journal is not None and not os.path.isdir(target_dir):
+                    self.journal.mkdir(target_dir)
+                os.makedirs(target_dir, exist_ok=True)
+            except OSError as e:
+                failed[target_dir] = e
+                continue
+            finally:
+                self.stats.count("makedirs_calls")
+            self.created_dirs.add(target_dir)
+        self.pending_dirs.clear()
+        return failed
+
+    def plan_preview(self, item):
+        """
+        Trägt den geplanten Zielnamen (relativ zum Ausgabeordner) als 'planned' in den
+        Eintrag ein, falls er umbenannt wird. Gibt den Eintrag zurück.
+        """
+        if self.wants(item):
+            item.planned = os.path.relpath(self.plan(item), self.output_path)
+        return item
+
+
+class DeviceLimiter:
+    """
+    Begrenzt die Anzahl gleichzeitiger Übertragungen je Datenträger. Das Gerät wird
+    pro Ordner einmal per stat ermittelt und zwischengespeichert.
+    """
+
+    def __init__(self, per_device):
+        self.per_device = per_device
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._devices = {}
+
+    def device(self, directory):
+        with self._lock:
+            device = self._devices.get(directory)
+        if device is None:
+            device = os.stat(directory).st_dev
+            with self._lock:
+                self._devices[directory] = device
+        return device
+
+    def semaphores(self, *paths):
+        """Semaphoren der Geräte, auf denen die Pfade liegen, in fester Reihenfolge (gegen Deadlocks)."""
+        devices = sorted({self.device(os.path.dirname(path)) for path in paths})
+        with self._lock:
+            return [self._semaphores.setdefault(d, threading.BoundedSemaphore(self.per_device)) for d in devices]
+
+
+def _transfer_limited(limiter, original_path, new_path, copy, hardlink, stats=NULL_STATS):
+    """Führt eine Übertragung aus, sobald auf allen beteiligten Geräten ein Platz frei ist."""
+    semaphores = limiter.semaphores(original_path, new_path)
+    for semaphore in semaphores:
+        semaphore.acquire()
+    try:
+        return stats.call("transfer", transfer_file, original_path, new_path, move=not copy, hardlink=hardlink)
+    finally:
+        for semaphore in reversed(semaphores):
+            semaphore.release()
+
+
+def _link_duplicate(target_path, new_path, original_path, copy):
+    """
+    Legt ein Duplikat als Hardlink auf die vorhandene Datei 'target_path' an (ersatzweise
+    als Kopie). Beim Verschieben wird die Quelldatei anschließend gelöscht.
+    """
+    strategy = transfer_file(target_path, new_path, hardlink=True)
+    if not copy:
+        os.unlink(original_path)
+        strategy += MOVE_SUFFIX
+    return strategy
+
+
+def _plan_items(items, planner, source_path, copy, hardlink, journal, stats=NULL_STATS):
+    """
+    Vergibt die Zielpfade und vermerkt die Übertragungen im Journal. Liefert für jeden
+    Eintrag (Eintrag, Quellpfad, Zielpfad, Ziel des Hardlinks, Journal-Nummer, Fehler);
+    Einträge, die nicht übertragen werden, haben Quellpfad None. Es werden jeweils
+    PLAN_BATCH_SIZE Einträge im Voraus geplant; ihre Zielordner werden gemeinsam
+    angelegt und das Journal gemeinsam gesichert, damit nicht jede Datei ein eigenes
+    makedirs bzw. fsync kostet. Die Dauer landet in 'stats' als Schritte "plan",
+    "makedirs" und "journal_sync".
+    """
+    measure = stats.enabled
+    batch = []
+    planned = {}  # Quellpfad -> Zielpfad, für Links auf Duplikate aus demselben Lauf
+    for item in items:
+        if not planner.wants(item):
+            batch.append((item, None, None, None, None, None))
+        else:
+            original_path = os.path.join(source_path, item.original)
+            new_path = link = op_id = error = None
+            start = time.perf_counter() if measure else 0
+            try:
+                new_path = planner.plan(item)
+                if item.status_key == "status_duplicate":
+                    # Das Original ist entweder schon im Ausgabeordner oder wird in diesem Lauf übertragen
+                    link = planned.get(item.duplicate_of, item.duplicate_of)
+                if planner.link_duplicates:
+                    planned[original_path] = new_path
+                if journal is not None:
+                    op_id = journal.plan(original_path, new_path, not copy, hardlink, link)
+            except Exception as e:
+                error = e
+                if new_path is None:
+                    new_path = os.path.join(planner.output_path, item.new)  # Nur für die Meldung
+                if journal is not None:
+                    journal.error(None, e, original_path)
+            if measure:
+                stats.add_time("plan", time.perf_counter() - start, 1)
+            batch.append((item, original_path, new_path, link, op_id, error))
+        if len(batch) >= PLAN_BATCH_SIZE:
+            yield from _finish_plan_batch(batch, planner, journal, stats)
+            batch.clear()
+    yield from _finish_plan_batch(batch, planner, journal, stats)
+
+
+def _finish_plan_batch(batch, planner, journal, stats):
+    """
+    Legt die Zielordner eines geplanten Stapels an und sichert das Journal. Einträge,
+    deren Zielordner nicht angelegt werden konnte, erhalten dessen Fehler.
+    """
+    if planner.pending_dirs:
+        with stats.stage("makedirs"):
+            failed = planner.make_dirs()
+        if failed:
+            batch = [(item, original_path, new_path, link, op_id,
+                      error if original_path is None or error is not None else failed.get(os.path.dirname(new_path)))
+                     for item, original_path, new_path, link, op_id, error in batch]
+    if journal is not None:
+        with stats.stage("journal_sync"):
+            journal.sync()
+    return batch
+
+
+def process_items(items, source_path, output_path, copy, layout=LAYOUT_MIRROR, hardlink=False,
+                  jobs=1, per_device=None, link_duplicates=False, journal=None, scan_output=True, stats=NULL_STATS):
+    """
+    Kopiert oder verschiebt alle Einträge mit Status OK und liefert für jeden Eintrag
+    (Eintrag, Zielpfad, Verfahren, Fehler) in der Reihenfolge der Eingabe. Einträge mit
+    anderem Status werden mit (Eintrag, None, None, None) durchgereicht. 'Verfahren' ist
+    eine der STRATEGY_*-Konstanten aus transfer.py, 'Fehler' ist None, wenn alles
+    geklappt hat. Mit 'hardlink' werden Kopien auf demselben Datenträger als Hardlink
+    angelegt.
+
+    Mit jobs > 1 laufen bis zu 'jobs' Übertragungen gleichzeitig, davon höchstens
+    'per_device' pro Datenträger. Die Zielnamen werden trotzdem vorab und in fester
+    Reihenfolge vergeben (siehe TransferPlanner), und zwar gegen den aktuellen Inhalt
+    des Ausgabeordners, nicht gegen die in der Vorschau geplanten Namen.
+
+    Einträge mit Status "status_duplicate" (siehe dedup.py) werden übersprungen oder
+    mit 'link_duplicates' als Hardlink auf das bereits übertragene Original angelegt.
+
+    Mit einem Journal (siehe journal.py) wird jede Übertragung vorher geplant und
+    danach als erledigt oder fehlgeschlagen vermerkt; zum Schluss wird der Lauf als
+    vollständig markiert. Das Journal wird nicht geschlossen.
+
+    'layout' ist LAYOUT_MIRROR, LAYOUT_FLATTEN oder eine Ablagevorlage (siehe
+    output_layout.py). 'scan_output' wird an DestinationIndex weitergegeben (scan=False
+    für kleine Stapel).
+
+    In 'stats' (RunStats) landen die Dauer jeder Übertragung (Histogramm "transfer"),
+    die Planung, die Zugriffe auf den Ausgabeordner und die Fehler nach Art.
+    """
+    planner = TransferPlanner(output_path, layout, link_duplicates=link_duplicates, journal=journal,
+                              scan_output=scan_output, stats=stats)
+    executor = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    limiter = DeviceLimiter(per_device or jobs)
+    pending = deque()  # [Eintrag, Zielpfad, Journal-Nummer, Future oder Ergebnis (Verfahren, Fehler)]
+    transferred = {}   # Quellpfad -> Ergebnis, nur für Links auf Duplikate
+
+    def finish(entry):
+        item, new_path, op_id, outcome = entry
+        if isinstance(outcome, Future):
+            try:
+                outcome = (outcome.result(), None)
+            except Exception as e:
+                outcome = (None, e)
+        strategy, error = outcome
+        if error is not None:
+            stats.error(error)
+        elif strategy is not None:
+            stats.count("transferred")
+        if journal is not None and op_id is not None:
+            if error is None:
+                journal.done(op_id, strategy, new_path)
+            else:
+                journal.error(op_id, error)
+        return item, new_path, strategy, error
+
+    try:
+        for item, original_path, new_path, link, op_id, error in _plan_items(items, planner, source_path,
+                                                                               copy, hardlink, journal, stats):
+            if original_path is None:
+                outcome = (None, None)
+            elif error is not None:
+                outcome = (None, error)
+            else:
+                try:
+                    if link is not None:
+                        # Wartet, bis das Original aus diesem Lauf übertragen ist
+                        earlier = transferred.get(item.duplicate_of)
+                        if isinstance(earlier, Future):
+                            earlier.exception()
+                        outcome = (stats.call("transfer", _link_duplicate, link, new_path, original_path, copy), None)
+                    elif executor is None:
+                        # Führt je nach Auswahl die Kopier- oder Verschiebe-Operation durch, auf demselben
+                        # Dateisystem ohne Datenkopie (rename, Reflink)
+                        outcome = (stats.call("transfer", transfer_file, original_path, new_path, move=not copy,
+                                              hardlink=hardlink), None)
+                    else:
+                        outcome = executor.submit(_transfer_limited, limiter, original_path, new_path, copy, hardlink,
+                                                  stats)
+                except Exception as e:
+                    outcome = (None, e)
+                if link_duplicates:
+                    transferred[original_path] = outcome
+            pending.append((item, new_path, op_id, outcome))
+            # Gibt fertige Ergebnisse in Eingabereihenfolge weiter; begrenzt die Anzahl offener Aufträge
+            while pending and (executor is None or len(pending) > jobs * 2
+                               or not isinstance(pending[0][3], Future) or pending[0][3].done()):
+                yield finish(pending.popleft())
+        while pending:
+            yield finish(pending.popleft())
+        if journal is not None:
+            journal.end()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,238 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Persistenter Cache für die Ergebnisse der EXIF-Analyse.
+
+Für jede Datei wird die ausgelesene Aufnahmezeit zusammen mit Pfad, Größe und
+Änderungszeit (mtime_ns) in einer SQLite-Datei im Cache-Ordner des Benutzers
+gespeichert. Hat sich eine Datei seit dem letzten Scan nicht verändert, muss sie
+nicht erneut geöffnet werden. Der Cache ist in der Anzahl der Einträge begrenzt;
+die am längsten nicht mehr benutzten Einträge werden zuerst entfernt.
+
+In einer zweiten Tabelle werden die Inhalts-Hashes für die Duplikaterkennung
+(dedup.py) nach demselben Schema gespeichert, auch für Dateien im Ausgabeordner.
+Eine dritte Tabelle merkt sich für den Überwachungsmodus (watch.py), welche Dateien
+eines Eingangsordners in welchem Zustand schon verarbeitet wurden, damit sie nach
+einem Neustart nicht erneut übertragen werden.
+"""
+
+import os
+import sqlite3
+import sys
+import time
+
+from exif_reader import ExifDates
+
+# Version des Tabellenformats. Bei Änderungen wird der Cache neu angelegt.
+SCHEMA_VERSION = 3
+# Maximale Anzahl an Einträgen je Tabelle, bevor die ältesten verworfen werden (ca. 150 Bytes pro Eintrag)
+DEFAULT_MAX_ENTRIES = 500_000
+# Nach so vielen Änderungen wird eine Transaktion abgeschlossen
+COMMIT_INTERVAL = 1000
+
+
+def default_cache_dir():
+    """Gibt den plattformüblichen Cache-Ordner der Anwendung zurück."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, "PixelUTCRenamer", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/PixelUTCRenamer")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "pixel_utc_renamer")
+
+
+def default_cache_path():
+    """Pfad der Cache-Datei im Standard-Cache-Ordner."""
+    return os.path.join(default_cache_dir(), "scan_cache.sqlite3")
+
+
+class ScanCache:
+    """
+    EXIF-Cache auf Basis von SQLite. Ein Objekt darf nur von dem Thread benutzt
+    werden, der es erzeugt hat (in der Anwendung: der Analyse-Thread).
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        # Zeitstempel dieses Laufs, dient als "zuletzt benutzt"-Marke für die Verdrängung
+        self.run_stamp = int(time.time())
+        self._touched = []  # Pfade mit Treffern, deren Nutzungszeit aktualisiert werden muss
+        self._touched_hashes = []
+        self._changes = 0
+
+    def _create_schema(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS entries")
+            self.conn.execute("DROP TABLE IF EXISTS hashes")
+            self.conn.execute("DROP TABLE IF EXISTS delivered")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " date_time_original TEXT, offset_time_original TEXT, offset_time TEXT, creation_utc TEXT,"
+            " last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+            " digest TEXT NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS delivered ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS delivered_last_used ON delivered (last_used)")
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.conn.commit()
+
+    def get(self, path, size, mtime_ns):
+        """
+        Gibt die gespeicherten ExifDates für die Datei zurück, oder None, wenn kein
+        passender Eintrag existiert (Datei neu oder seitdem verändert).
+        """
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, date_time_original, offset_time_original, offset_time, creation_utc"
+            " FROM entries WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        self._touched.append((self.run_stamp, path))
+        if len(self._touched) >= COMMIT_INTERVAL:
+            self.flush()
+        return ExifDates(*row[2:])
+
+    def put(self, path, size, mtime_ns, exif_dates):
+        """Speichert das Analyseergebnis einer Datei (überschreibt einen alten Eintrag)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, *exif_dates, self.run_stamp),
+        )
+        self._changes += 1
+        if self._changes >= COMMIT_INTERVAL:
+            self.flush()
+
+    def get_hash(self, path, size, mtime_ns):
+        """Gibt den gespeicherten Inhalts-Hash der Datei zurück, oder None (neu oder verändert)."""
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, digest FROM hashes WHERE path = ?", (path,)
+        ).fetchone()
+        if row is None or row[0] != size or row[1] != mtime_ns:
+            return None
+        self._touched_hashes.append((self.run_stamp, path))
+        if len(self._touched_hashes) >= COMMIT_INTERVAL:
+            self.flush()
+        return row[2]
+
+    def put_hash(self, path, size, mtime_ns, digest):
+        """Speichert den Inhalts-Hash einer Datei (überschreibt einen alten Eintrag)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?)",
+            (path, size, mtime_ns, digest, self.run_stamp),
+        )
+        self._changes += 1
+        if self._changes >= COMMIT_INTERVAL:
+            self.flush()
+
+    def delivered_in(self, directory):
+        """
+        Gibt {Pfad: (Größe, mtime_ns)} der bereits verarbeiteten Dateien unterhalb von
+        'directory' zurück (Bereichsabfrage über den Primärschlüssel).
+        """
+        prefix = os.path.join(directory, "")
+        rows = self.conn.execute(
+            "SELECT path, size, mtime_ns FROM delivered WHERE path >= ? AND path < ?",
+            (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)),
+        )
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def put_delivered(self, path, size, mtime_ns):
+        """Vermerkt eine verarbeitete Datei im angegebenen Zustand (überschreibt einen alten Eintrag)."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO delivered VALUES (?, ?, ?, ?)",
+            (path, size, mtime_ns, self.run_stamp),
+        )
+        self._changes += 1
+        if self._changes >= COMMIT_INTERVAL:
+            self.flush()
+
+    def forget_delivered(self, paths):
+        """Entfernt verarbeitete Dateien, die nicht mehr im Eingangsordner liegen."""
+        self.conn.executemany("DELETE FROM delivered WHERE path = ?", ((path,) for path in paths))
+        self._changes += 1
+        if self._changes >= COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Schreibt gesammelte Änderungen und Nutzungszeiten in die Datenbank."""
+        if self._touched:
+            self.conn.executemany("UPDATE entries SET last_used = ? WHERE path = ?", self._touched)
+            self._touched = []
+        if self._touched_hashes:
+            self.conn.executemany("UPDATE hashes SET last_used = ? WHERE path = ?", self._touched_hashes)
+            self._touched_hashes = []
+        self.conn.commit()
+        self._changes = 0
+
+    def evict(self):
+        """Entfernt die am längsten nicht benutzten Einträge, bis die Obergrenze eingehalten ist."""
+        for table in ("entries", "hashes", "delivered"):
+            count = self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            excess = count - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE path IN"
+                    f" (SELECT path FROM {table} ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self.conn.commit()
+
+    def clear(self):
+        """Leert den gesamten Cache."""
+        self.conn.execute("DELETE FROM entries")
+        self.conn.execute("DELETE FROM hashes")
+        self.conn.execute("DELETE FROM delivered")
+        self.conn.commit()
+
+    def close(self):
+        """Schreibt offene Änderungen, hält die Größengrenze ein und schließt die Datenbank."""
+        try:
+            self.flush()
+            self.evict()
+        finally:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
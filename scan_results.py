@@ -0,0 +1,148 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+
+"""
+Kompakte Ablage der Analyseergebnisse.
+
+Jede Datei wird als ScanItem (mit __slots__, ohne eigenes Dictionary) abgelegt.
+ScanResults sammelt die Einträge in Verzeichnisreihenfolge und führt beim Anhängen
+für jeden Status eine Indexliste (array, 4 bzw. 8 Bytes pro Eintrag). Damit lassen
+sich die Anzahl je Status, die Einträge eines Status und Auswahlen für das Umbenennen
+ohne erneuten Durchlauf über alle Einträge und ohne Kopie der Liste ermitteln.
+Die Status-Schlüssel sind feste, geteilte Strings (z.B. "status_ok").
+"""
+
+import heapq
+from array import array
+from itertools import islice
+
+# Typcode der Indexlisten: vorzeichenlos, mindestens 32 Bit
+INDEX_TYPECODE = "I" if array("I").itemsize >= 4 else "L"
+
+
+class ScanItem:
+    """
+    Ergebnis der Analyse einer Datei. 'original' ist der Pfad relativ zum Quellordner,
+    'new' der neue Name und 'status_key' der Status. 'planned' (geplanter Zielname im
+    Ausgabeordner), 'duplicate_of' (Pfad des Originals), 'digest' (Hash) und
+    'stat_key' ((Größe, mtime_ns) aus einem gespeicherten Plan, siehe plan_io.py)
+    werden nachträglich gesetzt, sonst sind sie None.
+    """
+    __slots__ = ("original", "new", "status_key", "planned", "duplicate_of", "digest", "stat_key")
+
+    def __init__(self, original, new, status_key):
+        self.original = original
+        self.new = new
+        self.status_key = status_key
+        self.planned = None
+        self.duplicate_of = None
+        self.digest = None
+        self.stat_key = None
+
+    @property
+    def target_name(self):
+        """Geplanter Zielname (mit _N-Suffix), falls bekannt, sonst der neue Name."""
+        return self.planned or self.new
+
+    def __repr__(self):
+        return f"ScanItem({self.original!r}, {self.new!r}, {self.status_key!r})"
+
+
+class ScanResults:
+    """
+    Analyseergebnisse in Verzeichnisreihenfolge mit einer Indexliste je Status. Der
+    Status eines Eintrags darf sich nach append nicht mehr ändern. Angehängt wird nur
+    aus einem Thread; andere Threads dürfen gleichzeitig über eine Auswahl (select) lesen.
+    """
+
+    def __init__(self):
+        self.items = []
+        self._indices = {}  # Status-Schlüssel -> array mit den Positionen in 'items'
+
+    def append(self, item):
+        indices = self._indices.get(item.status_key)
+        if indices is None:
+            indices = self._indices[item.status_key] = array(INDEX_TYPECODE)
+        indices.append(len(self.items))
+        self.items.append(item)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def count(self, status_key):
+        """Anzahl der Einträge mit dem Status."""
+        indices = self._indices.get(status_key)
+        return len(indices) if indices is not None else 0
+
+    def counts(self):
+        """Anzahl der Einträge je Status als Dictionary."""
+        return {status_key: len(indices) for status_key, indices in self._indices.items()}
+
+    def indices(self, status_key):
+        """
+        Positionen der Einträge mit dem Status. Die Liste wird nicht kopiert und wächst
+        mit weiteren Einträgen mit; sie darf nicht verändert werden.
+        """
+        indices = self._indices.get(status_key)
+        if indices is None:
+            indices = self._indices[status_key] = array(INDEX_TYPECODE)
+        return indices
+
+    def select(self, *status_keys):
+        """Auswahl der bisherigen Einträge mit einem der Status (siehe ScanSelection)."""
+        return ScanSelection(self, status_keys)
+
+
+class ScanSelection:
+    """
+    Die Einträge mit bestimmten Status, so wie sie beim Erstellen der Auswahl vorlagen.
+    Statt die Einträge zu kopieren, merkt sich die Auswahl nur die Länge der
+    Indexlisten; später angehängte Einträge gehören nicht dazu. Die Einträge werden in
+    Verzeichnisreihenfolge geliefert.
+    """
+
+    def __init__(self, results, status_keys):
+        self.results = results
+        self.parts = [(results.indices(status_key), results.count(status_key)) for status_key in status_keys]
+
+    def __len__(self):
+        return sum(length for _, length in self.parts)
+
+    def __iter__(self):
+        items = self.results.items
+        ranges = [islice(indices, length) for indices, length in self.parts if length]
+        positions = ranges[0] if len(ranges) == 1 else heapq.merge(*ranges)
+        return (items[index] for index in positions)
@@ -0,0 +1,113 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Regressionstests für journal.py: resume und undo dürfen eine Datei, die nach dem
+Planen unter dem Zielnamen aufgetaucht ist, weder löschen noch überschreiben.
+
+Aufruf:
+    python -m pytest test_journal.py   (oder: python -m unittest test_journal)
+"""
+
+import os
+import tempfile
+import unittest
+
+from journal import Journal, load_state, resume_run, undo_run
+
+FOREIGN = b"fremde Datei"
+PHOTO = b"eigenes Foto"
+
+
+class ForeignTargetTest(unittest.TestCase):
+    """Ziel ist nach dem Planen entstanden, die Übertragung schlug mit FileExistsError fehl."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        base = self.tmp.name
+        self.output = os.path.join(base, "out")
+        os.makedirs(self.output)
+        self.src = os.path.join(base, "PXL_20240101_120000000.jpg")
+        self.dst = os.path.join(self.output, "20240101_120000.jpg")
+        with open(self.src, "wb") as f:
+            f.write(PHOTO)
+
+    def failed_run(self, move):
+        """Schreibt ein Journal wie process_items, wenn das Ziel zwischen Planen und Übertragen auftaucht."""
+        journal = Journal.create(os.path.join(self.tmp.name, "journal"), output=self.output)
+        with journal:
+            op_id = journal.plan(self.src, self.dst, move)
+            with open(self.dst, "wb") as f:
+                f.write(FOREIGN)
+            journal.error(op_id, FileExistsError(f"'{self.dst}' existiert bereits"))
+            journal.end()
+        return journal.path
+
+    def assert_untouched(self):
+        with open(self.dst, "rb") as f:
+            self.assertEqual(f.read(), FOREIGN)
+        with open(self.src, "rb") as f:
+            self.assertEqual(f.read(), PHOTO)
+
+    def test_resume_keeps_foreign_target(self):
+        for move in (False, True):
+            with self.subTest(move=move):
+                path = self.failed_run(move)
+                results = list(resume_run(path))
+                self.assertEqual(len(results), 1)
+                self.assertIsInstance(results[0][2], FileExistsError)
+                self.assert_untouched()
+                os.unlink(self.dst)
+
+    def test_undo_keeps_foreign_target(self):
+        for move in (False, True):
+            with self.subTest(move=move):
+                path = self.failed_run(move)
+                self.assertEqual(list(undo_run(path)), [])
+                self.assert_untouched()
+                self.assertEqual(load_state(path).pending(), [])
+                os.unlink(self.dst)
+
+    def test_undo_keeps_replaced_target(self):
+        """Eine fertig kopierte Datei, die seitdem ersetzt wurde, wird nicht gelöscht."""
+        journal = Journal.create(os.path.join(self.tmp.name, "journal"), output=self.output)
+        with journal:
+            op_id = journal.plan(self.src, self.dst, False)
+            with open(self.dst, "wb") as f:
+                f.write(PHOTO)
+            journal.done(op_id, "stream", self.dst)
+            journal.end()
+        os.unlink(self.dst)
+        with open(self.dst, "wb") as f:
+            f.write(FOREIGN)
+        results = list(undo_run(journal.path))
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0][1], FileExistsError)
+        self.assert_untouched()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Ermittlung der Aufnahmezeit für den neuen Dateinamen.
+
+Mögliche Quellen, in einer einstellbaren Reihenfolge:
+- SOURCE_EXIF_OFFSET: DateTimeOriginal zusammen mit OffsetTimeOriginal (bzw.
+  OffsetTime). Ergibt einen eindeutigen Zeitpunkt, lokal und in UTC. Bei Videos
+  steht hier die Erstellungszeit aus 'mvhd' (UTC, lokal über die Zeitzone).
+- SOURCE_EXIF_LOCAL: DateTimeOriginal allein (lokale Uhrzeit des Telefons). Für UTC
+  wird der Versatz der eingestellten Zeitzone angenommen.
+- SOURCE_PXL_NAME: der UTC-Zeitstempel im Namen PXL_YYYYMMDD_HHMMSSmmm. Für die
+  lokale Zeit wird der EXIF-Versatz verwendet, falls vorhanden, sonst die Zeitzone.
+
+Ausgegeben wird wahlweise lokale Zeit oder UTC, optional mit den Millisekunden aus
+dem PXL-Namen (weniger Kollisionen bei Serienaufnahmen). Geparst wird mit
+vorkompilierten Ausdrücken statt strptime, formatiert per isoformat bzw. direkt aus dem
+EXIF-Text statt strftime;
+Versätze und Zeitzonen-Umrechnungen werden zwischengespeichert (Zeitzonen in
+15-Minuten-Schritten, da alle Versätze und Umstellungszeitpunkte darauf liegen).
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+# Quellen der Aufnahmezeit
+SOURCE_EXIF_OFFSET = "exif_offset"
+SOURCE_EXIF_LOCAL = "exif_local"
+SOURCE_PXL_NAME = "pxl_name"
+SOURCES = (SOURCE_EXIF_OFFSET, SOURCE_EXIF_LOCAL, SOURCE_PXL_NAME)
+# Bisheriges Verhalten: nur EXIF, Dateien ohne EXIF-Datum werden nicht umbenannt
+DEFAULT_PRECEDENCE = (SOURCE_EXIF_OFFSET, SOURCE_EXIF_LOCAL)
+
+# Zeitbezug des neuen Namens
+OUTPUT_LOCAL = "local"
+OUTPUT_UTC = "utc"
+
+# Prüft Format und Wertebereiche der Uhrzeit; ob es den Tag gibt (z.B. 30.02.), prüft _valid_day
+_EXIF_DATETIME = re.compile(r"(\d{4}:\d{2}:\d{2}) ([01]\d|2[0-3]):[0-5]\d:[0-5]\d$")
+_PXL_TIMESTAMP = re.compile(r"PXL_(\d{4})(\d{2})(\d{2})_(\d{2})(\d{2})(\d{2})(\d{3})", re.IGNORECASE)
+_OFFSET = re.compile(r"([+-])(\d{2}):?(\d{2})$")
+
+_EPOCH = datetime(1970, 1, 1)
+_BUCKET = timedelta(minutes=15)
+
+
+@lru_cache(maxsize=256)
+def parse_offset(text):
+    """Wandelt einen EXIF-Versatz wie '+02:00' in ein timedelta um; None bei ungültigen Werten."""
+    if not text:
+        return None
+    match = _OFFSET.match(text.strip())
+    if not match:
+        return None
+    sign, hours, minutes = match.groups()
+    offset = timedelta(hours=int(hours), minutes=int(minutes))
+    return -offset if sign == "-" else offset
+
+
+@lru_cache(maxsize=4096)
+def _valid_day(text):
+    """Prüft ein Datum 'YYYY:MM:DD' (zwischengespeichert, da viele Fotos vom selben Tag sind)."""
+    try:
+        datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]))
+    except ValueError:
+        return False
+    return True
+
+
+def valid_exif_datetime(text):
+    """Prüft, ob 'text' ein gültiges EXIF-Datum 'YYYY:MM:DD HH:MM:SS' ist."""
+    match = _EXIF_DATETIME.match(text)
+    return match is not None and _valid_day(match.group(1))
+
+
+def parse_exif_datetime(text):
+    """Wandelt 'YYYY:MM:DD HH:MM:SS' in ein datetime um. Wirft ValueError bei ungültigen Werten."""
+    if not valid_exif_datetime(text):
+        raise ValueError(f"Ungültiges EXIF-Datum: {text!r}")
+    return datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                    int(text[11:13]), int(text[14:16]), int(text[17:19]))
+
+
+def parse_pxl_name(filename):
+    """Gibt (UTC-Zeit, Millisekunden) aus einem PXL-Dateinamen zurück, oder (None, None)."""
+    match = _PXL_TIMESTAMP.match(filename)
+    if not match:
+        return None, None
+    values = list(map(int, match.groups()))
+    try:
+        return datetime(*values[:6]), values[6]
+    except ValueError:
+        return None, None
+
+
+def format_timestamp(value):
+    """Formatiert wie strftime('%Y%m%d_%H%M%S'), aber über isoformat (deutlich schneller)."""
+    return value.isoformat(timespec="seconds").replace("-", "").replace(":", "").replace("T", "_")
+
+
+def compact_exif_datetime(text):
+    """Wandelt ein geprüftes EXIF-Datum direkt in '%Y%m%d_%H%M%S' um, ganz ohne datetime."""
+    return text.replace(":", "").replace(" ", "_")
+
+
+def load_timezone(name):
+    """Gibt die Zeitzone zum Namen (z.B. 'Europe/Berlin') zurück; None steht für die Systemzeitzone."""
+    if not name:
+        return None
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except ImportError:
+        raise ValueError("Zeitzonen werden erst ab Python 3.9 unterstützt")
+    except (KeyError, ValueError) as e:
+        # ZoneInfoNotFoundError ist eine Unterklasse von KeyError; unter Windows wird das Paket tzdata benötigt
+        raise ValueError(f"Unbekannte Zeitzone: {name}") from e
+
+
+class TimestampEngine:
+    """
+    Berechnet den Zeitstempel für den neuen Dateinamen aus EXIF-Daten und Dateiname.
+    Ein Objekt kann für beliebig viele Dateien verwendet werden; die Umrechnungen
+    der Zeitzone werden pro Objekt zwischengespeichert.
+    """
+
+    def __init__(self, precedence=DEFAULT_PRECEDENCE, output=OUTPUT_LOCAL, milliseconds=False, tz=None):
+        unknown = [source for source in precedence if source not in SOURCES]
+        if unknown or not precedence:
+            raise ValueError(f"Unbekannte Zeitquelle: {', '.join(unknown) or '(leer)'}")
+        self.precedence = tuple(precedence)
+        self.output = output
+        self.milliseconds = milliseconds
+        self.tz = load_timezone(tz) if isinstance(tz, str) else tz
+        # Pro Objekt, damit die Zwischenspeicher zur Zeitzone passen
+        self._utc_offset = lru_cache(maxsize=65536)(self._utc_offset_uncached)
+        self._local_offset = lru_cache(maxsize=65536)(self._local_offset_uncached)
+
+    def _utc_offset_uncached(self, bucket):
+        """Versatz der Zeitzone für den 15-Minuten-Abschnitt 'bucket' (UTC, seit 1970)."""
+        instant = datetime.fromtimestamp(bucket * _BUCKET.total_seconds(), timezone.utc)
+        return instant.astimezone(self.tz).utcoffset()
+
+    def _local_offset_uncached(self, bucket):
+        """Versatz der Zeitzone für den 15-Minuten-Abschnitt 'bucket' der lokalen Uhrzeit."""
+        wall = _EPOCH + bucket * _BUCKET
+        if self.tz is None:
+            return wall.astimezone().utcoffset()
+        return wall.replace(tzinfo=self.tz).utcoffset()
+
+    def utc_to_local(self, utc):
+        return utc + self._utc_offset((utc - _EPOCH) // _BUCKET)
+
+    def local_to_utc(self, local):
+        return local - self._local_offset((local - _EPOCH) // _BUCKET)
+
+    def needs_exif(self, filename):
+        """
+        Prüft, ob für den Namen die EXIF-Daten gelesen werden müssen. Nicht nötig ist
+        das nur bei UTC-Ausgabe, wenn der PXL-Name Vorrang hat und lesbar ist.
+        """
+        return not (self.output == OUTPUT_UTC and self.precedence[0] == SOURCE_PXL_NAME
+                    and parse_pxl_name(filename)[0] is not None)
+
+    def timestamp(self, filename, exif_dates):
+        """
+        Gibt (Zeitstempel, None) zurück, oder (None, Status), wenn keine Quelle eine
+        gültige Zeit liefert: "status_read_error" bei einem unlesbaren EXIF-Datum,
+        sonst "status_no_exif".
+        """
+        status_key = "status_no_exif"
+        exif_text = exif_dates.date_time_original
+        if exif_text:
+            exif_text = exif_text.strip()
+            if not valid_exif_datetime(exif_text):
+                exif_text = None
+                status_key = "status_read_error"
+        offset = parse_offset(exif_dates.offset_time_original) or parse_offset(exif_dates.offset_time)
+        video_utc = None
+        if exif_dates.creation_utc and valid_exif_datetime(exif_dates.creation_utc):
+            video_utc = parse_exif_datetime(exif_dates.creation_utc)
+        name_utc = milliseconds = None
+        if SOURCE_PXL_NAME in self.precedence or self.milliseconds:
+            # Der Name wird nur zerlegt, wenn er gebraucht werden kann
+            name_utc, milliseconds = parse_pxl_name(filename)
+
+        utc = None  # Gesetzt, wenn die gewählte Quelle einen UTC-Zeitpunkt liefert
+        for source in self.precedence:
+            if source == SOURCE_EXIF_OFFSET:
+                if exif_text and offset is not None:
+                    break
+                if video_utc is not None:
+                    utc = video_utc
+                    break
+            elif source == SOURCE_EXIF_LOCAL:
+                if exif_text:
+                    break
+            elif name_utc is not None:
+                utc = name_utc
+                break
+        else:
+            return None, status_key
+
+        if utc is None:
+            if self.output == OUTPUT_LOCAL:
+                text = compact_exif_datetime(exif_text)  # Häufigster Fall: keine Umrechnung nötig
+            elif source == SOURCE_EXIF_OFFSET:
+                text = format_timestamp(parse_exif_datetime(exif_text) - offset)
+            else:
+                text = format_timestamp(self.local_to_utc(parse_exif_datetime(exif_text)))
+        elif self.output == OUTPUT_UTC:
+            text = format_timestamp(utc)
+        elif offset is not None:
+            text = format_timestamp(utc + offset)
+        else:
+            text = format_timestamp(self.utc_to_local(utc))
+        if self.milliseconds and milliseconds is not None:
+            text = f"{text}{milliseconds:03d}"
+        return text, None
+
+
+# Verhalten ohne besondere Einstellungen (lokale EXIF-Zeit, wie bisher)
+DEFAULT_ENGINE = TimestampEngine()
@@ -0,0 +1,177 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+"""
+Übertragung der umbenannten Dateien in den Ausgabeordner (Kopieren, Verschieben, Verlinken).
+
+Liegen Quelle und Ziel auf demselben Dateisystem, wird ohne Datenkopie gearbeitet:
+Verschieben legt einen Hardlink an und löscht den alten Eintrag (os.rename würde
+unter POSIX ein vorhandenes Ziel stillschweigend ersetzen), Kopien werden auf Btrfs/XFS als Reflink
+(Copy-on-Write-Klon) angelegt, sonst per copy_file_range im Kernel kopiert. Hardlinks
+gibt es nur auf ausdrücklichen Wunsch, da Original und "Kopie" dann dieselben Daten
+teilen. Über Dateisystemgrenzen hinweg wird gestreamt kopiert.
+
+Ob Quelle und Ziel auf demselben Gerät liegen, wird nicht vorab per stat geprüft,
+sondern am Fehlercode EXDEV der schnellen Verfahren erkannt.
+"""
+
+import errno
+import os
+import shutil
+import sys
+
+# Verwendete Verfahren, wie sie pro Datei zurückgemeldet werden
+STRATEGY_RENAME = "rename"                    # Verschieben innerhalb eines Dateisystems
+STRATEGY_HARDLINK = "hardlink"                # Zweiter Verzeichniseintrag für dieselben Daten
+STRATEGY_REFLINK = "reflink"                  # Copy-on-Write-Klon (Btrfs, XFS, ...)
+STRATEGY_COPY_FILE_RANGE = "copy_file_range"  # Kopie im Kernel ohne Umweg über Python
+STRATEGY_STREAM = "stream"                    # Blockweise Kopie über Python
+# Beim Verschieben über Dateisystemgrenzen wird an das Kopierverfahren "+delete" angehängt
+MOVE_SUFFIX = "+delete"
+
+# Puffergröße für die gestreamte Kopie
+STREAM_BUFFER_SIZE = 1024 * 1024
+# Linux-ioctl FICLONE (_IOW(0x94, 9, int)) für Reflinks
+FICLONE = 0x40049409
+
+# Fehlercodes, bei denen ein schnelles Verfahren nicht möglich ist und das nächste versucht wird
+_UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTTY,
+                       errno.EPERM, errno.EBADF, errno.ETXTBSY}
+
+
+def same_device(src, dst_dir):
+    """Prüft, ob 'src' und der Ordner 'dst_dir' auf demselben Gerät liegen."""
+    return os.stat(src).st_dev == os.stat(dst_dir).st_dev
+
+
+def transfer_file(src, dst, move=False, hardlink=False, clone=True):
+    """
+    Überträgt 'src' nach 'dst' und gibt das verwendete Verfahren zurück.
+
+    - move=True: neuer Verzeichniseintrag und Löschen des alten, bei unterschiedlichen
+      Geräten Kopie und anschließendes Löschen
+    - hardlink=True (nur beim Kopieren): Hardlink, falls auf demselben Gerät möglich
+    - clone=True: Reflink bzw. copy_file_range versuchen, bevor gestreamt kopiert wird
+
+    'dst' darf noch nicht existieren; eine vorhandene Datei wird nie überschrieben
+    (FileExistsError). Die Metadaten (Zeitstempel, Rechte) werden wie bei
+    shutil.copy2 übernommen.
+    """
+    if move:
+        try:
+            _move(src, dst)
+            return STRATEGY_RENAME
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        strategy = _copy(src, dst, clone)
+        os.unlink(src)
+        return strategy + MOVE_SUFFIX
+
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return STRATEGY_HARDLINK
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+    return _copy(src, dst, clone)
+
+
+def _move(src, dst):
+    """
+    Verschiebt innerhalb eines Dateisystems, ohne ein vorhandenes 'dst' zu ersetzen.
+    os.link schlägt bei einem vorhandenen Ziel fehl (EEXIST); ohne Hardlinks (z.B.
+    FAT) wird vor os.rename ausdrücklich geprüft. Unter Windows verweigert os.rename
+    ein vorhandenes Ziel selbst.
+    """
+    if os.name == "nt":
+        os.rename(src, dst)
+        return
+    try:
+        os.link(src, dst, follow_symlinks=False)
+    except OSError as e:
+        if e.errno == errno.EXDEV or e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        if os.path.lexists(dst):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+        os.rename(src, dst)
+        return
+    os.unlink(src)
+
+
+def _copy(src, dst, clone):
+    """Kopiert Daten und Metadaten; gibt das verwendete Verfahren zurück."""
+    with open(src, "rb") as fsrc:
+        # 'x': Niemals eine vorhandene Datei überschreiben
+        with open(dst, "xb") as fdst:
+            try:
+                strategy = _copy_data(fsrc, fdst, clone)
+            except BaseException:
+                fdst.close()
+                os.unlink(dst)
+                raise
+    shutil.copystat(src, dst)
+    return strategy
+
+
+def _copy_data(fsrc, fdst, clone):
+    """Überträgt den Dateiinhalt mit dem schnellsten verfügbaren Verfahren."""
+    if clone and sys.platform.startswith("linux"):
+        try:
+            import fcntl
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            return STRATEGY_REFLINK
+        except (ImportError, OSError) as e:
+            if isinstance(e, OSError) and e.errno not in _UNSUPPORTED_ERRNOS:
+                raise
+        if hasattr(os, "copy_file_range") and _copy_file_range(fsrc, fdst):
+            return STRATEGY_COPY_FILE_RANGE
+
+    shutil.copyfileobj(fsrc, fdst, STREAM_BUFFER_SIZE)
+    return STRATEGY_STREAM
+
+
+def _copy_file_range(fsrc, fdst):
+    """
+    Kopiert per os.copy_file_range. Gibt False zurück, wenn das Verfahren nicht
+    unterstützt wird; bereits geschriebene Daten werden dann verworfen.
+    """
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+    size = os.fstat(src_fd).st_size
+    copied = 0
+    try:
+        while copied < size:
+            sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+            if sent == 0:
+                break
+            copied += sent
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        os.ftruncate(dst_fd, 0)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        return False
+    return True
@@ -0,0 +1,272 @@
+# ==============================================================================
+# MIT License
+#
+# Copyright (c) 2025 elschopi
+#
+# Permission is hereby granted, free of charge, to a any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# ==============================================================================
+
+
+"""
+Überwachungsmodus: benennt neue Pixel-Dateien in einem Eingangsordner laufend um.
+
+Der Ordner wird regelmäßig per scandir gelesen und mit dem vorigen Stand verglichen.
+Unter Linux weckt inotify (über ctypes, ohne Zusatzpaket) die Schleife sofort, wenn
+sich etwas ändert; sonst wird im festen Intervall gepollt. Eine Datei wird erst
+verarbeitet, wenn sich Größe und Änderungszeit für 'settle' Sekunden nicht mehr
+geändert haben, damit halb synchronisierte Dateien liegen bleiben. Verarbeitet wird
+in kleinen Stapeln. Alle Stapel einer Sitzung hängen an ein gemeinsames Journal an,
+das erst mit dem ersten Stapel angelegt wird; so verdrängt eine lange Sitzung keine
+Journale anderer Läufe, und "undo" macht die ganze Sitzung rückgängig.
+
+Gemerkt werden nur die Dateien, die gerade im Eingangsordner liegen; Speicher und
+Aufwand pro Durchlauf hängen daher nicht davon ab, wie viele Dateien schon
+verarbeitet wurden. Größe und Änderungszeit kommen aus den DirEntry-Objekten des
+Durchlaufs. Mit einem ScanCache werden verarbeitete Dateien samt Größe und
+Änderungszeit auch über einen Neustart hinweg gemerkt, sodass bei --copy der
+liegengebliebene Eingangsordner nicht erneut übertragen wird. Der Ausgabeordner
+wird nicht eingelesen, Namenskollisionen werden nur für die Dateien des Stapels
+per lstat geprüft.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import time
+
+from journal import Journal
+from instrumentation import NULL_STATS
+from renamer_core import LAYOUT_MIRROR, SourceWalker, process_items, scan_files
+from scan_results import ScanItem
+from timestamps import DEFAULT_ENGINE
+
+# Standardwerte für die Überwachung
+DEFAULT_INTERVAL = 2.0      # Sekunden zwischen zwei Durchläufen (ohne inotify-Ereignis)
+DEFAULT_SETTLE = 5.0        # So lange muss eine Datei unverändert sein
+DEFAULT_BATCH_SIZE = 50     # Dateien pro Stapel
+
+# inotify-Ereignisse, bei denen neu verglichen wird. IN_MODIFY fehlt bewusst: Ob eine
+# Datei noch wächst, wird über das Intervall geprüft, nicht bei jedem Schreibvorgang.
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = (_IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO
+               | _IN_CREATE | _IN_DELETE)
+
+
+class Inotify:
+    """Minimale inotify-Anbindung über ctypes. Dient nur als Wecker für die Schleife."""
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.watched = set()
+
+    def watch(self, directories):
+        """Überwacht die angegebenen Ordner (zusätzlich zu den bereits überwachten, noch vorhandenen)."""
+        self.watched &= directories  # Gelöschte Ordner entfernt der Kernel selbst
+        for path in directories - self.watched:
+            if self.libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK) < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch fehlgeschlagen: {path}")
+            self.watched.add(path)
+
+    def wait(self, timeout):
+        """Wartet bis zu 'timeout' Sekunden auf ein Ereignis und verwirft die Ereignisdaten."""
+        readable = select.select([self.fd], [], [], timeout)[0]
+        if readable:
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+        return bool(readable)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_inotify():
+    """Gibt ein Inotify-Objekt zurück, oder None, wenn inotify nicht verfügbar ist."""
+    try:
+        return Inotify()
+    except (OSError, AttributeError, TypeError):
+        return None
+
+
+class FolderWatcher:
+    """
+    Vergleicht den Inhalt des Eingangsordners mit dem vorigen Durchlauf und meldet
+    Dateien, deren Größe und Änderungszeit seit 'settle' Sekunden gleich sind.
+    """
+
+    def __init__(self, source_path, recursive=False, include=None, exclude=None, skip_dirs=(),
+                 settle=DEFAULT_SETTLE, clock=time.monotonic, on_error=None, cache=None):
+        self.walker = SourceWalker(source_path, recursive, include, exclude, skip_dirs, self._unreadable)
+        self.source_path = self.walker.source_path
+        self.settle = settle
+        self.clock = clock
+        self.on_error = on_error
+        self.cache = cache  # ScanCache: verarbeitete Dateien bleiben über einen Neustart bekannt
+        self.unreadable = set()     # Beim letzten Durchlauf nicht lesbare Unterordner
+        self._unreadable_now = set()
+        self.pending = {}   # Relativer Pfad -> ((Größe, mtime_ns), Zeitpunkt der letzten Änderung)
+        self.handled = {}   # Relativer Pfad -> (Größe, mtime_ns) beim Verarbeiten
+        if cache is not None:
+            for path, stat_key in cache.delivered_in(self.source_path).items():
+                self.handled[os.path.relpath(path, self.source_path)] = stat_key
+        self.directories = {self.source_path}
+
+    def _unreadable(self, rel_dir, error):
+        # Meldet einen nicht lesbaren Unterordner nur einmal, nicht bei jedem Durchlauf
+        self._unreadable_now.add(rel_dir)
+        if self.on_error is not None and rel_dir not in self.unreadable:
+            self.on_error(rel_dir, error)
+
+    def scan(self):
+        """Liest den Ordner und gibt die relativen Pfade der fertig geschriebenen, neuen Dateien zurück."""
+        now = self.clock()
+        seen = {}
+        self._unreadable_now = set()
+        for rel_path, entry in self.walker.entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue  # Inzwischen verschoben oder gelöscht
+            seen[rel_path] = (stat.st_size, stat.st_mtime_ns)
+
+        ready = []
+        for rel_path, stat_key in seen.items():
+            if self.handled.get(rel_path) == stat_key:
+                continue
+            previous = self.pending.get(rel_path)
+            if previous is None or previous[0] != stat_key:
+                self.pending[rel_path] = (stat_key, now)  # Neu oder noch im Wachsen
+            elif now - previous[1] >= self.settle:
+                ready.append(rel_path)
+
+        # Vergisst Dateien, die nicht mehr im Ordner liegen
+        self.unreadable = self._unreadable_now
+        for known in (self.pending, self.handled):
+            gone = [p for p in known if p not in seen]
+            for rel_path in gone:
+                del known[rel_path]
+            if known is self.handled and gone and self.cache is not None:
+                self.cache.forget_delivered(os.path.join(self.source_path, p) for p in gone)
+        self.directories = {self.source_path} | {os.path.join(self.source_path, os.path.dirname(p))
+                                                 for p in seen}
+        return ready
+
+    def mark_handled(self, rel_path):
+        """Vermerkt eine Datei als verarbeitet; sie wird erst nach einer Änderung wieder gemeldet."""
+        stat_key, _ = self.pending.pop(rel_path)
+        self.handled[rel_path] = stat_key
+
+    def mark_delivered(self, rel_path):
+        """Merkt eine fertig verarbeitete Datei im Cache, damit sie auch nach einem Neustart übersprungen wird."""
+        if self.cache is not None:
+            self.cache.put_delivered(os.path.join(self.source_path, rel_path), *self.handled[rel_path])
+
+
+def process_batch(watcher, rel_paths, output_path, copy, layout=LAYOUT_MIRROR, hardlink=False, open_journal=None,
+                  engine=DEFAULT_ENGINE, videos=False, stats=NULL_STATS):
+    """
+    Ermittelt die neuen Namen für einen Stapel und überträgt die Dateien. Liefert wie
+    process_items (Eintrag, Zielpfad, Verfahren, Fehler) für jede Datei des Stapels.
+    Alle Stapel eines Laufs können in dieselbe Statistik 'stats' schreiben. Dateien
+    ohne Fehler werden im Cache des Watchers als verarbeitet vermerkt; fehlgeschlagene
+    werden nach einem Neustart erneut versucht.
+
+    open_journal() gibt das Journal der Sitzung zurück und wird nur aufgerufen, wenn
+    der Stapel etwas zu übertragen hat; der Stapel endet mit einem "end"-Eintrag, das
+    Journal bleibt offen.
+    """
+    paths = [os.path.join(watcher.source_path, rel_path) for rel_path in rel_paths]
+    results = scan_files(paths, cache=watcher.cache, engine=engine, videos=videos, stats=stats)
+    items = [ScanItem(rel_path, new_name, status_key) for rel_path, (new_name, status_key) in zip(rel_paths, results)]
+    for rel_path in rel_paths:
+        watcher.mark_handled(rel_path)
+    journal = None
+    if open_journal is not None and any(item.status_key == "status_ok" for item in items):
+        journal = open_journal()
+    try:
+        for result in process_items(items, watcher.source_path, output_path, copy, layout, hardlink,
+                                    journal=journal, scan_output=False, stats=stats):
+            if result[3] is None:
+                watcher.mark_delivered(result[0].original)
+            yield result
+    finally:
+        if watcher.cache is not None:
+            watcher.cache.flush()
+
+
+def watch_folder(source_path, output_path, copy, layout=LAYOUT_MIRROR, hardlink=False, recursive=False,
+                 include=None, exclude=None, interval=DEFAULT_INTERVAL, settle=DEFAULT_SETTLE,
+                 batch_size=DEFAULT_BATCH_SIZE, use_journal=True, stop=None, engine=DEFAULT_ENGINE,
+                 videos=False, stats=NULL_STATS, on_error=None, cache=None):
+    """
+    Überwacht den Quellordner, bis 'stop' (threading.Event) gesetzt wird oder der
+    Aufrufer den Generator beendet, und liefert die Ergebnisse aller verarbeiteten
+    Dateien wie process_items. Nicht lesbare Unterordner werden on_error(relativer
+    Ordner, Fehler) gemeldet, jeweils einmal, solange sie nicht lesbar bleiben. Mit
+    'cache' (ScanCache, vom Aufrufer geöffnet und geschlossen) werden bereits
+    verarbeitete Dateien nach einem Neustart übersprungen. Mit 'use_journal' schreiben
+    alle Stapel in ein Journal für die ganze Sitzung.
+    """
+    output_path = os.path.abspath(output_path)
+    watcher = FolderWatcher(source_path, recursive, include, exclude, [output_path], settle, on_error=on_error,
+                            cache=cache)
+    journal = None
+
+    def session_journal():
+        nonlocal journal
+        if journal is None:
+            journal = Journal.create(source=watcher.source_path, output=output_path, copy=copy, layout=layout,
+                                     hardlink=hardlink, watch=True)
+        return journal
+
+    inotify = open_inotify()
+    try:
+        while stop is None or not stop.is_set():
+            ready = watcher.scan()
+            for start in range(0, len(ready), batch_size):
+                yield from process_batch(watcher, ready[start:start + batch_size], output_path, copy, layout,
+                                         hardlink, session_journal if use_journal else None, engine, videos, stats)
+            # Solange Dateien noch wachsen, wird spätestens nach der Wartezeit erneut geprüft
+            timeout = min(interval, settle) if watcher.pending else interval
+            if inotify is not None:
+                try:
+                    inotify.watch(watcher.directories)
+                except OSError:
+                    pass  # z.B. Grenze max_user_watches erreicht: es bleibt beim Polling
+                inotify.wait(timeout)
+            elif stop is not None:
+                stop.wait(timeout)
+            else:
+                time.sleep(timeout)
+    finally:
+        if inotify is not None:
+            inotify.close()
+        if journal is not None:
+            journal.close()